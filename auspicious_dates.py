@@ -0,0 +1,129 @@
+"""
+Auspicious date finder - rank calendar dates by compatibility with a person
+
+A date scores points when its own driver and conductor numbers are friends
+of the person's driver and conductor in COMPATIBILITY (minus points for
+non-friends), plus the person's luck factor for the personal year the date
+falls in. A date's driver depends only on its day, and its conductor and the
+person's personal year only on (day + month + year) % 9 and year % 9, so a
+score is computed once per (day, conductor residue, year residue) and reused
+across the range. The top-k dates are kept with a heap.
+"""
+import calendar
+import heapq
+import re
+from datetime import date
+from typing import Any, Dict, List, Tuple
+
+from calculations import calculate_driver, calculate_conductor, calculate_personal_year, compatibility_points
+from data import COMPATIBILITY, LUCK_FACTOR
+
+# Longest range that can be scanned in one request
+MAX_RANGE_DAYS = 100 * 366
+
+# Score weights: the date's numbers against the person's driver count double
+DRIVER_WEIGHT = 2
+CONDUCTOR_WEIGHT = 1
+# Points for a 100% luck factor
+LUCK_WEIGHT = 4
+
+_PERCENTAGES = re.compile(r"\d+")
+
+
+def luck_percentage(luck_factor: str) -> float:
+    """Numeric value of a LUCK_FACTOR entry: the mean of a range ('90-100%' -> 95), 0 for '(-)'"""
+    values = [int(value) for value in _PERCENTAGES.findall(luck_factor)]
+    return sum(values) / len(values) if values else 0.0
+
+
+def relation_points(person_number: int, number: int) -> int:
+    """+1 when number is a friend of person_number, -1 when a non-friend"""
+    return compatibility_points(COMPATIBILITY.get(person_number, {}), number)
+
+
+def relation_name(points: int) -> str:
+    return "friend" if points > 0 else "non_friend" if points < 0 else "neutral"
+
+
+class DateScorer:
+    """Scores calendar dates for one person"""
+
+    def __init__(self, driver: int, conductor: int, birth_day: int, birth_month: int):
+        self.driver = driver
+        self.conductor = conductor
+        self.birth_day = birth_day
+        self.birth_month = birth_month
+        # (day, (day + month + year) % 9, year % 9) -> (score, date driver, date conductor, personal year)
+        self._scores: Dict[Tuple[int, int, int], Tuple[float, int, int, int]] = {}
+
+    def _score(self, day: int, month: int, year: int) -> Tuple[float, int, int, int]:
+        date_driver = calculate_driver(day)
+        date_conductor = calculate_conductor(day, month, year)
+        personal_year = calculate_personal_year(self.birth_day, self.birth_month, year)
+
+        points = (
+            DRIVER_WEIGHT * (relation_points(self.driver, date_driver) + relation_points(self.driver, date_conductor))
+            + CONDUCTOR_WEIGHT * (relation_points(self.conductor, date_driver)
+                                  + relation_points(self.conductor, date_conductor))
+        )
+        luck = LUCK_FACTOR.get(personal_year, {}).get(self.driver, "")
+        score = round(points + LUCK_WEIGHT * luck_percentage(luck) / 100, 2)
+        return score, date_driver, date_conductor, personal_year
+
+    def score(self, day: int, month: int, year: int) -> Tuple[float, int, int, int]:
+        """(score, date driver, date conductor, personal year) of a date"""
+        key = (day, (day + month + year) % 9, year % 9)
+        entry = self._scores.get(key)
+        if entry is None:
+            entry = self._scores[key] = self._score(day, month, year)
+        return entry
+
+    def iter_scores(self, start: date, end: date):
+        """Yield (score, -ordinal) for each date from start to end (inclusive)"""
+        scores = self._scores
+        ordinal = start.toordinal()
+        for year in range(start.year, end.year + 1):
+            first_month = start.month if year == start.year else 1
+            last_month = end.month if year == end.year else 12
+            for month in range(first_month, last_month + 1):
+                first_day = start.day if (year, month) == (start.year, start.month) else 1
+                last_day = calendar.monthrange(year, month)[1]
+                if (year, month) == (end.year, end.month):
+                    last_day = end.day
+                for day in range(first_day, last_day + 1):
+                    entry = scores.get((day, (day + month + year) % 9, year % 9))
+                    if entry is None:
+                        entry = self.score(day, month, year)
+                    # Later dates rank lower among equal scores
+                    yield entry[0], -ordinal
+                    ordinal += 1
+
+    def top_dates(self, start: date, end: date, top_k: int) -> List[Dict[str, Any]]:
+        """The top_k best scoring dates from start to end, best first (earlier first among ties)"""
+        best = heapq.nlargest(top_k, self.iter_scores(start, end))
+        results = []
+        for score, negative_ordinal in best:
+            day_date = date.fromordinal(-negative_ordinal)
+            _, date_driver, date_conductor, personal_year = self.score(day_date.day, day_date.month, day_date.year)
+            results.append({
+                "date": day_date.isoformat(),
+                "score": score,
+                "driver": date_driver,
+                "conductor": date_conductor,
+                "driver_relation": relation_name(relation_points(self.driver, date_driver)),
+                "conductor_relation": relation_name(relation_points(self.driver, date_conductor)),
+                "personal_year": personal_year,
+                "luck_factor": LUCK_FACTOR.get(personal_year, {}).get(self.driver, "N/A")
+            })
+        return results
+
+
+def find_auspicious_dates(
+    driver: int, conductor: int, birth_day: int, birth_month: int, start: date, end: date, top_k: int = 10
+) -> List[Dict[str, Any]]:
+    """Rank the dates from start to end for a person and return the top_k"""
+    if end < start:
+        raise ValueError("end_date must not be before start_date")
+    if (end - start).days + 1 > MAX_RANGE_DAYS:
+        raise ValueError(f"At most {MAX_RANGE_DAYS} days can be searched at once")
+    return DateScorer(driver, conductor, birth_day, birth_month).top_dates(start, end, top_k)
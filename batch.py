@@ -0,0 +1,264 @@
+"""
+Streaming batch calculation - parse NDJSON or JSON array bodies record by record
+and stream NDJSON results back as they are computed
+"""
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator, Dict, Iterator, List, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from fragments import encode_response
+from numerology import calculate_numerology_result
+
+
+# Characters that matter when splitting a JSON array into its elements
+_ARRAY_TOKENS = re.compile(r'[\[\]{}",\\]')
+
+# Longest record accepted, in characters; longer records are reported inline and skipped
+MAX_RECORD_SIZE = 4096
+
+# Sentinels marking a record that could not be parsed as JSON, or that was too long
+_MALFORMED = object()
+_OVERSIZED = object()
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """Streaming NDJSON response, stopped when the client disconnects"""
+    media_type = "application/x-ndjson"
+
+
+class BatchStreamingResponse(NDJSONStreamingResponse):
+    """
+    Streaming response that leaves the receive channel to the body iterator.
+
+    The stock StreamingResponse listens for client disconnects while it
+    streams, which would swallow the request body the batch endpoint is still
+    reading. The body iterator (stream_batch) stops at a disconnect instead,
+    which reading the request body reports as ClientDisconnect.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+class RecordSplitter:
+    """
+    Incrementally split a request body into JSON records.
+
+    The body format is detected from its first non-whitespace character:
+    '[' starts a JSON array, anything else is treated as NDJSON. Each chunk is
+    scanned once, and only the text of the record currently being read is
+    kept. A record longer than MAX_RECORD_SIZE is reported as oversized as
+    soon as it grows past the limit, and the rest of it is skipped up to the
+    next newline (NDJSON) or top-level comma (array).
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._mode = None  # "ndjson" or "array"
+        self._finished = False
+        self._skipping = False
+        # NDJSON: pieces of the current line
+        self._pending: List[str] = []
+        self._pending_size = 0
+        # Array scanning state: text of the current element and how much of it was scanned
+        self._buffer = ""
+        self._scan_pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Feed a chunk of the body and return the records completed by it"""
+        return self._drain(self._decoder.decode(chunk), final=False)
+
+    def close(self) -> List[Any]:
+        """Signal the end of the body and return any remaining records"""
+        return self._drain(self._decoder.decode(b"", final=True), final=True)
+
+    def _drain(self, text: str, final: bool) -> List[Any]:
+        if self._mode is None:
+            text = text.lstrip()
+            if not text:
+                return []
+            if text[0] == "[":
+                self._mode = "array"
+                text = text[1:]
+            else:
+                self._mode = "ndjson"
+        if self._mode == "ndjson":
+            return self._drain_ndjson(text, final)
+        return self._drain_array(text, final)
+
+    def _drain_ndjson(self, text: str, final: bool) -> List[Any]:
+        records = []
+        start = 0
+        while True:
+            end = text.find("\n", start)
+            if end < 0:
+                break
+            if self._skipping:
+                self._skipping = False
+            else:
+                line = "".join(self._pending) + text[start:end] if self._pending else text[start:end]
+                if line.strip():
+                    records.append(_OVERSIZED if len(line) > MAX_RECORD_SIZE else _parse_record(line))
+            self._pending.clear()
+            self._pending_size = 0
+            start = end + 1
+
+        rest = text[start:]
+        if rest and not self._skipping:
+            self._pending.append(rest)
+            self._pending_size += len(rest)
+            if self._pending_size > MAX_RECORD_SIZE:
+                records.append(_OVERSIZED)
+                self._skipping = True
+                self._pending.clear()
+                self._pending_size = 0
+        if final and self._pending:
+            line = "".join(self._pending)
+            if line.strip():
+                records.append(_parse_record(line))
+            self._pending.clear()
+            self._pending_size = 0
+        return records
+
+    def _drain_array(self, text: str, final: bool) -> List[Any]:
+        if self._finished:
+            return []
+        records = []
+        buffer = self._buffer + text
+        start = 0
+        pos = self._scan_pos
+        if self._escape and pos < len(buffer):
+            self._escape = False
+            pos += 1
+
+        while True:
+            match = _ARRAY_TOKENS.search(buffer, pos)
+            if match is None:
+                break
+            token = match.group()
+            pos = match.end()
+            if self._in_string:
+                if token == '"':
+                    self._in_string = False
+                elif token == "\\":
+                    if pos < len(buffer):
+                        pos += 1
+                    else:
+                        self._escape = True
+                continue
+            if token == '"':
+                self._in_string = True
+            elif token in "[{":
+                self._depth += 1
+            elif token in "]}" and self._depth > 0:
+                self._depth -= 1
+            elif self._depth == 0 and token in ",]":
+                if self._skipping:
+                    self._skipping = False
+                else:
+                    element = buffer[start:match.start()]
+                    if element.strip():
+                        records.append(_OVERSIZED if len(element) > MAX_RECORD_SIZE else _parse_record(element))
+                start = pos
+                if token == "]":
+                    self._finished = True
+                    break
+
+        if self._finished:
+            self._buffer = ""
+            self._scan_pos = 0
+            return records
+
+        self._buffer = "" if self._skipping else buffer[start:]
+        if len(self._buffer) > MAX_RECORD_SIZE:
+            records.append(_OVERSIZED)
+            self._skipping = True
+            self._buffer = ""
+        self._scan_pos = len(self._buffer)
+        if final:
+            if self._buffer.strip():
+                records.append(_MALFORMED)
+            self._buffer = ""
+        return records
+
+
+def _parse_record(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return _MALFORMED
+
+
+def _validation_message(error: ValidationError) -> str:
+    """Flatten a Pydantic validation error into a single readable message"""
+    messages = []
+    for item in error.errors():
+        field = ".".join(str(part) for part in item.get("loc", ()))
+        message = item.get("msg", "Invalid value")
+        messages.append(f"{field}: {message}" if field else message)
+    return "; ".join(messages)
+
+
+def calculate_record(index: int, record: Any, input_model: Type[BaseModel]) -> Dict[str, Any]:
+    """Validate and calculate a single batch record, reporting errors inline"""
+    if record is _MALFORMED:
+        return {"index": index, "success": False, "error": "Malformed JSON record"}
+    if record is _OVERSIZED:
+        return {"index": index, "success": False,
+                "error": f"Record is longer than {MAX_RECORD_SIZE} characters"}
+    if not isinstance(record, dict):
+        return {"index": index, "success": False, "error": "Record must be a JSON object"}
+
+    try:
+        data = input_model.model_validate(record)
+    except ValidationError as ve:
+        return {"index": index, "success": False, "error": _validation_message(ve)}
+
+    result = calculate_numerology_result(data.name, data.date_of_birth, data.gender)
+    return {"index": index, **result}
+
+
+def encode_line(result: Dict[str, Any]) -> bytes:
+    """Encode a result as one NDJSON line"""
+    return encode_response(result) + b"\n"
+
+
+def iter_results(records: Iterator[Tuple[int, Any]], input_model: Type[BaseModel]) -> Iterator[bytes]:
+    """Calculate and encode (index, record) pairs"""
+    for index, record in records:
+        yield encode_line(calculate_record(index, record, input_model))
+
+
+async def stream_batch(chunks: AsyncIterator[bytes], input_model: Type[BaseModel]) -> AsyncIterator[bytes]:
+    """
+    Stream NDJSON results for a streamed NDJSON / JSON array body.
+    Results for all records completed by a body chunk are sent together.
+    Stops when the client disconnects while the body is being read.
+    """
+    splitter = RecordSplitter()
+    index = 0
+
+    try:
+        async for chunk in chunks:
+            records = splitter.feed(chunk)
+            if records:
+                output = b"".join(iter_results(enumerate(records, index), input_model))
+                index += len(records)
+                yield output
+    except ClientDisconnect:
+        return
+
+    records = splitter.close()
+    if records:
+        yield b"".join(iter_results(enumerate(records, index), input_model))
@@ -0,0 +1,210 @@
+"""
+Offline batch scorer - calculate numerology for a CSV or NDJSON file of people
+
+Usage:
+    python batch_cli.py people.csv results.ndjson --workers 8 --chunk-size 1000
+
+Input rows need name, date_of_birth (YYYY-MM-DD) and gender columns/fields.
+Input and output are streamed and only a bounded number of chunks is in
+flight at any time, so memory stays flat regardless of file size.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from collections import deque
+from multiprocessing import Pool
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from date_profiles import get_date_profile_table
+from numerology import calculate_numerology_result, normalize_name, normalize_gender
+
+
+FORMATS = ("csv", "ndjson")
+
+# Columns written when the output format is CSV
+CSV_COLUMNS = [
+    "index", "success", "error", "name", "date_of_birth", "gender",
+    "driver", "conductor", "kua", "present_numbers", "missing_numbers",
+    "lucky_numbers", "bad_numbers", "neutral_numbers",
+    "first_name_value", "full_name_value", "overall_status"
+]
+
+# Accepted alternative column names in input files
+FIELD_ALIASES = {
+    "name": ("name", "full_name"),
+    "date_of_birth": ("date_of_birth", "dob", "birth_date"),
+    "gender": ("gender", "sex")
+}
+
+
+def detect_format(path: str) -> str:
+    """Detect file format from its extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".ndjson", ".jsonl", ".json"):
+        return "ndjson"
+    raise ValueError(f"Cannot detect format of '{path}', use --input-format/--output-format")
+
+
+def read_records(stream: io.TextIOBase, input_format: str) -> Iterator[Any]:
+    """Stream records from a CSV or NDJSON file"""
+    if input_format == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def _field(record: Dict[str, Any], field: str) -> Any:
+    for key in FIELD_ALIASES[field]:
+        if record.get(key) not in (None, ""):
+            return record[key]
+    raise ValueError(f"Missing field: {field}")
+
+
+def score_record(index: int, record: Any) -> Dict[str, Any]:
+    """Normalize and calculate a single input record, reporting errors inline"""
+    if not isinstance(record, dict):
+        return {"index": index, "success": False, "error": "Malformed record"}
+    try:
+        name = normalize_name(str(_field(record, "name")))
+        date_of_birth = str(_field(record, "date_of_birth")).strip()
+        gender = normalize_gender(str(_field(record, "gender")).strip())
+    except ValueError as ve:
+        return {"index": index, "success": False, "error": str(ve)}
+
+    result = calculate_numerology_result(name, date_of_birth, gender)
+    return {"index": index, **result}
+
+
+def _csv_row(result: Dict[str, Any]) -> List[Any]:
+    name_analysis = result.get("name_analysis", {})
+    row = []
+    for column in CSV_COLUMNS:
+        if column in ("first_name_value", "full_name_value", "overall_status"):
+            value = name_analysis.get(column, "")
+        else:
+            value = result.get(column, "")
+        if isinstance(value, list):
+            value = " ".join(str(item) for item in value)
+        row.append(value)
+    return row
+
+
+def score_chunk(chunk: List[Tuple[int, Any]], output_format: str) -> str:
+    """Score a chunk of (index, record) pairs and return the encoded output text"""
+    if output_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for index, record in chunk:
+            writer.writerow(_csv_row(score_record(index, record)))
+        return buffer.getvalue()
+
+    return "".join(
+        json.dumps(score_record(index, record), ensure_ascii=False, separators=(",", ":")) + "\n"
+        for index, record in chunk
+    )
+
+
+def iter_chunks(records: Iterator[Any], chunk_size: int) -> Iterator[List[Tuple[int, Any]]]:
+    """Group records into lists of (index, record) pairs"""
+    chunk = []
+    for index, record in enumerate(records):
+        chunk.append((index, record))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _init_worker() -> None:
+    # Already built (and shared) when the pool is forked from the parent
+    get_date_profile_table()
+
+
+def run(
+    input_path: str,
+    output_path: str,
+    input_format: Optional[str] = None,
+    output_format: Optional[str] = None,
+    workers: int = 1,
+    chunk_size: int = 1000
+) -> int:
+    """Score every record of the input file into the output file and return the record count"""
+    input_format = input_format or detect_format(input_path)
+    output_format = output_format or detect_format(output_path)
+
+    # Build the shared table before forking so workers inherit it
+    get_date_profile_table()
+
+    count = 0
+    with open(input_path, "r", encoding="utf-8", newline="") as source, \
+            open(output_path, "w", encoding="utf-8", newline="") as target:
+        if output_format == "csv":
+            csv.writer(target).writerow(CSV_COLUMNS)
+
+        chunks = iter_chunks(read_records(source, input_format), chunk_size)
+
+        if workers <= 1:
+            for chunk in chunks:
+                target.write(score_chunk(chunk, output_format))
+                count += len(chunk)
+            return count
+
+        with Pool(workers, initializer=_init_worker) as pool:
+            # Keep a bounded window of chunks in flight, written in input order
+            pending = deque()
+            max_pending = workers * 2
+            for chunk in chunks:
+                pending.append((len(chunk), pool.apply_async(score_chunk, (chunk, output_format))))
+                if len(pending) >= max_pending:
+                    size, result = pending.popleft()
+                    target.write(result.get())
+                    count += size
+            while pending:
+                size, result = pending.popleft()
+                target.write(result.get())
+                count += size
+
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Calculate numerology for a CSV or NDJSON file of people")
+    parser.add_argument("input", help="Input file (.csv or .ndjson/.jsonl)")
+    parser.add_argument("output", help="Output file (.csv or .ndjson/.jsonl)")
+    parser.add_argument("--input-format", choices=FORMATS, help="Input format (default: from extension)")
+    parser.add_argument("--output-format", choices=FORMATS, help="Output format (default: from extension)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: CPU count, 1 disables multiprocessing)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Records per work chunk (default: 1000)")
+    args = parser.parse_args(argv)
+
+    try:
+        count = run(
+            args.input, args.output,
+            input_format=args.input_format,
+            output_format=args.output_format,
+            workers=args.workers,
+            chunk_size=max(1, args.chunk_size)
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Scored {count} records into {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
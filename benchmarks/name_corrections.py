@@ -0,0 +1,74 @@
+"""
+Benchmark for suggest_name_corrections on long names
+
+Usage:
+    python benchmarks/name_corrections.py --samples 500 --length 30 --p99-budget-ms 50
+
+Exits with status 1 when the p99 latency exceeds the budget.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from date_profiles import get_date_profile, GENDERS  # noqa: E402
+from name_numerology import suggest_name_corrections  # noqa: E402
+
+
+def random_name(rng: random.Random, length: int) -> str:
+    """Random lowercase words joined by spaces, exactly length characters long"""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = []
+    while sum(len(word) + 1 for word in words) < length:
+        words.append("".join(rng.choice(letters) for _ in range(rng.randint(3, 9))))
+    return " ".join(words)[:length].rstrip() or "a"
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suggest_name_corrections")
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--length", type=int, default=30, help="Name length in characters")
+    parser.add_argument("--p99-budget-ms", type=float, default=50.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    latencies = []
+    for _ in range(args.samples):
+        profile = get_date_profile(rng.randint(1, 28), rng.randint(1, 12), rng.randint(1940, 2015), rng.choice(GENDERS))
+        name = random_name(rng, args.length)
+        target = rng.choice([None, 1, 3, 5, 6])
+
+        start = time.perf_counter()
+        suggest_name_corrections(
+            name, target,
+            driver=profile["driver"],
+            conductor=profile["conductor"],
+            bad_numbers=profile["bad_numbers"],
+            present_numbers=profile["present_numbers"],
+            missing_numbers=profile["missing_numbers"]
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    p50 = percentile(latencies, 0.50)
+    p99 = percentile(latencies, 0.99)
+    print(f"suggest_name_corrections ({args.length} chars, {args.samples} samples): "
+          f"p50 {p50:.2f}ms, p99 {p99:.2f}ms, max {latencies[-1]:.2f}ms")
+
+    if p99 > args.p99_budget_ms:
+        print(f"FAIL: p99 {p99:.2f}ms exceeds budget of {args.p99_budget_ms:.2f}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""
+Benchmark suite for the numerology functions and the /calculate endpoint
+
+Usage:
+    python benchmarks/run.py                    # run and compare against the baseline
+    python benchmarks/run.py --update-baseline  # run and store the results as the new baseline
+    python benchmarks/run.py --only grid,asgi   # run benchmarks whose name contains a filter
+
+Every benchmark runs --repeat times (rounds interleave the benchmarks) and
+reports the median of each statistic over the runs. Results (ops/sec and
+p50/p99 latency per benchmark) are written to benchmarks/results.json. The
+run fails (exit status 1) when a benchmark's throughput drops or its p50
+latency grows by more than --tolerance compared to benchmarks/baseline.json.
+p99 is reported but not gated, as it is too noisy between runs.
+
+The baseline also records a checksum of every app module the benchmarks
+load, and modules changed since the baseline was recorded are listed as a
+warning. The baseline is only rewritten by an explicit --update-baseline.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from calculations import (  # noqa: E402
+    sum_digits_to_single,
+    calculate_driver,
+    calculate_conductor,
+    calculate_kua,
+    create_personalized_loshu_grid
+)
+from loshu_lines import analyze_loshu_lines  # noqa: E402
+from remedies import (  # noqa: E402
+    calculate_remedies_part1,
+    calculate_remedies_part2,
+    calculate_remedies_part3
+)
+from date_profiles import get_date_profile_table  # noqa: E402
+from name_numerology import validate_name_numerology, suggest_name_corrections  # noqa: E402
+import main  # noqa: E402
+
+BENCHMARK_DIR = os.path.join(ROOT, "benchmarks")
+RESULTS_PATH = os.path.join(BENCHMARK_DIR, "results.json")
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+HOT_SET_SIZE = 100
+
+NAMES = [
+    "John Doe", "Sunil Mahajan", "Priya Sharma", "Akshit Kumar", "Mary-Jane O'Neil",
+    "Zoë Ångström", "Ram", "Anna Maria Gonzalez de la Cruz", "J.R.R. Tolkien", "Li Wei"
+]
+
+
+# Input corpus
+
+def build_corpus(size: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """
+    Realistic /calculate inputs: common names, titles from requests.jsonl
+    (long free-text names) and birth dates spread over 1900 to today
+    """
+    names = list(NAMES)
+    requests_path = os.path.join(ROOT, "requests.jsonl")
+    if os.path.exists(requests_path):
+        with open(requests_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    title = json.loads(line).get("title")
+                except ValueError:
+                    continue
+                if title:
+                    names.append(title)
+
+    rng = random.Random(seed)
+    first_day = date(1900, 1, 1)
+    span = (date.today() - first_day).days
+    corpus = []
+    for _ in range(size):
+        birth = first_day + timedelta(days=rng.randrange(span))
+        gender = rng.choice(["male", "female"])
+        driver = calculate_driver(birth.day)
+        conductor = calculate_conductor(birth.day, birth.month, birth.year)
+        kua = calculate_kua(birth.year, gender)
+        grid, missing, present = create_personalized_loshu_grid(
+            birth.day, birth.month, birth.year, driver, conductor, kua
+        )
+        corpus.append({
+            "name": rng.choice(names),
+            "date_of_birth": birth.isoformat(),
+            "gender": gender,
+            "day": birth.day,
+            "month": birth.month,
+            "year": birth.year,
+            "driver": driver,
+            "conductor": conductor,
+            "kua": kua,
+            "missing": missing,
+            "present": present,
+            "bad": main.resolve_date_profile(birth.isoformat(), gender)["bad_numbers"]
+        })
+    return corpus
+
+
+# In-process ASGI client
+
+async def asgi_post(app: Callable, path: str, body: bytes) -> Dict[str, Any]:
+    """POST a JSON body to an ASGI app in-process and return status and body"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+        "headers": [(b"host", b"localhost"), (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode())]
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    response = {"status": None, "body": b""}
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    await app(scope, receive, send)
+    return response
+
+
+# Measurement
+
+def summarize(name: str, latencies_ns: List[int]) -> Dict[str, Any]:
+    latencies_ns.sort()
+    count = len(latencies_ns)
+    total = sum(latencies_ns)
+
+    def percentile(fraction: float) -> float:
+        return latencies_ns[min(count - 1, int(round(fraction * (count - 1))))] / 1000
+
+    return {
+        "name": name,
+        "iterations": count,
+        "ops_per_sec": round(count / (total / 1e9), 1) if total else 0.0,
+        "p50_us": round(percentile(0.50), 2),
+        "p99_us": round(percentile(0.99), 2)
+    }
+
+
+def median_entry(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median of each statistic over repeated runs of one benchmark"""
+    entry = dict(runs[0], runs=len(runs))
+    for key in ("ops_per_sec", "p50_us", "p99_us"):
+        entry[key] = round(statistics.median(run[key] for run in runs), 2)
+    return entry
+
+
+def bench_sync(name: str, func: Callable[[Dict[str, Any]], Any], corpus: List[Dict[str, Any]],
+               iterations: int) -> Dict[str, Any]:
+    for item in corpus[:50]:  # warm up
+        func(item)
+    perf = time.perf_counter_ns
+    latencies = []
+    for i in range(iterations):
+        item = corpus[i % len(corpus)]
+        start = perf()
+        func(item)
+        latencies.append(perf() - start)
+    return summarize(name, latencies)
+
+
+def bench_async(name: str, func: Callable[[Dict[str, Any]], Any], corpus: List[Dict[str, Any]],
+                iterations: int) -> Dict[str, Any]:
+    async def run():
+        for item in corpus[:50]:  # warm up
+            await func(item)
+        perf = time.perf_counter_ns
+        latencies = []
+        for i in range(iterations):
+            item = corpus[i % len(corpus)]
+            start = perf()
+            await func(item)
+            latencies.append(perf() - start)
+        return latencies
+
+    return summarize(name, asyncio.run(run()))
+
+
+def benchmarks(corpus: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Benchmark name -> (kind, function of one corpus item)"""
+    inputs = [main.NumerologyInput(name=item["name"], date_of_birth=item["date_of_birth"],
+                                   gender=item["gender"]) for item in corpus]
+    for item, data in zip(corpus, inputs):
+        item["input"] = data
+        item["body"] = data.model_dump_json().encode()
+    # Cached requests repeat a small working set of inputs
+    for index, item in enumerate(corpus):
+        item["hot_body"] = corpus[index % HOT_SET_SIZE]["body"]
+
+    def uncached_calculate(item):
+        main.response_cache.cache.clear()
+        return main.calculate_numerology(item["input"])
+
+    def uncached_post(item):
+        main.response_cache.cache.clear()
+        return asgi_post(main.app, "/calculate", item["body"])
+
+    return {
+        "sum_digits_to_single": ("sync", lambda item: sum_digits_to_single(item["year"] * 10000 + item["month"] * 100 + item["day"])),
+        "create_personalized_loshu_grid": ("sync", lambda item: create_personalized_loshu_grid(
+            item["day"], item["month"], item["year"], item["driver"], item["conductor"], item["kua"])),
+        "analyze_loshu_lines": ("sync", lambda item: analyze_loshu_lines(item["present"])),
+        "calculate_remedies_part1": ("sync", lambda item: calculate_remedies_part1(
+            item["missing"], item["driver"], item["conductor"])),
+        "calculate_remedies_part2": ("sync", lambda item: calculate_remedies_part2(
+            item["missing"], item["present"], item["driver"], item["conductor"])),
+        "calculate_remedies_part3": ("sync", lambda item: calculate_remedies_part3(item["missing"])),
+        "validate_name_numerology": ("sync", lambda item: validate_name_numerology(
+            item["name"], item["driver"], item["conductor"], item["bad"], item["present"], item["missing"])),
+        "suggest_name_corrections": ("sync", lambda item: suggest_name_corrections(
+            item["name"][:30], None, item["driver"], item["conductor"], item["bad"],
+            item["present"], item["missing"])),
+        "calculate_numerology": ("async", uncached_calculate),
+        "asgi_calculate_uncached": ("async", uncached_post),
+        "asgi_calculate_cached": ("async", lambda item: asgi_post(main.app, "/calculate", item["hot_body"]))
+    }
+
+
+def source_checksums() -> Dict[str, str]:
+    """SHA-256 prefix of every loaded app module (outside benchmarks/ and tests/), by path"""
+    checksums = {}
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if not path or not path.endswith(".py"):
+            continue
+        relative = os.path.relpath(os.path.abspath(path), ROOT)
+        if relative.startswith(("..", "benchmarks", "tests")):
+            continue
+        with open(path, "rb") as f:
+            checksums[relative] = hashlib.sha256(f.read()).hexdigest()[:16]
+    return dict(sorted(checksums.items()))
+
+
+def stale_sources(sources: Dict[str, str], baseline: Dict[str, Any]) -> List[str]:
+    """Loaded modules that changed (or are new) since the baseline was recorded"""
+    recorded = baseline.get("sources", {})
+    return [path for path, checksum in sources.items() if recorded.get(path) != checksum]
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return regressions of results against the baseline (throughput and p50 latency)"""
+    previous = {entry["name"]: entry for entry in baseline.get("benchmarks", [])}
+    regressions = []
+    for entry in results:
+        base = previous.get(entry["name"])
+        if base is None:
+            continue
+        if entry["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{entry['name']}: {entry['ops_per_sec']:.0f} ops/sec vs baseline {base['ops_per_sec']:.0f}"
+            )
+        if entry["p50_us"] > base["p50_us"] * (1 + tolerance):
+            regressions.append(
+                f"{entry['name']}: p50 {entry['p50_us']:.1f}us vs baseline {base['p50_us']:.1f}us"
+            )
+    return regressions
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the numerology benchmark suite")
+    parser.add_argument("--iterations", type=int, default=5000, help="Iterations per benchmark")
+    parser.add_argument("--corpus-size", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark, summarized by their median")
+    parser.add_argument("--only", help="Comma-separated substrings of benchmark names to run")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative regression against the baseline (default 0.25)")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    get_date_profile_table()
+    corpus = build_corpus(args.corpus_size)
+    filters = [part.strip() for part in args.only.split(",")] if args.only else None
+
+    selected = {name: bench for name, bench in benchmarks(corpus).items()
+                if not filters or any(part in name for part in filters)}
+    runs: Dict[str, List[Dict[str, Any]]] = {name: [] for name in selected}
+    for _ in range(max(1, args.repeat)):
+        for name, (kind, func) in selected.items():
+            iterations = max(1, args.iterations // 10) if name == "suggest_name_corrections" else args.iterations
+            runner = bench_async if kind == "async" else bench_sync
+            runs[name].append(runner(name, func, corpus, iterations))
+
+    results = []
+    for name in selected:
+        entry = median_entry(runs[name])
+        results.append(entry)
+        print(f"{name:32s} {entry['ops_per_sec']:>12,.0f} ops/sec   "
+              f"p50 {entry['p50_us']:>9.2f}us   p99 {entry['p99_us']:>9.2f}us")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sources": source_checksums(),
+        "benchmarks": results
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found, run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    stale = stale_sources(report["sources"], baseline)
+    if stale:
+        print(f"Warning: modules changed since the baseline was recorded: {', '.join(stale)}")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("Performance regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,128 @@
+"""
+Startup benchmark - import time, preload time and time to first response
+
+Usage:
+    python benchmarks/startup.py --samples 5 --budget-ms 2500 --top 15
+
+Prints the slowest modules of `import main` (from python -X importtime), the
+time of each preload step, and the time from launching `python main.py` to
+the first successful POST /calculate response. Each measurement runs in a
+fresh interpreter. Exits with status 1 when the median time to first
+response exceeds the budget.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PRELOAD_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import main
+timings = {"import main": time.perf_counter() - start}
+for step in (main.get_asset_store, main.get_date_profile_table, main.get_date_index, main.get_template):
+    start = time.perf_counter()
+    step()
+    timings[step.__name__] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+REQUEST = json.dumps({"name": "John Doe", "date_of_birth": "1990-05-15", "gender": "male"}).encode()
+
+
+def import_times() -> List[Tuple[int, int, int, str]]:
+    """(self us, cumulative us, depth, module) of every module imported by `import main`"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return modules
+
+
+def preload_times() -> Dict[str, float]:
+    result = subprocess.run([sys.executable, "-c", PRELOAD_SCRIPT], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_response(mode: str, timeout: float = 30.0) -> float:
+    """Seconds from launching the server to its first successful /calculate response"""
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), NUMEROLOGY_STARTUP=mode)
+    request = urllib.request.Request(f"http://127.0.0.1:{port}/calculate", data=REQUEST,
+                                     headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "main.py"], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                if server.poll() is not None:
+                    raise RuntimeError(f"Server exited with status {server.returncode}")
+                time.sleep(0.005)
+        raise RuntimeError(f"No response within {timeout:.0f}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark application startup")
+    parser.add_argument("--samples", type=int, default=5, help="Server launches to time")
+    parser.add_argument("--budget-ms", type=float, default=2500.0, help="Budget for the median time to first response")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--mode", choices=("eager", "background", "lazy"),
+                        default=os.environ.get("NUMEROLOGY_STARTUP", "background"), help="NUMEROLOGY_STARTUP mode")
+    args = parser.parse_args()
+
+    modules = import_times()
+    total = next(cumulative for _, cumulative, depth, name in modules if name == "main" and depth == 0)
+    print(f"import main: {total / 1000:.1f}ms")
+    print("  slowest direct imports (cumulative):")
+    direct = sorted((m for m in modules if m[2] == 1), key=lambda m: m[1], reverse=True)
+    for _, cumulative, _, name in direct[:args.top]:
+        print(f"    {name:<40} {cumulative / 1000:8.1f}ms")
+    print("  slowest modules (self):")
+    for self_us, _, _, name in sorted(modules, reverse=True)[:args.top]:
+        print(f"    {name:<40} {self_us / 1000:8.1f}ms")
+
+    print("preload steps:")
+    for step, seconds in preload_times().items():
+        print(f"    {step:<40} {seconds * 1000:8.1f}ms")
+
+    samples = sorted(time_to_first_response(args.mode) * 1000 for _ in range(max(1, args.samples)))
+    median = statistics.median(samples)
+    print(f"time to first response ({args.mode}, {len(samples)} launches): "
+          f"median {median:.1f}ms, min {samples[0]:.1f}ms, max {samples[-1]:.1f}ms")
+
+    if median > args.budget_ms:
+        print(f"FAIL: median {median:.1f}ms exceeds budget of {args.budget_ms:.1f}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
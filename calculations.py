@@ -40,30 +40,58 @@ def calculate_kua(year: int, gender: str) -> int:
         return kua
 
 
+# Personal year by (day + month) % 9 and target year % 9: the digit sum of a
+# year is congruent to the year mod 9, so personal years repeat every 9 years
+PERSONAL_YEAR_TABLE = tuple(
+    tuple(1 + (date_residue + year_residue - 1) % 9 for year_residue in range(9))
+    for date_residue in range(9)
+)
+
+
 def calculate_personal_year(day: int, month: int, target_year: int) -> int:
     """Calculate personal year for a specific target year"""
-    total = day + month + sum(int(digit) for digit in str(target_year))
-    return sum_digits_to_single(total)
+    return PERSONAL_YEAR_TABLE[(day + month) % 9][target_year % 9]
 
 
-def create_personalized_loshu_grid(
-    day: int, month: int, year: int, driver: int, conductor: int, kua: int
-) -> Tuple[List[List[Dict[str, Any]]], List[int], List[int]]:
-    """Create personalized Loshu grid based on date of birth and calculated numbers"""
-    # Standard Loshu Grid template
-    standard_grid = [
-        [4, 9, 2],
-        [3, 5, 7],
-        [8, 1, 6]
-    ]
+# Loshu grid presence masks: bit (n - 1) is set when number n is present
+FULL_MASK = 0b111111111
 
-    # Count occurrences of each digit (1-9)
-    digit_count = {i: 0 for i in range(1, 10)}
+# Mask bit of each number (index 0 unused)
+NUMBER_BITS = [0] + [1 << (num - 1) for num in range(1, 10)]
 
-    # Track if day is single digit (01-09) to limit its count to 1
-    single_digit_day = None
-    if day < 10:
-        single_digit_day = day
+
+def numbers_to_mask(numbers: List[int]) -> int:
+    """Convert a list of numbers (1-9) to a presence bit mask"""
+    mask = 0
+    for num in numbers:
+        mask |= 1 << (num - 1)
+    return mask
+
+
+def mask_to_numbers(mask: int) -> List[int]:
+    """Convert a presence bit mask to a sorted list of numbers (1-9)"""
+    return [num for num in range(1, 10) if mask & (1 << (num - 1))]
+
+
+# Present / missing numbers for every possible mask (shared, treat as read-only)
+PRESENT_NUMBERS_BY_MASK = [mask_to_numbers(mask) for mask in range(FULL_MASK + 1)]
+MISSING_NUMBERS_BY_MASK = [mask_to_numbers(FULL_MASK & ~mask) for mask in range(FULL_MASK + 1)]
+
+
+def digit_count_mask(digit_count: Tuple[int, ...]) -> int:
+    """Presence bit mask of a Loshu digit count array"""
+    mask = 0
+    for num in range(1, 10):
+        if digit_count[num]:
+            mask |= 1 << (num - 1)
+    return mask
+
+
+def count_loshu_digits(
+    day: int, month: int, year: int, driver: int, conductor: int, kua: int
+) -> Tuple[int, ...]:
+    """Count occurrences of each digit (1-9) for the Loshu grid, indexed by digit (index 0 unused)"""
+    digit_count = [0] * 10
 
     # For day: if 10-31, count each digit separately; if 01-09, count as single digit
     if day >= 10:
@@ -89,28 +117,36 @@ def create_personalized_loshu_grid(
     digit_count[kua] += 1
 
     # If day is 01-09, cap that digit's count to 1
-    if single_digit_day is not None:
-        digit_count[single_digit_day] = 1
+    if day < 10:
+        digit_count[day] = 1
+
+    return tuple(digit_count)
+
+
+def build_loshu_grid(
+    digit_count: Tuple[int, ...]
+) -> Tuple[List[List[Dict[str, Any]]], List[int], List[int]]:
+    """Build the personalized Loshu grid from per-digit counts"""
+    # Standard Loshu Grid template
+    standard_grid = [
+        [4, 9, 2],
+        [3, 5, 7],
+        [8, 1, 6]
+    ]
 
     # Create personalized grid
     personalized_grid = []
-    missing_numbers = []
-    present_numbers = []
-
     for row in standard_grid:
         new_row = []
         for cell in row:
             count = digit_count[cell]
             if count > 0:
                 # Number appears - show it with repetition
-                repeated_value = str(cell) * count
                 new_row.append({
-                    "value": repeated_value,
+                    "value": str(cell) * count,
                     "present": True,
                     "count": count
                 })
-                if cell not in present_numbers:
-                    present_numbers.append(cell)
             else:
                 # Number is missing
                 new_row.append({
@@ -118,10 +154,28 @@ def create_personalized_loshu_grid(
                     "present": False,
                     "count": 0
                 })
-                missing_numbers.append(cell)
         personalized_grid.append(new_row)
 
-    return personalized_grid, sorted(missing_numbers), sorted(present_numbers)
+    mask = digit_count_mask(digit_count)
+    return personalized_grid, list(MISSING_NUMBERS_BY_MASK[mask]), list(PRESENT_NUMBERS_BY_MASK[mask])
+
+
+def create_personalized_loshu_grid(
+    day: int, month: int, year: int, driver: int, conductor: int, kua: int
+) -> Tuple[List[List[Dict[str, Any]]], List[int], List[int]]:
+    """Create personalized Loshu grid based on date of birth and calculated numbers"""
+    digit_count = count_loshu_digits(day, month, year, driver, conductor, kua)
+    return build_loshu_grid(digit_count)
+
+
+def compatibility_points(compatibility: Dict[str, Any], number: int) -> int:
+    """
+    -1 when number is a non-friend, +1 when it is a friend, 0 otherwise.
+    Non-friends take priority, as for bad numbers.
+    """
+    if number in compatibility.get('non_friends', []):
+        return -1
+    return 1 if number in compatibility.get('friends', []) else 0
 
 
 def calculate_lucky_bad_neutral_numbers(
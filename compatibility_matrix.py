@@ -0,0 +1,106 @@
+"""
+Pairwise compatibility of a group of people - couples, families, teams
+
+Two people are scored on how their driver, conductor and name value numbers
+regard each other in COMPATIBILITY, in both directions:
+
+    score = 2 * M[driver_a][driver_b] + M[conductor_a][conductor_b] + M[name_a][name_b]
+    M[x][y] = points(x -> y) + points(y -> x)    (+1 friend, -1 non-friend)
+
+so scores range from -8 to 8. The score only depends on each person's
+(driver, conductor, name value) class, of which there are at most 729, so the
+matrix is computed between classes and expanded to people by reusing one
+encoded row per class.
+"""
+import json
+import struct
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from calculations import compatibility_points
+from data import COMPATIBILITY
+
+# Largest group scored in one request
+MAX_PEOPLE = 5000
+
+# Matrix output formats
+FORMATS = ("json", "npy", "binary")
+
+# Rows per chunk when streaming a matrix
+ROWS_PER_CHUNK = 256
+
+DRIVER_WEIGHT = 2
+CONDUCTOR_WEIGHT = 1
+NAME_WEIGHT = 1
+
+# Mutual compatibility points of two numbers (index 0 unused)
+MUTUAL_POINTS = [[0] * 10] + [
+    [0] + [
+        compatibility_points(COMPATIBILITY.get(x, {}), y) + compatibility_points(COMPATIBILITY.get(y, {}), x)
+        for y in range(1, 10)
+    ]
+    for x in range(1, 10)
+]
+
+PersonNumbers = Tuple[int, int, int]
+
+
+def pair_score(a: PersonNumbers, b: PersonNumbers) -> int:
+    """Compatibility score of two (driver, conductor, name value) triples"""
+    return (
+        DRIVER_WEIGHT * MUTUAL_POINTS[a[0]][b[0]]
+        + CONDUCTOR_WEIGHT * MUTUAL_POINTS[a[1]][b[1]]
+        + NAME_WEIGHT * MUTUAL_POINTS[a[2]][b[2]]
+    )
+
+
+class CompatibilityMatrix:
+    """N x N compatibility scores of a group, stored as one row per equivalence class"""
+
+    def __init__(self, people: Sequence[PersonNumbers]):
+        self.size = len(people)
+        class_ids: Dict[PersonNumbers, int] = {}
+        self.person_classes = [class_ids.setdefault(tuple(person), len(class_ids)) for person in people]
+        self.classes: List[PersonNumbers] = list(class_ids)
+
+        # Class x class scores, then each class row expanded to every person
+        class_scores = [[pair_score(a, b) for b in self.classes] for a in self.classes]
+        self._rows = [list(map(row.__getitem__, self.person_classes)) for row in class_scores]
+
+    def row(self, index: int) -> List[int]:
+        """Scores of person index against everyone (shared between people of the same class)"""
+        return self._rows[self.person_classes[index]]
+
+    def rows(self) -> List[List[int]]:
+        return [self.row(index) for index in range(self.size)]
+
+    def _iter_chunks(self, encoded_rows: List[bytes], separator: bytes = b"") -> Iterator[bytes]:
+        classes = self.person_classes
+        for start in range(0, self.size, ROWS_PER_CHUNK):
+            chunk = separator.join(encoded_rows[cls] for cls in classes[start:start + ROWS_PER_CHUNK])
+            yield (separator if start and separator else b"") + chunk
+
+    def iter_json(self) -> Iterator[bytes]:
+        """The matrix as a JSON array of rows"""
+        encoded = [json.dumps(row, separators=(",", ":")).encode() for row in self._rows]
+        yield b"["
+        yield from self._iter_chunks(encoded, b",")
+        yield b"]"
+
+    def iter_binary(self) -> Iterator[bytes]:
+        """The matrix as row-major signed 8-bit integers"""
+        encoded = [struct.pack(f"{self.size}b", *row) for row in self._rows]
+        yield from self._iter_chunks(encoded)
+
+    def iter_npy(self) -> Iterator[bytes]:
+        """The matrix as a NumPy .npy file (version 1.0, int8)"""
+        yield npy_header("|i1", (self.size, self.size))
+        yield from self.iter_binary()
+
+
+def npy_header(descr: str, shape: Tuple[int, ...]) -> bytes:
+    """Header of a version 1.0 .npy file for a C-ordered array"""
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': {shape!r}, }}"
+    # Magic (6) + version (2) + length (2) + header, padded to a multiple of 64 with a trailing newline
+    padding = -(10 + len(header) + 1) % 64
+    header = header + " " * padding + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
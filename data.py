@@ -165,3 +165,152 @@ REMEDIES_PART3 = {
         "remedies": ["Remedy not mentioned"]
     }
 }
+
+# Name rules 3-10, compiled by rules.py. "when" decides whether a rule applies:
+#   present / missing: numbers that must all be present / missing in the Loshu grid
+#   present_any: named groups of numbers, one of which must be fully present
+#     (the first such name is available to descriptions as {matched})
+#   numbers_not: neither driver nor conductor may be one of these
+#   numbers_any: driver or conductor must be one of these
+#   pairs: allowed (driver, conductor) pairs
+# The first or full name value is then checked against the outcomes in order
+# (value_in / value_not_in a list of values or one of "numbers" (driver and
+# conductor), "bad" (bad numbers), "driver_non_friends"); when none matches the
+# rule is contradicted with "otherwise". Descriptions are formatted with
+# {value}, {driver}, {conductor} and {matched}.
+NAME_RULES = [
+    {
+        "rule": "Rule 3",
+        "name": "full",
+        "when": {},
+        "outcomes": [
+            {"value_not_in": [4, 8], "status": "good",
+             "description": "Full name total ({value}) is not 4 or 8 ✓"}
+        ],
+        "otherwise": {"status": "bad", "severity": "high",
+                      "description": "Full name total is {value} (should NOT be 4 or 8)"}
+    },
+    {
+        "rule": "Rule 4",
+        "name": "first",
+        "when": {},
+        "outcomes": [
+            {"value_not_in": [4, 8], "status": "good",
+             "description": "First name total ({value}) is not 4 or 8 ✓"}
+        ],
+        "otherwise": {"status": "bad", "severity": "high",
+                      "description": "First name total is {value} (should NOT be 4 or 8)"}
+    },
+    {
+        "rule": "Rule 5",
+        "name": "first",
+        "when": {},
+        "outcomes": [
+            {"value_not_in": "driver_non_friends", "status": "good",
+             "description": "First name total ({value}) is not anti to driver {driver} ✓"}
+        ],
+        "otherwise": {"status": "bad", "severity": "high",
+                      "description": "First name total ({value}) is anti to driver {driver}"}
+    },
+    {
+        "rule": "Rule 6",
+        "name": "full",
+        "when": {},
+        "outcomes": [
+            {"value_in": "numbers", "status": "good",
+             "description": "Full name total ({value}) matches driver or conductor ✓"},
+            {"value_not_in": "bad", "status": "good",
+             "description": "Full name total ({value}) is compatible with your numbers ✓"}
+        ],
+        "otherwise": {"status": "warning", "severity": "medium",
+                      "description": "Full name total ({value}) is not comfortable with driver/conductor"}
+    },
+    {
+        "rule": "Rule 7",
+        "name": "full",
+        "when": {"present": [5, 6], "numbers_not": [8]},
+        "outcomes": [
+            {"value_in": [1], "status": "excellent",
+             "description": "Name totals to 1 (both 5 & 6 present, D/C not 8) ✓"}
+        ],
+        "otherwise": {"status": "suggestion", "severity": "low",
+                      "description": "Name should total to 1 (both 5 & 6 present, D/C not 8), but it's {value}"}
+    },
+    {
+        "rule": "Rule 8",
+        "name": "full",
+        "when": {"missing": [5], "present_any": {"2-5-8": [2, 8], "4-5-6": [4, 6]}},
+        "outcomes": [
+            {"value_in": [5], "status": "excellent",
+             "description": "Name totals to 5 (completes line: {matched}) ✓"}
+        ],
+        "otherwise": {"status": "suggestion", "severity": "medium",
+                      "description": "Name should total to 5 to complete line ({matched}), but it's {value}"}
+    },
+    {
+        "rule": "Rule 9",
+        "name": "full",
+        "when": {"missing": [6], "numbers_not": [3]},
+        "outcomes": [
+            {"value_in": [6], "status": "excellent",
+             "description": "Name totals to 6 (6 missing, D/C not 3) ✓"}
+        ],
+        "otherwise": {"status": "suggestion", "severity": "medium",
+                      "description": "Name should total to 6 (6 is missing, D/C not 3), but it's {value}"}
+    },
+    {
+        "rule": "Rule 10",
+        "name": "full",
+        "when": {"missing": [3], "numbers_not": [6]},
+        "outcomes": [
+            {"value_in": [3], "status": "excellent",
+             "description": "Name totals to 3 (3 missing, D/C not 6) ✓"}
+        ],
+        "otherwise": {"status": "suggestion", "severity": "medium",
+                      "description": "Name should total to 3 (3 is missing, D/C not 6), but it's {value}"}
+    }
+]
+
+# Remedies Part 2 - Yantras, with the same "when" conditions as NAME_RULES
+YANTRA_RULES = [
+    {
+        "remedy": "Wear Surya Budha Yantra",
+        "condition": "5 is missing and 6 is present, but driver or conductor should not be 8",
+        "when": {"missing": [5], "present": [6], "numbers_not": [8]}
+    },
+    {
+        "remedy": "Wear Budha Payra",
+        "condition": "5 and 6 are missing, but driver or conductor should not be 3",
+        "when": {"missing": [5, 6], "numbers_not": [3]}
+    },
+    {
+        "remedy": "Wear Surya Payra",
+        "condition": "6 is missing and 5 is present, but driver or conductor should not be 8 or 3 (Pyra will not only take care of missing number 6 but also missing other numbers too)",
+        "when": {"missing": [6], "present": [5], "numbers_not": [3, 8]}
+    },
+    {
+        "remedy": "Wear Pyra Yantra",
+        "condition": "6 is missing and 5 is present, driver or conductor is 8, but driver or conductor should not be 3",
+        "when": {"missing": [6], "present": [5], "numbers_any": [8], "numbers_not": [3]}
+    },
+    {
+        "remedy": "Wear Budha Yantra",
+        "condition": "Driver-Conductor is 3-8 or 8-3, and 5 is missing",
+        "when": {"missing": [5], "pairs": [[3, 8], [8, 3]]}
+    },
+    {
+        "remedy": "Wear Surya Yantra",
+        "condition": "Driver-Conductor is 3-6 or 6-3, and 5 is present",
+        "when": {"present": [5], "pairs": [[3, 6], [6, 3]]}
+    },
+    {
+        "remedy": "Saraswati Yantra for the education of children",
+        "condition": "Driver or conductor should not be 6",
+        "when": {"numbers_not": [6]}
+    },
+    {
+        "remedy": "Wear Gayatri Yantra for health issues only",
+        "condition": "For health issues only",
+        "when": {}
+    }
+]
@@ -0,0 +1,190 @@
+"""
+Inverted index over the date profile table - find the birth dates matching a pattern
+
+Every (date, gender) slot of the DateProfileTable is a bit position. The index
+keeps one bitmap (a Python int) per driver, conductor and kua number, per
+present Loshu number, per complete Loshu line and per gender, so a query is a
+handful of big-int ANDs instead of a scan over every date.
+"""
+import threading
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from calculations import NUMBER_BITS
+from date_profiles import DateProfileTable, GENDERS, get_date_profile_table
+from loshu_lines import LOSHU_LINES, LINE_MASKS
+
+# Set bit positions of every byte value, for walking a bitmap byte by byte
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+NumberFilter = Union[None, int, Sequence[int]]
+
+
+def _bitmap(flags: bytearray) -> int:
+    return int.from_bytes(flags, "little")
+
+
+def normalize_line(line: str) -> str:
+    """Resolve a line given as its numbers ('4-5-6', '456', '654') to its LOSHU_LINES key"""
+    digits = "".join(ch for ch in str(line) if ch.isdigit())
+    for key in LOSHU_LINES:
+        if sorted(key) == sorted(digits):
+            return key
+    raise ValueError(f"Unknown Loshu line '{line}' (choose from {', '.join(LOSHU_LINES)})")
+
+
+class DateIndex:
+    """Bitmaps of the table slots by driver, conductor, kua, Loshu numbers, lines and gender"""
+
+    def __init__(self, table: DateProfileTable):
+        self.table = table
+        drivers, conductors, kuas, masks = table.columns()
+        self.size = len(masks)
+        self.universe = (1 << self.size) - 1
+        nbytes = (self.size + 7) // 8
+
+        by_driver = [bytearray(nbytes) for _ in range(10)]
+        by_conductor = [bytearray(nbytes) for _ in range(10)]
+        by_kua = [bytearray(nbytes) for _ in range(10)]
+        by_mask: Dict[int, bytearray] = {}
+        for slot in range(self.size):
+            byte, bit = slot >> 3, 1 << (slot & 7)
+            by_driver[drivers[slot]][byte] |= bit
+            by_conductor[conductors[slot]][byte] |= bit
+            by_kua[kuas[slot]][byte] |= bit
+            flags = by_mask.get(masks[slot])
+            if flags is None:
+                flags = by_mask[masks[slot]] = bytearray(nbytes)
+            flags[byte] |= bit
+
+        self.driver = [_bitmap(flags) for flags in by_driver]
+        self.conductor = [_bitmap(flags) for flags in by_conductor]
+        self.kua = [_bitmap(flags) for flags in by_kua]
+
+        # Present numbers and complete lines are unions of the presence mask bitmaps
+        mask_bitmaps = {mask: _bitmap(flags) for mask, flags in by_mask.items()}
+        self.present = [0] * 10
+        for number in range(1, 10):
+            for mask, bitmap in mask_bitmaps.items():
+                if mask & NUMBER_BITS[number]:
+                    self.present[number] |= bitmap
+        self.lines: Dict[str, int] = {}
+        for key, line_mask in LINE_MASKS.items():
+            bitmap = 0
+            for mask, slots in mask_bitmaps.items():
+                if mask & line_mask == line_mask:
+                    bitmap |= slots
+            self.lines[key] = bitmap
+
+        # Slots alternate between the two genders, starting with GENDERS[0]
+        even = _bitmap(bytearray(b"\x55" * nbytes)) & self.universe
+        self.gender = {GENDERS[0]: even, GENDERS[1]: self.universe & ~even}
+
+    def _any_of(self, bitmaps: List[int], values: NumberFilter, field: str) -> int:
+        if isinstance(values, int):
+            values = [values]
+        elif not values:
+            raise ValueError(f"{field} must list at least one number")
+        result = 0
+        for value in values:
+            if not 1 <= value <= 9:
+                raise ValueError(f"{field} must be between 1 and 9")
+            result |= bitmaps[value]
+        return result
+
+    def query(
+        self,
+        driver: NumberFilter = None,
+        conductor: NumberFilter = None,
+        kua: NumberFilter = None,
+        gender: Optional[str] = None,
+        present: Iterable[int] = (),
+        missing: Iterable[int] = (),
+        lines: Iterable[str] = (),
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> int:
+        """
+        Bitmap of the slots matching every given condition. Driver, conductor
+        and kua accept one number or a list of alternatives; present, missing
+        and lines must all hold.
+        """
+        result = self.universe
+        if start is not None or end is not None:
+            first, stop = self.table.slot_range(start or date.min, end or date.max)
+            result = ((1 << (stop - first)) - 1) << first
+        if driver is not None:
+            result &= self._any_of(self.driver, driver, "driver")
+        if conductor is not None:
+            result &= self._any_of(self.conductor, conductor, "conductor")
+        if kua is not None:
+            result &= self._any_of(self.kua, kua, "kua")
+        if gender is not None:
+            if gender not in self.gender:
+                raise ValueError("Gender must be either male or female")
+            result &= self.gender[gender]
+        for number in present:
+            result &= self._any_of(self.present, number, "present numbers")
+        for number in missing:
+            result &= ~self._any_of(self.present, number, "missing numbers")
+        for line in lines:
+            result &= self.lines[normalize_line(line)]
+        return result & self.universe
+
+    @staticmethod
+    def count(bitmap: int) -> int:
+        """Number of slots in a bitmap"""
+        return bin(bitmap).count("1")
+
+    def iter_slots(self, bitmap: int, cursor: int = 0) -> Iterator[int]:
+        """Yield the set slots of a bitmap in order, starting at slot cursor"""
+        if cursor:
+            bitmap = bitmap >> cursor << cursor
+        data = bitmap.to_bytes((self.size + 7) // 8, "little")
+        for byte_index in range(cursor >> 3, len(data)):
+            value = data[byte_index]
+            if value:
+                base = byte_index << 3
+                for bit in _BYTE_BITS[value]:
+                    yield base + bit
+
+    def describe(self, slot: int) -> Dict[str, Any]:
+        """The date, gender and core numbers of a slot"""
+        birth_date, gender = self.table.slot_date(slot)
+        drivers, conductors, kuas, _ = self.table.columns()
+        return {
+            "date_of_birth": birth_date.isoformat(),
+            "gender": gender,
+            "token": f"{birth_date:%Y%m%d}{gender[0]}",
+            "driver": drivers[slot],
+            "conductor": conductors[slot],
+            "kua": kuas[slot]
+        }
+
+
+_default_index: Optional[DateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_date_index() -> DateIndex:
+    """Return the shared date index, building it (and the date table) on first use"""
+    global _default_index
+    if _default_index is None:
+        with _index_lock:
+            if _default_index is None:
+                _default_index = DateIndex(get_date_profile_table())
+    return _default_index
+
+
+if __name__ == "__main__":
+    import time
+
+    get_date_profile_table()
+    start_time = time.perf_counter()
+    index = get_date_index()
+    print(f"Indexed {index.size} slots in {time.perf_counter() - start_time:.2f}s")
+
+    start_time = time.perf_counter()
+    matches = index.query(driver=5, conductor=1, lines=["456"], start=date(1980, 1, 1), end=date(2000, 12, 31))
+    print(f"driver 5, conductor 1, 4-5-6 line in 1980-2000: {index.count(matches)} slots "
+          f"in {(time.perf_counter() - start_time) * 1000:.2f}ms")
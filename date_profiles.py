@@ -0,0 +1,333 @@
+"""
+Precomputed date profiles - every date-derived numerology field served from a lookup table
+
+Everything except the name analysis and the luck factors depends only on
+(day, month, year, gender). The table enumerates that space once and keeps a
+compact record per date; the derived structures (grid, lines, remedies,
+lucky/bad/neutral numbers) are shared between all dates that produce them.
+Profiles returned from the table share these structures and must be treated
+as read-only.
+
+When a valid profile store file exists (see profile_store.py) the table is
+mapped from it at import time instead of being enumerated on first use.
+"""
+import mmap
+import os
+import tempfile
+import threading
+import warnings
+from datetime import date, timedelta
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from calculations import (
+    calculate_driver,
+    calculate_conductor,
+    calculate_kua,
+    count_loshu_digits,
+    digit_count_mask,
+    build_loshu_grid,
+    calculate_lucky_bad_neutral_numbers,
+    PRESENT_NUMBERS_BY_MASK,
+    MISSING_NUMBERS_BY_MASK
+)
+from data import COMPATIBILITY
+from remedies import (
+    remedies_part1_for_mask,
+    remedies_part2_for_mask,
+    remedies_part3_for_mask
+)
+from loshu_lines import COMPLETE_LINES_BY_MASK
+from profile_store import (
+    STORE_PATH,
+    HEADER_SIZE,
+    RECORD,
+    RECORD_SIZE,
+    DRIVER_OFFSET,
+    CONDUCTOR_OFFSET,
+    KUA_OFFSET,
+    MASK_OFFSET,
+    StaleStoreError,
+    open_store
+)
+
+
+# Range of birth years covered by the table
+MIN_YEAR = 1900
+MAX_YEAR = 2100
+
+GENDERS = ("male", "female")
+
+# Dates whose stored records are checked against freshly computed ones when a store is loaded
+PROBE_DATES = [(1, 1, 1900), (29, 2, 1904), (9, 9, 1999), (29, 2, 2000), (15, 5, 1990), (31, 12, 2100)]
+
+
+def compute_date_profile(day: int, month: int, year: int, gender: str) -> Dict[str, Any]:
+    """Compute every date-derived field directly, without the lookup table"""
+    driver = calculate_driver(day)
+    conductor = calculate_conductor(day, month, year)
+    kua = calculate_kua(year, gender)
+
+    digit_count = count_loshu_digits(day, month, year, driver, conductor, kua)
+    return _profile(driver, conductor, kua, digit_count_mask(digit_count), build_loshu_grid(digit_count)[0])
+
+
+def compute_record(day: int, month: int, year: int, gender: str) -> bytes:
+    """The profile store record of a date, computed directly"""
+    driver = calculate_driver(day)
+    conductor = calculate_conductor(day, month, year)
+    kua = calculate_kua(year, gender)
+
+    digit_count = count_loshu_digits(day, month, year, driver, conductor, kua)
+    return RECORD.pack(driver, conductor, kua, bytes(digit_count[1:]), digit_count_mask(digit_count))
+
+
+# Lucky, bad and neutral numbers by (driver, conductor)
+_NUMBERS_BY_PAIR: Dict[Tuple[int, int], Tuple[List[int], List[int], List[int]]] = {}
+
+
+def _profile(
+    driver: int, conductor: int, kua: int, mask: int, loshu_grid: List[List[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """Assemble a date profile from its core numbers, presence mask and grid"""
+    numbers = _NUMBERS_BY_PAIR.get((driver, conductor))
+    if numbers is None:
+        numbers = _NUMBERS_BY_PAIR[(driver, conductor)] = calculate_lucky_bad_neutral_numbers(
+            COMPATIBILITY.get(driver, {}), COMPATIBILITY.get(conductor, {})
+        )
+    lucky_numbers, bad_numbers, neutral_numbers = numbers
+
+    return {
+        "driver": driver,
+        "conductor": conductor,
+        "kua": kua,
+        "present_mask": mask,
+        "loshu_grid": loshu_grid,
+        "missing_numbers": MISSING_NUMBERS_BY_MASK[mask],
+        "present_numbers": PRESENT_NUMBERS_BY_MASK[mask],
+        "loshu_lines": COMPLETE_LINES_BY_MASK[mask],
+        "driver_compatibility": COMPATIBILITY.get(driver, {}),
+        "conductor_compatibility": COMPATIBILITY.get(conductor, {}),
+        "lucky_numbers": lucky_numbers,
+        "bad_numbers": bad_numbers,
+        "neutral_numbers": neutral_numbers,
+        "remedies_part1": remedies_part1_for_mask(mask, driver, conductor),
+        "remedies_part2": remedies_part2_for_mask(mask, driver, conductor),
+        "remedies_part3": remedies_part3_for_mask(mask)
+    }
+
+
+class DateProfileTable:
+    """
+    Lookup table of date profiles for every (day, month, year, gender) in a year range
+
+    The slots are fixed-width records in the profile_store layout, either
+    built in memory or mapped from a store file, and the core numbers are
+    read in place through strided views of them.
+    """
+
+    def __init__(self, min_year: int = MIN_YEAR, max_year: int = MAX_YEAR):
+        self.min_year = min_year
+        self.max_year = max_year
+        self._origin = date(min_year, 1, 1).toordinal()
+        self._days = date(max_year, 12, 31).toordinal() - self._origin + 1
+
+        # One record per (date, gender): core numbers, digit counts and present mask,
+        # at offset _base of _raw (bytes or an mmap)
+        self._raw: Any = b""
+        self._base = 0
+        self._records = memoryview(b"")
+        self._driver: Sequence[int] = ()
+        self._conductor: Sequence[int] = ()
+        self._kua: Sequence[int] = ()
+        self._mask: Sequence[int] = ()
+
+        # Grids by digit counts, shared between dates with the same counts
+        self._grids: Dict[bytes, List[List[Dict[str, Any]]]] = {}
+        self._built = False
+        self._segment: Optional[mmap.mmap] = None
+        self.source = "memory"
+
+    def __len__(self) -> int:
+        return len(self._mask)
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    @property
+    def shared(self) -> bool:
+        return self._segment is not None
+
+    def _attach(self, raw: Any, base: int = 0) -> None:
+        """Read the columns through views of the records in raw"""
+        records = memoryview(raw)[base:].toreadonly()
+        self._raw = raw
+        self._base = base
+        self._records = records
+        self._driver = records[DRIVER_OFFSET::RECORD_SIZE]
+        self._conductor = records[CONDUCTOR_OFFSET::RECORD_SIZE]
+        self._kua = records[KUA_OFFSET::RECORD_SIZE]
+        self._mask = records.cast("H")[MASK_OFFSET // 2::RECORD_SIZE // 2]
+        self._built = True
+
+    def build(self) -> "DateProfileTable":
+        """Enumerate the whole date space once and fill the table"""
+        records = bytearray()
+        kua_by_year = {
+            year: tuple(calculate_kua(year, gender) for gender in GENDERS)
+            for year in range(self.min_year, self.max_year + 1)
+        }
+
+        current = date(self.min_year, 1, 1)
+        one_day = timedelta(days=1)
+        for _ in range(self._days):
+            day, month, year = current.day, current.month, current.year
+            driver = calculate_driver(day)
+            conductor = calculate_conductor(day, month, year)
+
+            for kua in kua_by_year[year]:
+                digit_count = count_loshu_digits(day, month, year, driver, conductor, kua)
+                counts = bytes(digit_count[1:])
+                if counts not in self._grids:
+                    self._grids[counts] = build_loshu_grid(digit_count)[0]
+
+                records += RECORD.pack(driver, conductor, kua, counts, digit_count_mask(digit_count))
+            current += one_day
+
+        self._attach(bytes(records))
+        self.source = "memory"
+        return self
+
+    def load(self, path: str) -> "DateProfileTable":
+        """Map the records from a profile store file (see profile_store.py) instead of building them"""
+        segment = open_store(path, self.min_year, self.max_year)
+        for day, month, year in PROBE_DATES:
+            if not self.min_year <= year <= self.max_year:
+                continue
+            for gender in GENDERS:
+                offset = HEADER_SIZE + self._slot(day, month, year, gender) * RECORD_SIZE
+                if segment[offset:offset + RECORD_SIZE] != compute_record(day, month, year, gender):
+                    segment.close()
+                    raise StaleStoreError(f"{path} has records that differ from the running code; "
+                                          f"regenerate it with `python profile_store.py`")
+        self._segment = segment
+        self._attach(segment, HEADER_SIZE)
+        self.source = path
+        return self
+
+    def share(self, directory: Optional[str] = None) -> "DateProfileTable":
+        """
+        Move the records into a read-only shared memory segment, so processes
+        forked afterwards map the same pages instead of copying them on write.
+        The segment is anonymous, or an unlinked file in directory (e.g. a
+        tmpfs or hugetlbfs mount) when one is given. Tables loaded from a
+        profile store are already file-backed and shared as they are.
+        """
+        if not self._built:
+            self.build()
+        if self._segment is not None:
+            return self
+
+        size = len(self._records)
+        if directory:
+            fd, path = tempfile.mkstemp(prefix="numerology-dates-", dir=directory)
+            try:
+                os.ftruncate(fd, size)
+                segment = mmap.mmap(fd, size)
+            finally:
+                os.unlink(path)
+                os.close(fd)
+        else:
+            segment = mmap.mmap(-1, size)
+
+        segment[:] = self._records
+        self._segment = segment
+        self._attach(segment)
+        self.source = "shared"
+        return self
+
+    def records(self) -> memoryview:
+        """The raw records in profile_store layout, building the table if needed"""
+        if not self._built:
+            self.build()
+        return self._records
+
+    def _slot(self, day: int, month: int, year: int, gender: str) -> Optional[int]:
+        if not self.min_year <= year <= self.max_year:
+            return None
+        offset = date(year, month, day).toordinal() - self._origin
+        return offset * 2 + (0 if gender.lower() == "male" else 1)
+
+    def columns(self) -> Tuple[Sequence[int], Sequence[int], Sequence[int], Sequence[int]]:
+        """Per-slot (driver, conductor, kua, present mask) arrays, building the table if needed"""
+        if not self._built:
+            self.build()
+        return self._driver, self._conductor, self._kua, self._mask
+
+    def slot_date(self, slot: int) -> Tuple[date, str]:
+        """The (date, gender) stored in a slot"""
+        return date.fromordinal(self._origin + slot // 2), GENDERS[slot % 2]
+
+    def slot_range(self, start: date, end: date) -> Tuple[int, int]:
+        """Slots [first, stop) of the dates from start to end (inclusive), clamped to the table"""
+        first = max(0, start.toordinal() - self._origin) * 2
+        stop = min(self._days, end.toordinal() - self._origin + 1) * 2
+        return first, max(first, stop)
+
+    def lookup(self, day: int, month: int, year: int, gender: str) -> Optional[Dict[str, Any]]:
+        """Return the date profile from the table, or None if the date is outside its range"""
+        if not self._built:
+            self.build()
+        slot = self._slot(day, month, year, gender)
+        if slot is None:
+            return None
+
+        driver, conductor, kua, counts, mask = RECORD.unpack_from(self._raw, self._base + slot * RECORD_SIZE)
+        grid = self._grids.get(counts)
+        if grid is None:
+            grid = self._grids[counts] = build_loshu_grid((0,) + tuple(counts))[0]
+        return _profile(driver, conductor, kua, mask, grid)
+
+
+def _open_default_table() -> DateProfileTable:
+    """The shared table, mapped from the profile store when there is a valid one"""
+    table = DateProfileTable()
+    if STORE_PATH and os.path.exists(STORE_PATH):
+        try:
+            table.load(STORE_PATH)
+        except (OSError, StaleStoreError) as e:
+            warnings.warn(f"Ignoring the date profile store, building the table instead: {e}")
+    return table
+
+
+# Shared table used by the API, mapped from the profile store at import or built on first use
+_default_table = _open_default_table()
+
+
+_build_lock = threading.Lock()
+
+
+def get_date_profile_table() -> DateProfileTable:
+    """Return the shared date profile table, building it if needed"""
+    if not _default_table.built:
+        with _build_lock:
+            if not _default_table.built:
+                _default_table.build()
+    return _default_table
+
+
+def get_date_profile(day: int, month: int, year: int, gender: str) -> Dict[str, Any]:
+    """Return every date-derived field, from the table when the date is in range"""
+    profile = get_date_profile_table().lookup(day, month, year, gender)
+    if profile is None:
+        profile = compute_date_profile(day, month, year, gender)
+    return profile
+
+
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    table = get_date_profile_table()
+    elapsed = time.perf_counter() - start
+    print(f"Loaded {len(table)} date profiles ({MIN_YEAR}-{MAX_YEAR}) from {table.source} in {elapsed:.2f}s")
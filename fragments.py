@@ -0,0 +1,147 @@
+"""
+Pre-serialized response fragments - constant structures encoded to JSON once at startup
+
+Compatibility entries, remedy lists and Loshu line analyses are shared,
+read-only objects (see date_profiles.py). They are encoded once here and the
+response builder splices their bytes into responses by object identity, so
+the long descriptive strings are never walked by the encoder again.
+
+Fragments (and Slot placeholders) are spliced in by position while the
+response is encoded, never by searching the encoded output, so no user
+data can be mistaken for them.
+"""
+from typing import Any, Dict, Iterable, List, Union
+
+from calculations import PRESENT_NUMBERS_BY_MASK, MISSING_NUMBERS_BY_MASK
+from data import COMPATIBILITY
+from loshu_lines import COMPLETE_LINES_BY_MASK
+from remedies import REMEDIES_PART1_BY_MASK, REMEDIES_PART2_BY_BITS, REMEDIES_PART3_BY_MASK
+import serialization
+from serialization import dumps
+
+# Encoded JSON split at the slots: bytes interleaved with slot names
+EncodedParts = List[Union[bytes, str]]
+
+
+class Slot:
+    """Placeholder for a value filled in after encoding, such as an echoed name (see encode_parts)"""
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+class FragmentRegistry:
+    """Encoded JSON of constant objects, looked up by object identity"""
+
+    def __init__(self):
+        # id -> (object, fragment index); the object is kept so its id stays valid
+        self._ids: Dict[int, Any] = {}
+        self._encoded: List[bytes] = []
+        self._keys: Dict[str, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self._encoded)
+
+    def register(self, obj: Any) -> None:
+        """Encode a constant object once; it must not be modified afterwards"""
+        if id(obj) not in self._ids:
+            self._ids[id(obj)] = (obj, len(self._encoded))
+            self._encoded.append(dumps(obj))
+
+    def register_all(self, objects: Iterable[Any]) -> None:
+        for obj in objects:
+            self.register(obj)
+
+    def _key(self, key: str) -> bytes:
+        encoded = self._keys.get(key)
+        if encoded is None:
+            encoded = self._keys[key] = dumps(str(key)) + b":"
+        return encoded
+
+    def _encode_into(self, content: Any, parts: EncodedParts) -> None:
+        # Fragments and slots are spliced in by position; runs of other items
+        # of a dictionary are encoded together, nested dictionaries recursively
+        ids = self._ids
+        fragment = ids.get(id(content))
+        if fragment is not None:
+            parts.append(self._encoded[fragment[1]])
+            return
+        if type(content) is Slot:
+            parts.append(content.name)
+            return
+        if type(content) is not dict:
+            parts.append(dumps(content))
+            return
+
+        separator = b"{"
+        run = {}
+        for key, value in content.items():
+            if type(value) is not dict and type(value) is not Slot and id(value) not in ids:
+                run[key] = value
+                continue
+            if run:
+                parts.append(separator + dumps(run)[1:-1])
+                run = {}
+                separator = b","
+            parts.append(separator + self._key(key))
+            separator = b","
+            self._encode_into(value, parts)
+        if run:
+            parts.append(separator + dumps(run)[1:-1])
+        parts.append(b"{}" if separator == b"{" and not run else b"}")
+
+    def encode(self, content: Any) -> bytes:
+        """Encode content as JSON, splicing in pre-encoded fragments"""
+        parts: EncodedParts = []
+        self._encode_into(content, parts)
+        return b"".join(parts)
+
+    def encode_parts(self, content: Any) -> EncodedParts:
+        """Encode content as JSON split at its Slot values: bytes interleaved with slot names"""
+        parts: EncodedParts = []
+        self._encode_into(content, parts)
+        merged: EncodedParts = []
+        pending: List[bytes] = []
+        for part in parts:
+            if isinstance(part, str):
+                merged.append(b"".join(pending))
+                merged.append(part)
+                pending = []
+            else:
+                pending.append(part)
+        merged.append(b"".join(pending))
+        return merged
+
+
+def _default_fragments() -> FragmentRegistry:
+    registry = FragmentRegistry()
+    registry.register_all(COMPATIBILITY.values())
+    registry.register_all(PRESENT_NUMBERS_BY_MASK)
+    registry.register_all(MISSING_NUMBERS_BY_MASK)
+    registry.register_all(COMPLETE_LINES_BY_MASK)
+    registry.register_all(REMEDIES_PART1_BY_MASK[0])
+    registry.register_all(REMEDIES_PART1_BY_MASK[1])
+    registry.register_all(REMEDIES_PART2_BY_BITS.values())
+    registry.register_all(REMEDIES_PART3_BY_MASK)
+    return registry
+
+
+# Shared registry of the numerology constant structures
+fragments = _default_fragments()
+
+
+def encode_response(content: Any) -> bytes:
+    """
+    Encode a response body, splicing in the pre-encoded constant structures.
+    orjson encodes a whole response faster than the splicing costs, so the
+    fragments are only used with the standard library backend.
+    """
+    if serialization.backend == "orjson":
+        return dumps(content)
+    return fragments.encode(content)
+
+
+def encode_parts(content: Any) -> EncodedParts:
+    """Encode a response body split at its Slot values (with either backend)"""
+    return fragments.encode_parts(content)
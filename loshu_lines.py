@@ -3,6 +3,8 @@ Loshu Grid line analysis - detect complete lines and planes
 """
 from typing import List, Dict, Any
 
+from calculations import FULL_MASK, numbers_to_mask, mask_to_numbers
+
 
 # Loshu Grid Lines with their meanings
 LOSHU_LINES = {
@@ -62,17 +64,25 @@ LOSHU_LINES = {
 }
 
 
-def analyze_loshu_lines(present_numbers: List[int]) -> Dict[str, Any]:
-    """
-    Analyze which lines/planes are complete in the Loshu Grid
+# Presence bit mask of each line's numbers
+LINE_MASKS = {
+    line_key: numbers_to_mask(line_info["numbers"])
+    for line_key, line_info in LOSHU_LINES.items()
+}
 
-    Args:
-        present_numbers: List of numbers present in the grid
+# Output entry of each line, shared by every analysis that includes it
+_LINE_DATA = {
+    line_key: {
+        "numbers": line_info["numbers"],
+        "name": line_info["name"],
+        "description": line_info["description"],
+        "type": line_info["type"]
+    }
+    for line_key, line_info in LOSHU_LINES.items()
+}
 
-    Returns:
-        Dictionary containing complete lines categorized by type
-    """
-    present_set = set(present_numbers)
+
+def _complete_lines(mask: int) -> Dict[str, Any]:
     complete_lines = {
         "diagonal": [],
         "vertical": [],
@@ -81,16 +91,10 @@ def analyze_loshu_lines(present_numbers: List[int]) -> Dict[str, Any]:
     }
 
     for line_key, line_info in LOSHU_LINES.items():
-        required_numbers = set(line_info["numbers"])
-
         # Check if all numbers in the line are present
-        if required_numbers.issubset(present_set):
-            line_data = {
-                "numbers": line_info["numbers"],
-                "name": line_info["name"],
-                "description": line_info["description"],
-                "type": line_info["type"]
-            }
+        line_mask = LINE_MASKS[line_key]
+        if mask & line_mask == line_mask:
+            line_data = _LINE_DATA[line_key]
 
             # Add to type-specific category
             complete_lines[line_info["type"]].append(line_data)
@@ -101,6 +105,44 @@ def analyze_loshu_lines(present_numbers: List[int]) -> Dict[str, Any]:
     return complete_lines
 
 
+def _missing_lines(mask: int) -> List[Dict[str, Any]]:
+    missing_lines = []
+
+    for line_key, line_info in LOSHU_LINES.items():
+        # Check if line is incomplete
+        line_mask = LINE_MASKS[line_key]
+        if mask & line_mask != line_mask:
+            missing_lines.append({
+                "numbers": line_info["numbers"],
+                "name": line_info["name"],
+                "description": line_info["description"],
+                "type": line_info["type"],
+                "missing": mask_to_numbers(line_mask & ~mask),
+                "present": mask_to_numbers(line_mask & mask)
+            })
+
+    return missing_lines
+
+
+# Complete / incomplete lines for every possible presence mask (shared, treat as read-only)
+COMPLETE_LINES_BY_MASK = [_complete_lines(mask) for mask in range(FULL_MASK + 1)]
+MISSING_LINES_BY_MASK = [_missing_lines(mask) for mask in range(FULL_MASK + 1)]
+
+
+def analyze_loshu_lines(present_numbers: List[int]) -> Dict[str, Any]:
+    """
+    Analyze which lines/planes are complete in the Loshu Grid
+
+    Args:
+        present_numbers: List of numbers present in the grid
+
+    Returns:
+        Dictionary containing complete lines categorized by type
+        (shared between calls, treat as read-only)
+    """
+    return COMPLETE_LINES_BY_MASK[numbers_to_mask(present_numbers)]
+
+
 def get_line_summary(present_numbers: List[int]) -> str:
     """
     Get a text summary of complete lines
@@ -145,25 +187,6 @@ def get_missing_lines(present_numbers: List[int]) -> List[Dict[str, Any]]:
 
     Returns:
         List of incomplete lines with missing numbers
+        (shared between calls, treat as read-only)
     """
-    present_set = set(present_numbers)
-    missing_lines = []
-
-    for line_key, line_info in LOSHU_LINES.items():
-        required_numbers = set(line_info["numbers"])
-
-        # Check if line is incomplete
-        if not required_numbers.issubset(present_set):
-            missing_nums = required_numbers - present_set
-
-            if len(missing_nums) > 0:  # Only if some numbers are missing
-                missing_lines.append({
-                    "numbers": line_info["numbers"],
-                    "name": line_info["name"],
-                    "description": line_info["description"],
-                    "type": line_info["type"],
-                    "missing": sorted(list(missing_nums)),
-                    "present": sorted(list(required_numbers & present_set))
-                })
-
-    return missing_lines
+    return MISSING_LINES_BY_MASK[numbers_to_mask(present_numbers)]
@@ -0,0 +1,62 @@
+"""
+Luck factor timeline - luck factors for any range of years
+
+Personal years repeat every 9 years (see PERSONAL_YEAR_TABLE), so the luck
+factor of a year only depends on (day + month) % 9, the driver number and
+the year % 9. Those 9-year cycles are precomputed and a timeline is read
+off them without recalculating each year.
+"""
+from typing import Any, Dict, Iterator, List, Tuple
+
+from calculations import PERSONAL_YEAR_TABLE
+from data import LUCK_FACTOR
+
+# Longest range served by the timeline endpoint (a full lifetime)
+MAX_TIMELINE_YEARS = 100
+
+# Years that can be formatted in a luck factor date
+MIN_YEAR = 1
+MAX_YEAR = 9999
+
+# (personal year, combination, luck factor) by (day + month) % 9, driver and year % 9
+LUCK_CYCLES: Tuple[Tuple[Tuple[Tuple[int, str, str], ...], ...], ...] = tuple(
+    tuple(
+        tuple(
+            (personal_year, f"{personal_year},{driver}", LUCK_FACTOR.get(personal_year, {}).get(driver, "N/A"))
+            for personal_year in PERSONAL_YEAR_TABLE[date_residue]
+        )
+        for driver in range(10)
+    )
+    for date_residue in range(9)
+)
+
+
+def iter_luck_timeline(day: int, month: int, driver: int, start_year: int, end_year: int) -> Iterator[Dict[str, Any]]:
+    """Yield the luck factor of each year from start_year to end_year (inclusive)"""
+    cycle = LUCK_CYCLES[(day + month) % 9][driver]
+    date_prefix = f"{day:02d}/{month:02d}/"
+    for year in range(start_year, end_year + 1):
+        personal_year, combination, luck_factor = cycle[year % 9]
+        yield {
+            "year": year,
+            "date": f"{date_prefix}{year}",
+            "personal_year": personal_year,
+            "driver": driver,
+            "combination": combination,
+            "luck_factor": luck_factor
+        }
+
+
+def luck_timeline(day: int, month: int, driver: int, start_year: int, years: int) -> List[Dict[str, Any]]:
+    """Luck factors for a number of years starting at start_year"""
+    return list(iter_luck_timeline(day, month, driver, start_year, start_year + years - 1))
+
+
+def validate_year_range(start_year: int, end_year: int) -> None:
+    """Raise ValueError unless the range is ordered, formattable and at most MAX_TIMELINE_YEARS long"""
+    if not MIN_YEAR <= start_year <= MAX_YEAR or not MIN_YEAR <= end_year <= MAX_YEAR:
+        raise ValueError(f"Years must be between {MIN_YEAR} and {MAX_YEAR}")
+    if end_year < start_year:
+        raise ValueError("end_year must not be before start_year")
+    if end_year - start_year + 1 > MAX_TIMELINE_YEARS:
+        raise ValueError(f"At most {MAX_TIMELINE_YEARS} years can be requested at once")
@@ -2,35 +2,166 @@
 FastAPI application for Numerology Calculator
 Refactored and modularized for better code organization
 """
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Request
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel, field_validator
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from contextlib import asynccontextmanager
+from itertools import islice
+from typing import List, Optional, Union
+import asyncio
 import os
+import threading
 
 # Import modularized components
-from calculations import (
-    calculate_driver,
-    calculate_conductor,
-    calculate_kua,
-    calculate_personal_year,
-    create_personalized_loshu_grid,
-    calculate_lucky_bad_neutral_numbers
+from date_profiles import get_date_profile_table
+from name_numerology import calculate_name_value, name_cache_stats, suggest_name_corrections
+from rules import rule_cache_stats
+from numerology import (
+    normalize_name,
+    normalize_gender,
+    make_profile_token,
+    parse_profile_token,
+    resolve_date_profile,
+    analyze_name,
+    score_names
 )
-from data import COMPATIBILITY, LUCK_FACTOR
-from remedies import (
-    calculate_remedies_part1,
-    calculate_remedies_part2,
-    calculate_remedies_part3
-)
-from name_numerology import validate_name_numerology
-from loshu_lines import analyze_loshu_lines
+from auspicious_dates import find_auspicious_dates
+from compatibility_matrix import CompatibilityMatrix, FORMATS as MATRIX_FORMATS, MAX_PEOPLE
+from date_index import get_date_index
+from luck_timeline import MAX_TIMELINE_YEARS, iter_luck_timeline, validate_year_range
+from response_cache import response_cache
+from schemas import NumerologyResponse, ErrorResponse
+from serialization import FastJSONResponse, dumps
+from batch import BatchStreamingResponse, NDJSONStreamingResponse, stream_batch
+from static_assets import get_asset_store, asset_response, IMMUTABLE, REVALIDATE
+from pdf_report import RendererBusy, get_renderer, get_template, report_filename
+import metrics
+
+# When the shared structures are built: "eager" (before serving), "background"
+# (in a thread while serving; requests that need them wait for it) or "lazy"
+# (on first use only)
+STARTUP_MODES = ("eager", "background", "lazy")
+STARTUP_MODE = os.environ.get("NUMEROLOGY_STARTUP", "background")
+if STARTUP_MODE not in STARTUP_MODES:
+    raise ValueError(f"NUMEROLOGY_STARTUP must be one of {', '.join(STARTUP_MODES)}")
+
+
+def preload():
+    """Build the date profile table and index and load the page, static assets and report template"""
+    get_asset_store()
+    get_date_profile_table()
+    get_date_index()
+    get_template()
+
+
+# Set once a background preload has finished (None while no preload is running)
+_preloaded: Optional[asyncio.Event] = None
+
+# Paths served while a background preload is still running
+PRELOAD_EXEMPT_PATHS = {"/metrics", "/cache/stats"}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Preload the shared structures (a no-op in workers forked by serve.py), stop the report workers on shutdown"""
+    global _preloaded
+    if STARTUP_MODE == "eager":
+        preload()
+    elif STARTUP_MODE == "background":
+        loop = asyncio.get_running_loop()
+        _preloaded = preloaded = asyncio.Event()
+
+        def run_preload():
+            try:
+                preload()
+            finally:
+                loop.call_soon_threadsafe(preloaded.set)
+
+        threading.Thread(target=run_preload, name="numerology-preload", daemon=True).start()
+    yield
+    get_renderer().shutdown()
+
+
+class PreloadGate:
+    """
+    Hold requests until a background preload has finished, awaiting it on the
+    event loop rather than blocking the loop on the build locks
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        preloaded = _preloaded
+        if (preloaded is not None and not preloaded.is_set() and scope["type"] == "http"
+                and scope["path"] not in PRELOAD_EXEMPT_PATHS):
+            await preloaded.wait()
+        await self.app(scope, receive, send)
+
+
+app = FastAPI(title="Numerology Calculator API", default_response_class=FastJSONResponse, lifespan=lifespan)
+app.add_middleware(PreloadGate)
+app.add_middleware(metrics.MetricsMiddleware)
+
 
-app = FastAPI(title="Numerology Calculator API")
+@app.exception_handler(RequestValidationError)
+async def count_validation_errors(request: Request, exc: RequestValidationError):
+    """Count rejected request bodies, then respond as FastAPI does by default"""
+    metrics.record_error(type(exc).__name__)
+    return await request_validation_exception_handler(request, exc)
 
-# Mount static files directory
-app.mount("/static", StaticFiles(directory="static"), name="static")
+
+# Response cache statistics, read when /metrics is rendered
+for _stat, _type, _help in [
+    ("hits", "counter", "Response cache hits"),
+    ("misses", "counter", "Response cache misses"),
+    ("evictions", "counter", "Response cache evictions"),
+    ("expirations", "counter", "Response cache entries expired by TTL"),
+    ("size", "gauge", "Response cache entries"),
+    ("max_size", "gauge", "Response cache capacity")
+]:
+    _name = f"numerology_cache_{_stat}" + ("_total" if _type == "counter" else "")
+    metrics.gauge(_name, _help, lambda stat=_stat: response_cache.stats()[stat], type=_type)
+
+# Request coalescing statistics
+for _stat, _type, _help in [
+    ("calls", "counter", "Calculations started for /calculate cache misses"),
+    ("coalesced", "counter", "/calculate requests that waited for an identical calculation already in flight"),
+    ("in_flight", "gauge", "/calculate calculations in flight")
+]:
+    _name = f"numerology_singleflight_{_stat}" + ("_total" if _type == "counter" else "")
+    metrics.gauge(_name, _help, lambda stat=_stat: response_cache.flights.stats()[stat], type=_type)
+
+# Name breakdown cache statistics
+for _stat, _type, _help in [
+    ("hits", "counter", "Name breakdown cache hits"),
+    ("misses", "counter", "Name breakdown cache misses"),
+    ("size", "gauge", "Name breakdown cache entries")
+]:
+    _name = f"numerology_name_cache_{_stat}" + ("_total" if _type == "counter" else "")
+    metrics.gauge(_name, _help, lambda stat=_stat: name_cache_stats()[stat], type=_type)
+
+# Name rule outcome cache statistics
+for _stat, _type, _help in [
+    ("hits", "counter", "Name rule cache hits"),
+    ("misses", "counter", "Name rule cache misses"),
+    ("size", "gauge", "Name rule cache entries")
+]:
+    _name = f"numerology_rule_cache_{_stat}" + ("_total" if _type == "counter" else "")
+    metrics.gauge(_name, _help, lambda stat=_stat: rule_cache_stats()[stat], type=_type)
+
+# PDF report renderer statistics
+for _stat, _type, _help in [
+    ("hits", "counter", "PDF report cache hits"),
+    ("misses", "counter", "PDF report cache misses"),
+    ("rejected", "counter", "PDF reports rejected because the render queue was full"),
+    ("size", "gauge", "PDF report cache entries")
+]:
+    _name = f"numerology_pdf_{_stat}" + ("_total" if _type == "counter" else "")
+    metrics.gauge(_name, _help, lambda stat=_stat: get_renderer().stats()[stat], type=_type)
 
 
 class NumerologyInput(BaseModel):
@@ -42,29 +173,221 @@ class NumerologyInput(BaseModel):
     @field_validator('name')
     @classmethod
     def validate_name(cls, v):
-        if not v or len(v.strip()) == 0:
-            raise ValueError('Name cannot be empty')
-        return v.strip()
+        return normalize_name(v)
 
     @field_validator('gender')
     @classmethod
     def validate_gender(cls, v):
-        if v.lower() not in ['male', 'female']:
-            raise ValueError('Gender must be either male or female')
-        return v.lower()
+        return normalize_gender(v)
 
 
-@app.get("/", response_class=HTMLResponse)
-async def read_root():
-    """Serve the main HTML page"""
-    try:
-        with open("index.html", "r", encoding="utf-8") as f:
-            return f.read()
-    except FileNotFoundError:
+class ProfileInput(BaseModel):
+    """Date of birth and gender identifying a date profile"""
+    date_of_birth: str
+    gender: str
+
+    @field_validator('gender')
+    @classmethod
+    def validate_gender(cls, v):
+        return normalize_gender(v)
+
+
+# Maximum number of candidate names scored in one request
+MAX_NAMES_PER_REQUEST = 500
+
+
+class NameScoreInput(BaseModel):
+    """Candidate names to score against a profile token or date of birth and gender"""
+    names: List[str]
+    token: Optional[str] = None
+    date_of_birth: Optional[str] = None
+    gender: Optional[str] = None
+
+    @field_validator('names')
+    @classmethod
+    def validate_names(cls, v):
+        if len(v) > MAX_NAMES_PER_REQUEST:
+            raise ValueError(f'At most {MAX_NAMES_PER_REQUEST} names can be scored per request')
+        return v
+
+
+class NameSuggestInput(BaseModel):
+    """Name to correct against a profile token or date of birth and gender"""
+    name: str
+    target_value: Optional[int] = None
+    top_k: int = 5
+    token: Optional[str] = None
+    date_of_birth: Optional[str] = None
+    gender: Optional[str] = None
+
+    @field_validator('name')
+    @classmethod
+    def validate_name(cls, v):
+        return normalize_name(v)
+
+    @field_validator('top_k')
+    @classmethod
+    def validate_top_k(cls, v):
+        if not 1 <= v <= 20:
+            raise ValueError('top_k must be between 1 and 20')
+        return v
+
+
+class LuckTimelineInput(BaseModel):
+    """Year range of luck factors for a profile token or date of birth and gender"""
+    token: Optional[str] = None
+    date_of_birth: Optional[str] = None
+    gender: Optional[str] = None
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
+    page_size: Optional[int] = None
+    stream: bool = False
+
+    @field_validator('page_size')
+    @classmethod
+    def validate_page_size(cls, v):
+        if v is not None and not 1 <= v <= MAX_TIMELINE_YEARS:
+            raise ValueError(f'page_size must be between 1 and {MAX_TIMELINE_YEARS}')
+        return v
+
+
+# Largest page of matching dates returned by /dates/query
+MAX_DATE_QUERY_PAGE = 10000
+
+
+class DateQueryInput(BaseModel):
+    """Numerology pattern to find matching birth dates for"""
+    driver: Optional[Union[int, List[int]]] = None
+    conductor: Optional[Union[int, List[int]]] = None
+    kua: Optional[Union[int, List[int]]] = None
+    gender: Optional[str] = None
+    present: List[int] = []
+    missing: List[int] = []
+    lines: List[str] = []
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
+    cursor: int = 0
+    limit: int = 1000
+
+    @field_validator('gender')
+    @classmethod
+    def validate_gender(cls, v):
+        return normalize_gender(v) if v is not None else v
+
+    @field_validator('limit')
+    @classmethod
+    def validate_limit(cls, v):
+        if not 1 <= v <= MAX_DATE_QUERY_PAGE:
+            raise ValueError(f'limit must be between 1 and {MAX_DATE_QUERY_PAGE}')
+        return v
+
+    @field_validator('cursor')
+    @classmethod
+    def validate_cursor(cls, v):
+        if v < 0:
+            raise ValueError('cursor must not be negative')
+        return v
+
+    def date_range(self):
+        """(start, end) dates of the query, None where unbounded"""
+        start = end = None
+        if self.start_date:
+            start = datetime.strptime(self.start_date, "%Y-%m-%d").date()
+        elif self.start_year is not None:
+            start = date(self.start_year, 1, 1)
+        if self.end_date:
+            end = datetime.strptime(self.end_date, "%Y-%m-%d").date()
+        elif self.end_year is not None:
+            end = date(self.end_year, 12, 31)
+        return start, end
+
+
+class AuspiciousDatesInput(BaseModel):
+    """Date range to rank for a profile token or date of birth and gender"""
+    token: Optional[str] = None
+    date_of_birth: Optional[str] = None
+    gender: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    top_k: int = 10
+
+    @field_validator('top_k')
+    @classmethod
+    def validate_top_k(cls, v):
+        if not 1 <= v <= 100:
+            raise ValueError('top_k must be between 1 and 100')
+        return v
+
+
+class PersonInput(BaseModel):
+    """A person identified by name and a profile token or date of birth and gender"""
+    name: str
+    token: Optional[str] = None
+    date_of_birth: Optional[str] = None
+    gender: Optional[str] = None
+
+    @field_validator('name')
+    @classmethod
+    def validate_name(cls, v):
+        return normalize_name(v)
+
+
+class CompatibilityMatrixInput(BaseModel):
+    """Group of people to score pairwise"""
+    people: List[PersonInput]
+    format: str = "json"
+
+    @field_validator('people')
+    @classmethod
+    def validate_people(cls, v):
+        if not 1 <= len(v) <= MAX_PEOPLE:
+            raise ValueError(f'Between 1 and {MAX_PEOPLE} people can be scored per request')
+        return v
+
+    @field_validator('format')
+    @classmethod
+    def validate_format(cls, v):
+        if v not in MATRIX_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(MATRIX_FORMATS)}")
+        return v
+
+
+def resolve_profile_reference(token: Optional[str], date_of_birth: Optional[str], gender: Optional[str]):
+    """Resolve a profile token, or a date of birth and gender, to (token, date profile)"""
+    if token:
+        date_of_birth, gender = parse_profile_token(token)
+    elif date_of_birth and gender:
+        gender = normalize_gender(gender)
+    else:
+        raise ValueError('Provide a profile token or date_of_birth and gender')
+    return make_profile_token(date_of_birth, gender), resolve_date_profile(date_of_birth, gender)
+
+
+@app.api_route("/", methods=["GET", "HEAD"], response_class=HTMLResponse)
+async def read_root(request: Request):
+    """Serve the main HTML page from memory, revalidated with its ETag"""
+    index = get_asset_store().get_index()
+    if index is None:
         return HTMLResponse(content="<h1>index.html not found</h1>", status_code=404)
+    return asset_response(index, request.headers, REVALIDATE)
+
+
+@app.api_route("/static/{name:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def static_file(name: str, request: Request):
+    """
+    Serve a static file from memory. Content-hashed names (styles.<hash>.css)
+    are cached forever; plain names are revalidated with their ETag.
+    """
+    entry = get_asset_store().get_static(name)
+    if entry is None:
+        return PlainTextResponse("Not Found", status_code=404)
+    asset, immutable = entry
+    return asset_response(asset, request.headers, IMMUTABLE if immutable else REVALIDATE)
 
 
-@app.post("/calculate")
+@app.post("/calculate", response_model=Union[NumerologyResponse, ErrorResponse])
 async def calculate_numerology(data: NumerologyInput):
     """
     Calculate all numerology values including:
@@ -74,110 +397,282 @@ async def calculate_numerology(data: NumerologyInput):
     - Lucky/Bad/Neutral numbers
     - Remedies (3 parts)
     - Luck factors for next 6 years
+
+    Responses are served from an in-process cache when the same (normalized)
+    name, date of birth and gender were calculated before (see
+    response_cache.py for coalescing identical requests in flight).
+    """
+    content = await response_cache.get_response_async(data.name, data.date_of_birth, data.gender)
+    return Response(content=content, media_type="application/json")
+
+
+@app.post("/calculate/batch")
+async def calculate_numerology_batch(request: Request):
+    """
+    Calculate numerology for many people in one request.
+
+    The body is NDJSON (one NumerologyInput object per line) or a JSON array
+    of objects. Results are streamed back as NDJSON in input order, each
+    tagged with its record index; invalid records are reported inline.
+    """
+    return BatchStreamingResponse(stream_batch(request.stream(), NumerologyInput))
+
+
+@app.post("/profile")
+async def create_profile(data: ProfileInput):
+    """
+    Resolve a date of birth and gender to a date profile token and its core numbers.
+    The token can then be used to score many names via /name/score.
     """
     try:
-        # Parse the date
-        date_obj = datetime.strptime(data.date_of_birth, "%Y-%m-%d")
-        day = date_obj.day
-        month = date_obj.month
-        year = date_obj.year
-
-        # Validate date is not in the future
-        if date_obj > datetime.now():
-            return {
-                "success": False,
-                "error": "Date of birth cannot be in the future"
-            }
-
-        # Calculate core numerology values
-        driver = calculate_driver(day)
-        conductor = calculate_conductor(day, month, year)
-        kua = calculate_kua(year, data.gender)
-
-        # Create personalized Loshu Grid
-        loshu_grid, missing_numbers, present_numbers = create_personalized_loshu_grid(
-            day, month, year, driver, conductor, kua
-        )
+        token, profile = resolve_profile_reference(None, data.date_of_birth, data.gender)
+    except ValueError as ve:
+        return {"success": False, "error": str(ve)}
+    return {
+        "success": True,
+        "token": token,
+        "driver": profile["driver"],
+        "conductor": profile["conductor"],
+        "kua": profile["kua"],
+        "present_numbers": profile["present_numbers"],
+        "missing_numbers": profile["missing_numbers"],
+        "bad_numbers": profile["bad_numbers"]
+    }
+
+
+@app.post("/name/score")
+async def score_candidate_names(data: NameScoreInput):
+    """
+    Score candidate names against one date profile. Only the name analysis
+    runs per name; the date profile is looked up once.
+    """
+    try:
+        token, profile = resolve_profile_reference(data.token, data.date_of_birth, data.gender)
+    except ValueError as ve:
+        return {"success": False, "error": str(ve)}
+    return {"success": True, "token": token, "results": score_names(data.names, profile)}
 
-        # Analyze Loshu Grid lines (horizontal, vertical, diagonal)
-        loshu_lines = analyze_loshu_lines(present_numbers)
 
-        # Get compatibility data
-        driver_compatibility = COMPATIBILITY.get(driver, {})
-        conductor_compatibility = COMPATIBILITY.get(conductor, {})
+@app.get("/name/score")
+async def score_name(token: str, name: str):
+    """Score a single name against a profile token (for live as-you-type checks)"""
+    try:
+        _, profile = resolve_profile_reference(token, None, None)
+        name = normalize_name(name)
+    except ValueError as ve:
+        return {"success": False, "error": str(ve)}
+    return {"success": True, "name": name, "name_analysis": analyze_name(name, profile)}
+
+
+@app.post("/name/suggest")
+async def suggest_names(data: NameSuggestInput):
+    """
+    Suggest spelling variants of a name (doubled letters, added or removed
+    vowels, substituted letters) that follow the most name rules
+    """
+    try:
+        token, profile = resolve_profile_reference(data.token, data.date_of_birth, data.gender)
+    except ValueError as ve:
+        return {"success": False, "error": str(ve)}
+
+    suggestions = suggest_name_corrections(
+        data.name,
+        data.target_value,
+        driver=profile["driver"],
+        conductor=profile["conductor"],
+        bad_numbers=profile["bad_numbers"],
+        present_numbers=profile["present_numbers"],
+        missing_numbers=profile["missing_numbers"],
+        top_k=data.top_k
+    )
+    return {
+        "success": True,
+        "token": token,
+        "name_analysis": analyze_name(data.name, profile),
+        "suggestions": suggestions
+    }
 
-        # Calculate Lucky, Bad, and Neutral numbers
-        lucky_numbers, bad_numbers, neutral_numbers = calculate_lucky_bad_neutral_numbers(
-            driver_compatibility, conductor_compatibility
+
+@app.post("/luck/timeline")
+async def luck_factor_timeline(data: LuckTimelineInput):
+    """
+    Luck factors for a range of years (by default 100 years from the year of
+    birth), read from precomputed 9-year personal year cycles.
+
+    Long ranges can be paged with page_size (follow next_start_year) or
+    streamed as NDJSON, one year per line, with stream set to true.
+    """
+    try:
+        token, profile = resolve_profile_reference(data.token, data.date_of_birth, data.gender)
+        date_of_birth, _ = parse_profile_token(token)
+        birth_year, month, day = (int(part) for part in date_of_birth.split("-"))
+        start_year = data.start_year if data.start_year is not None else birth_year
+        end_year = data.end_year if data.end_year is not None else start_year + MAX_TIMELINE_YEARS - 1
+        validate_year_range(start_year, end_year)
+    except ValueError as ve:
+        return {"success": False, "error": str(ve)}
+
+    driver = profile["driver"]
+    if data.stream:
+        return NDJSONStreamingResponse(
+            dumps(entry) + b"\n" for entry in iter_luck_timeline(day, month, driver, start_year, end_year)
         )
 
-        # Calculate all three parts of remedies
-        remedies_part1 = calculate_remedies_part1(missing_numbers, driver, conductor)
-        remedies_part2 = calculate_remedies_part2(missing_numbers, present_numbers, driver, conductor)
-        remedies_part3 = calculate_remedies_part3(missing_numbers)
-
-        # Calculate Luck Factor for next 6 years
-        current_year = datetime.now().year
-        luck_factors = []
-
-        for i in range(6):  # Current year + next 5 years
-            target_year = current_year + i
-            personal_year = calculate_personal_year(day, month, target_year)
-            luck_percentage = LUCK_FACTOR.get(personal_year, {}).get(driver, "N/A")
-
-            luck_factors.append({
-                "year": target_year,
-                "date": f"{day:02d}/{month:02d}/{target_year}",
-                "personal_year": personal_year,
-                "driver": driver,
-                "combination": f"{personal_year},{driver}",
-                "luck_factor": luck_percentage
-            })
-
-        # Calculate Name Numerology Analysis
-        name_analysis = validate_name_numerology(
-            full_name=data.name,
-            driver=driver,
-            conductor=conductor,
-            bad_numbers=bad_numbers,
-            present_numbers=present_numbers,
-            missing_numbers=missing_numbers
+    page_end = end_year
+    if data.page_size is not None:
+        page_end = min(end_year, start_year + data.page_size - 1)
+    return {
+        "success": True,
+        "token": token,
+        "driver": driver,
+        "start_year": start_year,
+        "end_year": page_end,
+        "next_start_year": page_end + 1 if page_end < end_year else None,
+        "luck_factors": list(iter_luck_timeline(day, month, driver, start_year, page_end))
+    }
+
+
+@app.post("/dates/query")
+async def query_dates(data: DateQueryInput):
+    """
+    Find the birth dates (1900-2100, per gender) matching a numerology pattern,
+    e.g. driver 5, conductor 1 and the 4-5-6 line complete, or 5 and 6 missing.
+
+    Matches are streamed as NDJSON in date order, at most limit per page. The
+    X-Total-Count header holds the number of matches and X-Next-Cursor the
+    cursor of the next page (absent on the last page). An invalid query is
+    answered with HTTP 400 and a JSON error body.
+    """
+    index = get_date_index()
+    try:
+        start, end = data.date_range()
+        matches = index.query(
+            driver=data.driver,
+            conductor=data.conductor,
+            kua=data.kua,
+            gender=data.gender,
+            present=data.present,
+            missing=data.missing,
+            lines=data.lines,
+            start=start,
+            end=end
         )
+    except ValueError as ve:
+        return FastJSONResponse({"success": False, "error": str(ve)}, status_code=400)
+
+    page = list(islice(index.iter_slots(matches, data.cursor), data.limit + 1))
+    headers = {"X-Total-Count": str(index.count(matches))}
+    if len(page) > data.limit:
+        headers["X-Next-Cursor"] = str(page.pop())
+    return NDJSONStreamingResponse(
+        (dumps(index.describe(slot)) + b"\n" for slot in page),
+        headers=headers
+    )
 
-        # Return comprehensive numerology data
-        return {
-            "success": True,
-            "name": data.name,
-            "date_of_birth": data.date_of_birth,
-            "gender": data.gender,
-            "driver": driver,
-            "conductor": conductor,
-            "kua": kua,
-            "loshu_grid": loshu_grid,
-            "missing_numbers": missing_numbers,
-            "present_numbers": present_numbers,
-            "loshu_lines": loshu_lines,
-            "driver_compatibility": driver_compatibility,
-            "conductor_compatibility": conductor_compatibility,
-            "lucky_numbers": lucky_numbers,
-            "bad_numbers": bad_numbers,
-            "neutral_numbers": neutral_numbers,
-            "remedies_part1": remedies_part1,
-            "remedies_part2": remedies_part2,
-            "remedies_part3": remedies_part3,
-            "luck_factors": luck_factors,
-            "name_analysis": name_analysis
-        }
+
+@app.post("/dates/auspicious")
+async def auspicious_dates(data: AuspiciousDatesInput):
+    """
+    Rank the calendar dates in a range (by default the coming year) by how
+    well their driver and conductor suit the person, plus the person's luck
+    factor for the year, and return the top_k
+    """
+    try:
+        token, profile = resolve_profile_reference(data.token, data.date_of_birth, data.gender)
+        date_of_birth, _ = parse_profile_token(token)
+        _, birth_month, birth_day = (int(part) for part in date_of_birth.split("-"))
+        start = datetime.strptime(data.start_date, "%Y-%m-%d").date() if data.start_date else date.today()
+        if data.end_date:
+            end = datetime.strptime(data.end_date, "%Y-%m-%d").date()
+        else:
+            end = start + timedelta(days=min(365, (date.max - start).days))
+        dates = find_auspicious_dates(
+            profile["driver"], profile["conductor"], birth_day, birth_month, start, end, data.top_k
+        )
     except ValueError as ve:
-        return {
-            "success": False,
-            "error": str(ve)
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "error": f"An error occurred: {str(e)}"
-        }
+        return {"success": False, "error": str(ve)}
+    return {
+        "success": True,
+        "token": token,
+        "driver": profile["driver"],
+        "conductor": profile["conductor"],
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "dates": dates
+    }
+
+
+@app.post("/compatibility/matrix")
+async def compatibility_matrix(data: CompatibilityMatrixInput):
+    """
+    N x N compatibility scores (-8 to 8) of a group of people from their
+    drivers, conductors and name values. People with the same three numbers
+    share a row, so the work grows with the number of distinct combinations.
+
+    format "json" returns the people and the matrix; "npy" (NumPy int8 array)
+    and "binary" (raw row-major int8) download just the matrix.
+    """
+    people = []
+    for index, person in enumerate(data.people):
+        try:
+            _, profile = resolve_profile_reference(person.token, person.date_of_birth, person.gender)
+        except ValueError as ve:
+            return {"success": False, "error": f"people[{index}]: {ve}"}
+        people.append((profile["driver"], profile["conductor"], calculate_name_value(person.name)))
+
+    matrix = CompatibilityMatrix(people)
+    if data.format == "npy":
+        return StreamingResponse(matrix.iter_npy(), media_type="application/octet-stream",
+                                 headers={"Content-Disposition": 'attachment; filename="compatibility.npy"'})
+    if data.format == "binary":
+        return StreamingResponse(matrix.iter_binary(), media_type="application/octet-stream",
+                                 headers={"Content-Disposition": 'attachment; filename="compatibility.bin"',
+                                          "X-Matrix-Shape": f"{matrix.size},{matrix.size}"})
+
+    summary = dumps({
+        "success": True,
+        "classes": len(matrix.classes),
+        "people": [
+            {"index": index, "name": person.name, "driver": driver, "conductor": conductor, "name_value": name_value}
+            for index, (person, (driver, conductor, name_value)) in enumerate(zip(data.people, people))
+        ]
+    })
+
+    def body():
+        yield summary[:-1] + b',"matrix":'
+        yield from matrix.iter_json()
+        yield b"}"
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+@app.post("/report/pdf")
+async def pdf_report(data: NumerologyInput):
+    """
+    The full numerology report as a PDF, rendered on a bounded worker pool
+    and cached per name, date of birth and gender
+    """
+    try:
+        pdf = await get_renderer().render_async(data.name, data.date_of_birth, data.gender)
+    except (ValueError, RendererBusy) as e:
+        return {"success": False, "error": str(e)}
+    return Response(
+        content=pdf,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{report_filename(data.name)}"'}
+    )
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit, miss and eviction counts of the /calculate response cache"""
+    return response_cache.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Request counts, latencies, per-stage timings, errors and cache statistics (Prometheus text format)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,266 @@
+"""
+In-process metrics rendered in Prometheus text format on /metrics
+
+Counters and histograms are kept in a module-level registry, so no external
+collector is needed. Set NUMEROLOGY_METRICS=0 to disable recording; stage
+timers are then a shared no-op object. Updates take a per-metric lock, since
+calculations also run in worker threads (PDF reports, offloaded /calculate
+misses).
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from starlette.routing import Mount
+
+ENABLED = os.environ.get("NUMEROLOGY_METRICS", "1") != "0"
+
+# Latency bucket upper bounds in seconds
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Latency histogram with fixed buckets, observed in nanoseconds and exported in seconds"""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._bounds_ns = [int(round(bound * 1e9)) for bound in self.buckets]
+        # label values -> [count per bucket..., count above the last bucket, sum in ns]
+        self._series: Dict[LabelValues, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def observe_ns(self, duration_ns: int, *label_values: str) -> None:
+        bucket = bisect_left(self._bounds_ns, duration_ns)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self._bounds_ns) + 2)
+            series[bucket] += 1
+            series[-1] += duration_ns
+
+    def observe(self, seconds: float, *label_values: str) -> None:
+        self.observe_ns(int(seconds * 1e9), *label_values)
+
+    def count(self, *label_values: str) -> int:
+        with self._lock:
+            series = self._series.get(label_values)
+            return sum(series[:-1]) if series else 0
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        bucket_names = self.label_names + ("le",)
+        with self._lock:
+            all_series = sorted((label_values, list(series)) for label_values, series in self._series.items())
+        for label_values, series in all_series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = _format_labels(bucket_names, label_values + (repr(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += series[-2]
+            labels = _format_labels(bucket_names, label_values + ("+Inf",))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {series[-1] / 1e9!r}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Value read from a callback when metrics are rendered"""
+
+    def __init__(self, name: str, help: str, read: Callable[[], float], type: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.read = read
+        self.type = type
+
+    def collect(self) -> List[str]:
+        value = self.read()
+        if value is None:
+            return []
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}",
+                f"{self.name} {_format_value(value)}"]
+
+
+REGISTRY: Dict[str, object] = {}
+
+
+def _register(metric):
+    REGISTRY[metric.name] = metric
+    return metric
+
+
+def counter(name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+    return _register(Counter(name, help, labels))
+
+
+def histogram(name: str, help: str, labels: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return _register(Histogram(name, help, labels, buckets))
+
+
+def gauge(name: str, help: str, read: Callable[[], float], type: str = "gauge") -> Gauge:
+    return _register(Gauge(name, help, read, type))
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text exposition format"""
+    lines = []
+    for metric in REGISTRY.values():
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+def set_enabled(enabled: bool) -> None:
+    """Turn metric recording on or off"""
+    global ENABLED
+    ENABLED = enabled
+
+
+# Application metrics
+REQUESTS = counter("numerology_requests_total", "HTTP requests by method, route and status",
+                   ("method", "path", "status"))
+REQUEST_SECONDS = histogram("numerology_request_duration_seconds", "HTTP request latency by route",
+                            ("path",))
+ERRORS = counter("numerology_errors_total", "Errors by type", ("type",))
+STAGE_SECONDS = histogram("numerology_stage_duration_seconds",
+                          "Time spent in each stage of a /calculate request", ("stage",))
+
+
+def record_error(error_type: str) -> None:
+    if ENABLED:
+        ERRORS.inc(error_type)
+
+
+class StageTimer:
+    """Records the time since the previous mark as the named stage"""
+    __slots__ = ("_last",)
+
+    def __init__(self):
+        self._last = time.perf_counter_ns()
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter_ns()
+        STAGE_SECONDS.observe_ns(now - self._last, stage)
+        self._last = now
+
+
+class _NullStageTimer:
+    __slots__ = ()
+
+    def mark(self, stage: str) -> None:
+        pass
+
+
+_NULL_STAGE_TIMER = _NullStageTimer()
+
+
+def stage_timer():
+    """Start timing the stages of a request (a no-op timer when metrics are disabled)"""
+    return StageTimer() if ENABLED else _NULL_STAGE_TIMER
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting and timing HTTP requests by route path"""
+
+    def __init__(self, app):
+        self.app = app
+        self._paths = None
+        self._prefixes = None
+
+    def _route_path(self, scope) -> str:
+        if self._paths is None:
+            paths, prefixes = set(), []
+            for route in scope["app"].routes:
+                if isinstance(route, Mount):
+                    prefixes.append((route.path + "/", route.path))
+                elif "{" in route.path:
+                    prefixes.append((route.path.split("{", 1)[0], route.path))
+                else:
+                    paths.add(route.path)
+            self._paths = frozenset(paths)
+            self._prefixes = tuple(prefixes)
+        path = scope["path"]
+        if path in self._paths:
+            return path
+        for prefix, label in self._prefixes:
+            if path.startswith(prefix):
+                return label
+        # Unknown paths share one label so they cannot grow the series without bound
+        return "other"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        # Resolved before dispatch, since mounted apps rewrite scope["path"]
+        path = self._route_path(scope)
+        start = time.perf_counter_ns()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as exc:
+            record_error(type(exc).__name__)
+            raise
+        finally:
+            REQUESTS.inc(scope["method"], path, str(status[0]))
+            REQUEST_SECONDS.observe_ns(time.perf_counter_ns() - start, path)
@@ -1,32 +1,39 @@
 """
 Name numerology calculations and validation rules
 """
-from typing import List, Dict, Any, Tuple, Set
-from data import ALPHABET_VALUES, COMPATIBILITY
-from calculations import sum_digits_to_single
+import os
+import time
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Set
+import rules
+from data import ALPHABET_VALUES
+from calculations import sum_digits_to_single, numbers_to_mask
+from transliteration import fold_name, transliterate
 
 
-def calculate_name_value(name: str) -> int:
-    """Calculate the numerology value of a name"""
-    total = 0
-    for char in name.upper():
-        if char in ALPHABET_VALUES:
-            total += ALPHABET_VALUES[char]
-    return sum_digits_to_single(total)
+# Breakdown entries shared by every name
+_LETTER_ENTRIES = {letter: {"letter": letter, "value": value} for letter, value in ALPHABET_VALUES.items()}
+_SPACE_ENTRY = {"letter": ' ', "value": '-'}
 
+# Size of the name breakdown cache (popular names are shared between requests)
+NAME_CACHE_SIZE = int(os.environ.get("NUMEROLOGY_NAME_CACHE_SIZE", 50000))
 
-def get_name_breakdown(name: str) -> Dict[str, Any]:
-    """Get detailed breakdown of name calculation"""
+# Longer names are calculated on every request instead of being cached, which
+# bounds the size of a cache entry (here and in the /calculate response cache)
+MAX_CACHED_NAME_LENGTH = 200
+
+
+def _compute_breakdown(key: str) -> Dict[str, Any]:
+    """Breakdown of a name reduced to its scored letters and spaces (see _name_key)"""
     breakdown = []
     total = 0
-
-    for char in name.upper():
-        if char in ALPHABET_VALUES:
-            value = ALPHABET_VALUES[char]
-            breakdown.append({"letter": char, "value": value})
-            total += value
-        elif char == ' ':
-            breakdown.append({"letter": ' ', "value": '-'})
+    for char in key:
+        if char == ' ':
+            breakdown.append(_SPACE_ENTRY)
+        else:
+            entry = _LETTER_ENTRIES[char]
+            breakdown.append(entry)
+            total += entry["value"]
 
     return {
         "breakdown": breakdown,
@@ -35,6 +42,70 @@ def get_name_breakdown(name: str) -> Dict[str, Any]:
     }
 
 
+_cached_breakdown = lru_cache(maxsize=NAME_CACHE_SIZE)(_compute_breakdown)
+
+
+def _breakdown_for_key(key: str) -> Dict[str, Any]:
+    if len(key) > MAX_CACHED_NAME_LENGTH:
+        return _compute_breakdown(key)
+    return _cached_breakdown(key)
+
+
+def _name_key(name: str) -> str:
+    return fold_name(name)
+
+
+def calculate_name_value(name: str) -> int:
+    """Calculate the numerology value of a name"""
+    return _breakdown_for_key(_name_key(name))["final_value"]
+
+
+def get_name_breakdown(name: str) -> Dict[str, Any]:
+    """
+    Get detailed breakdown of name calculation. The value, raw total and
+    breakdown come from one pass and are cached per normalized name, so the
+    returned structure is shared and must be treated as read-only.
+    """
+    return _breakdown_for_key(_name_key(name))
+
+
+def name_cache_stats() -> Dict[str, Any]:
+    """Hit and miss counts of the name breakdown cache"""
+    info = _cached_breakdown.cache_info()
+    return {"size": info.currsize, "max_size": info.maxsize, "hits": info.hits, "misses": info.misses}
+
+
+def normalize_name_key(full_name: str) -> Tuple[str, str]:
+    """
+    Normalized form of a name that determines its numerology analysis:
+    the scored letters and spaces of the full name and the scored letters of
+    the first name, transliterated and uppercased as in calculate_name_value
+    """
+    name_parts = full_name.strip().split()
+    first_name = name_parts[0] if name_parts else ""
+    return _name_key(full_name), fold_name(first_name).replace(" ", "")
+
+
+def evaluate_name_rules(
+    first_name_value: int,
+    full_name_value: int,
+    driver: int,
+    conductor: int,
+    bad_numbers: List[int],
+    present_numbers: List[int],
+    missing_numbers: List[int]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Evaluate name rules 3-10 (NAME_RULES in data.py) for first and full name
+    values and return the followed and contradicted rules. The lists are
+    cached per profile and name values and must be treated as read-only.
+    """
+    return rules.evaluate_name_rules(
+        numbers_to_mask(present_numbers), numbers_to_mask(missing_numbers), driver, conductor,
+        rules.value_bits(bad_numbers), first_name_value, full_name_value
+    )
+
+
 def validate_name_numerology(
     full_name: str,
     driver: int,
@@ -50,156 +121,16 @@ def validate_name_numerology(
     name_parts = full_name.strip().split()
     first_name = name_parts[0] if name_parts else ""
 
-    # Calculate values
-    first_name_value = calculate_name_value(first_name)
-    full_name_value = calculate_name_value(full_name)
-
-    # Get detailed breakdowns
+    # Values and detailed breakdowns, one pass per name
     first_name_breakdown = get_name_breakdown(first_name)
     full_name_breakdown = get_name_breakdown(full_name)
+    first_name_value = first_name_breakdown["final_value"]
+    full_name_value = full_name_breakdown["final_value"]
 
-    followed_rules = []
-    contradicted_rules = []
-
-    missing_set = set(missing_numbers)
-    present_set = set(present_numbers)
-
-    # Rule 3: Full name total should NEVER be 4 or 8
-    if full_name_value not in [4, 8]:
-        followed_rules.append({
-            "rule": "Rule 3",
-            "description": f"Full name total ({full_name_value}) is not 4 or 8 ✓",
-            "status": "good"
-        })
-    else:
-        contradicted_rules.append({
-            "rule": "Rule 3",
-            "description": f"Full name total is {full_name_value} (should NOT be 4 or 8)",
-            "status": "bad",
-            "severity": "high"
-        })
-
-    # Rule 4: First name total should NEVER be 4 or 8
-    if first_name_value not in [4, 8]:
-        followed_rules.append({
-            "rule": "Rule 4",
-            "description": f"First name total ({first_name_value}) is not 4 or 8 ✓",
-            "status": "good"
-        })
-    else:
-        contradicted_rules.append({
-            "rule": "Rule 4",
-            "description": f"First name total is {first_name_value} (should NOT be 4 or 8)",
-            "status": "bad",
-            "severity": "high"
-        })
-
-    # Rule 5: First name should NOT be anti (bad number) to driver number
-    driver_non_friends = COMPATIBILITY.get(driver, {}).get('non_friends', [])
-    if first_name_value not in driver_non_friends:
-        followed_rules.append({
-            "rule": "Rule 5",
-            "description": f"First name total ({first_name_value}) is not anti to driver {driver} ✓",
-            "status": "good"
-        })
-    else:
-        contradicted_rules.append({
-            "rule": "Rule 5",
-            "description": f"First name total ({first_name_value}) is anti to driver {driver}",
-            "status": "bad",
-            "severity": "high"
-        })
-
-    # Rule 6: Name spelling should match/be comfortable with driver/conductor
-    # This is a general compatibility check
-    if full_name_value == driver or full_name_value == conductor:
-        followed_rules.append({
-            "rule": "Rule 6",
-            "description": f"Full name total ({full_name_value}) matches driver or conductor ✓",
-            "status": "good"
-        })
-    elif full_name_value not in bad_numbers:
-        followed_rules.append({
-            "rule": "Rule 6",
-            "description": f"Full name total ({full_name_value}) is compatible with your numbers ✓",
-            "status": "good"
-        })
-    else:
-        contradicted_rules.append({
-            "rule": "Rule 6",
-            "description": f"Full name total ({full_name_value}) is not comfortable with driver/conductor",
-            "status": "warning",
-            "severity": "medium"
-        })
-
-    # Rule 7: Name should total to 1 IF both 5 and 6 are present in Loshu Grid AND driver/conductor is NOT 8
-    if 5 in present_set and 6 in present_set and driver != 8 and conductor != 8:
-        if full_name_value == 1:
-            followed_rules.append({
-                "rule": "Rule 7",
-                "description": f"Name totals to 1 (both 5 & 6 present, D/C not 8) ✓",
-                "status": "excellent"
-            })
-        else:
-            contradicted_rules.append({
-                "rule": "Rule 7",
-                "description": f"Name should total to 1 (both 5 & 6 present, D/C not 8), but it's {full_name_value}",
-                "status": "suggestion",
-                "severity": "low"
-            })
-
-    # Rule 8: Name should total to 5 IF 5 is missing AND it completes 2-5-8 or 4-5-6 line
-    if 5 in missing_set:
-        # Check if adding 5 would complete lines
-        line_258_incomplete = (2 in present_set and 8 in present_set)
-        line_456_incomplete = (4 in present_set and 6 in present_set)
-
-        if line_258_incomplete or line_456_incomplete:
-            if full_name_value == 5:
-                followed_rules.append({
-                    "rule": "Rule 8",
-                    "description": f"Name totals to 5 (completes line: {'2-5-8' if line_258_incomplete else '4-5-6'}) ✓",
-                    "status": "excellent"
-                })
-            else:
-                contradicted_rules.append({
-                    "rule": "Rule 8",
-                    "description": f"Name should total to 5 to complete line ({'2-5-8' if line_258_incomplete else '4-5-6'}), but it's {full_name_value}",
-                    "status": "suggestion",
-                    "severity": "medium"
-                })
-
-    # Rule 9: Name should total to 6 IF 6 is missing AND driver/conductor is NOT 3
-    if 6 in missing_set and driver != 3 and conductor != 3:
-        if full_name_value == 6:
-            followed_rules.append({
-                "rule": "Rule 9",
-                "description": f"Name totals to 6 (6 missing, D/C not 3) ✓",
-                "status": "excellent"
-            })
-        else:
-            contradicted_rules.append({
-                "rule": "Rule 9",
-                "description": f"Name should total to 6 (6 is missing, D/C not 3), but it's {full_name_value}",
-                "status": "suggestion",
-                "severity": "medium"
-            })
-
-    # Rule 10: Name should total to 3 IF 3 is missing AND driver/conductor is NOT 6
-    if 3 in missing_set and driver != 6 and conductor != 6:
-        if full_name_value == 3:
-            followed_rules.append({
-                "rule": "Rule 10",
-                "description": f"Name totals to 3 (3 missing, D/C not 6) ✓",
-                "status": "excellent"
-            })
-        else:
-            contradicted_rules.append({
-                "rule": "Rule 10",
-                "description": f"Name should total to 3 (3 is missing, D/C not 6), but it's {full_name_value}",
-                "status": "suggestion",
-                "severity": "medium"
-            })
+    followed_rules, contradicted_rules = evaluate_name_rules(
+        first_name_value, full_name_value, driver, conductor,
+        bad_numbers, present_numbers, missing_numbers
+    )
 
     return {
         "first_name": first_name,
@@ -214,27 +145,233 @@ def validate_name_numerology(
     }
 
 
+# Name correction search: vowels that may be added or removed, and the cost of
+# each kind of edit (cheaper edits are suggested first)
+VOWELS = "AEIOU"
+EDIT_COSTS = {"double": 1, "add_vowel": 1, "remove_vowel": 2, "substitute": 3}
+
+# A spelling edit: (cost, anchor position, kind, letter, first name delta, full name delta)
+Edit = Tuple[int, int, str, str, int, int]
+
+
+def _word_spans(name: str) -> List[Tuple[int, int]]:
+    spans = []
+    start = None
+    for index, char in enumerate(name):
+        if char.isspace():
+            if start is not None:
+                spans.append((start, index))
+                start = None
+        elif start is None:
+            start = index
+    if start is not None:
+        spans.append((start, len(name)))
+    return spans
+
+
+def _match_case(letter: str, reference: str) -> str:
+    return letter.lower() if reference.islower() else letter
+
+
+def _spelling_edits(name: str, spans: List[Tuple[int, int]]) -> List[Edit]:
+    """All single spelling edits of a name with their effect on the raw name totals"""
+    edits = []
+    for word_index, (start, end) in enumerate(spans):
+        in_first = word_index == 0
+        word_letters = sum(1 for char in name[start:end] if char.upper() in ALPHABET_VALUES)
+
+        for position in range(start, end):
+            char = name[position]
+            upper = char.upper()
+            value = ALPHABET_VALUES.get(upper)
+            if value is None:
+                continue
+
+            # Doubled letter (inserted after the original)
+            edits.append((EDIT_COSTS["double"], position, "double", upper,
+                          value if in_first else 0, value))
+
+            # Removed vowel, keeping at least one letter in the word
+            if upper in VOWELS and word_letters > 1:
+                edits.append((EDIT_COSTS["remove_vowel"], position, "remove_vowel", upper,
+                              -value if in_first else 0, -value))
+
+            # Substituted letter
+            for letter, letter_value in ALPHABET_VALUES.items():
+                if letter != upper:
+                    delta = letter_value - value
+                    edits.append((EDIT_COSTS["substitute"], position, "substitute", letter,
+                                  delta if in_first else 0, delta))
+
+        # Added vowel after the first letter, within or at the end of the word
+        for position in range(start + 1, end + 1):
+            for vowel in VOWELS:
+                value = ALPHABET_VALUES[vowel]
+                edits.append((EDIT_COSTS["add_vowel"], position, "add_vowel", vowel,
+                              value if in_first else 0, value))
+    return edits
+
+
+def _apply_edits(name: str, edits: Tuple[Edit, ...]) -> Tuple[str, List[str]]:
+    """Apply non-overlapping edits (right to left) and describe them"""
+    chars = list(name)
+    descriptions = []
+    for _, position, kind, letter, _, _ in sorted(edits, key=lambda edit: edit[1], reverse=True):
+        if kind == "double":
+            chars.insert(position + 1, chars[position])
+            descriptions.append(f"Double '{letter}' at position {position + 1}")
+        elif kind == "add_vowel":
+            following = chars[position] if position < len(chars) else ""
+            reference = following if following.isalpha() else chars[position - 1]
+            chars.insert(position, _match_case(letter, reference))
+            descriptions.append(f"Add '{letter}' at position {position + 1}")
+        elif kind == "remove_vowel":
+            del chars[position]
+            descriptions.append(f"Remove '{letter}' at position {position + 1}")
+        else:
+            descriptions.append(f"Replace '{chars[position].upper()}' with '{letter}' at position {position + 1}")
+            chars[position] = _match_case(letter, chars[position])
+    descriptions.reverse()
+    return "".join(chars), descriptions
+
+
 def suggest_name_corrections(
     current_name: str,
-    target_value: int,
+    target_value: Optional[int],
     driver: int,
     conductor: int,
-    bad_numbers: List[int]
+    bad_numbers: List[int],
+    present_numbers: Optional[List[int]] = None,
+    missing_numbers: Optional[List[int]] = None,
+    top_k: int = 5,
+    max_edits: int = 2,
+    max_variants: int = 50000,
+    time_budget: float = 0.03
 ) -> List[Dict[str, Any]]:
     """
-    Suggest possible name corrections to achieve target value
-    This is a helper function for future enhancements
+    Suggest spelling variants of a name that follow the most name rules.
+
+    Variants are built from doubled letters, added or removed vowels and
+    letter substitutions (up to two edits). An edit only changes the raw name
+    totals by a fixed delta and the name values are digital roots, so edits
+    are grouped by their deltas modulo 9 and only the most promising
+    combinations are materialized. The search stops after max_variants
+    evaluated variants or time_budget seconds.
+
+    Variants are ranked by rules followed, then by reaching target_value (if
+    given), then by fewer and cheaper edits. Names in other scripts or with
+    accents are suggested in their Latin spelling.
     """
-    suggestions = []
+    name = transliterate(current_name.strip())
+    spans = _word_spans(name)
+    if not spans:
+        return []
+    deadline = time.perf_counter() + time_budget
+    present_numbers = present_numbers or []
+    missing_numbers = missing_numbers or []
 
-    # This can be expanded to provide intelligent name suggestions
-    # For now, we'll provide general guidance
+    first_start, first_end = spans[0]
+    first_total = sum(ALPHABET_VALUES.get(char, 0) for char in name[first_start:first_end].upper())
+    full_total = sum(ALPHABET_VALUES.get(char, 0) for char in name.upper())
 
-    if target_value == 1:
-        suggestions.append({
-            "target": 1,
-            "reason": "Recommended when both 5 and 6 are present",
-            "guidance": "Add or modify letters to reach total of 1"
-        })
+    # Rules followed / contradicted for each (first name value, full name value)
+    outcomes: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
+    def rank(d_first: int, d_full: int, edit_count: int, cost: int) -> Tuple[int, ...]:
+        values = (sum_digits_to_single(first_total + d_first), sum_digits_to_single(full_total + d_full))
+        outcome = outcomes.get(values)
+        if outcome is None:
+            followed, contradicted = evaluate_name_rules(
+                values[0], values[1], driver, conductor, bad_numbers, present_numbers, missing_numbers
+            )
+            outcome = outcomes[values] = (len(followed), len(contradicted))
+        target_missed = 0 if target_value is None or values[1] == target_value else 1
+        return (-outcome[0], target_missed, edit_count, cost) + values + outcome
+
+    # Single edits
+    edits = _spelling_edits(name, spans)
+    candidates = [
+        (rank(edit[4], edit[5], 1, edit[0]), (edit,))
+        for edit in edits
+    ]
+    evaluated = len(candidates)
+
+    if max_edits >= 2 and edits:
+        candidates.sort(key=lambda candidate: candidate[0])
+        # Two-edit variants are ranked below single edits with the same rule
+        # outcome, so they are only worth trying when they score strictly better
+        # than the k-th best single edit
+        bar = candidates[min(top_k, len(candidates)) - 1][0][:2] if len(candidates) >= top_k else (1, 1)
+
+        # Group edits by their deltas modulo 9; keep the cheapest few of each class
+        classes: Dict[Tuple[int, int], List[Edit]] = {}
+        for edit in sorted(edits):
+            members = classes.setdefault((edit[4] % 9, edit[5] % 9), [])
+            if len(members) < top_k + 2:
+                members.append(edit)
+
+        # Word of each letter position and the letter count of each word
+        word_at = {position: index for index, (start, end) in enumerate(spans) for position in range(start, end)}
+        word_letters = [sum(1 for char in name[start:end] if char.upper() in ALPHABET_VALUES) for start, end in spans]
+
+        def realizable(edit_a: Edit, edit_b: Edit) -> bool:
+            """Whether two edits can be applied together: apart, not emptying a word, non-negative totals"""
+            if edit_a == edit_b or abs(edit_a[1] - edit_b[1]) < 2:
+                return False
+            if (edit_a[2] == edit_b[2] == "remove_vowel" and word_at[edit_a[1]] == word_at[edit_b[1]]
+                    and word_letters[word_at[edit_a[1]]] <= 2):
+                return False
+            return first_total + edit_a[4] + edit_b[4] >= 0 and full_total + edit_a[5] + edit_b[5] >= 0
+
+        class_keys = sorted(classes)
+        for i, key_a in enumerate(class_keys):
+            if evaluated >= max_variants or time.perf_counter() > deadline:
+                break
+            for key_b in class_keys[i:]:
+                # Probe the class pair with its cheapest pair of edits that can coexist
+                probe = next(
+                    ((edit_a, edit_b) for edit_a in classes[key_a] for edit_b in classes[key_b]
+                     if realizable(edit_a, edit_b)),
+                    None
+                )
+                if probe is None:
+                    continue
+                first_a, first_b = probe
+                outcome = rank(first_a[4] + first_b[4], first_a[5] + first_b[5], 2, 0)
+                if outcome[:2] >= bar:
+                    continue
+                for edit_a in classes[key_a]:
+                    for edit_b in classes[key_b]:
+                        if (edit_a >= edit_b and key_a == key_b) or not realizable(edit_a, edit_b):
+                            continue
+                        candidates.append((
+                            rank(edit_a[4] + edit_b[4], edit_a[5] + edit_b[5], 2, edit_a[0] + edit_b[0]),
+                            (edit_a, edit_b)
+                        ))
+                        evaluated += 1
+
+    # Materialize the best variants, skipping duplicates and the unchanged name
+    candidates.sort(key=lambda candidate: candidate[0])
+    suggestions = []
+    seen = {name}
+    for key, combination in candidates:
+        variant, descriptions = _apply_edits(name, combination)
+        if variant in seen:
+            continue
+        seen.add(variant)
+        first_value, full_value, followed, contradicted = key[4:]
+        suggestion = {
+            "name": variant,
+            "edits": descriptions,
+            "first_name_value": first_value,
+            "full_name_value": full_value,
+            "rules_followed": followed,
+            "rules_contradicted": contradicted
+        }
+        if target_value is not None:
+            suggestion["matches_target"] = full_value == target_value
+        suggestions.append(suggestion)
+        if len(suggestions) >= top_k:
+            break
 
     return suggestions
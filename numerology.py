@@ -0,0 +1,150 @@
+"""
+Numerology pipeline shared by the API endpoints and the batch tools
+"""
+from typing import Dict, Any, List, Tuple
+from datetime import datetime
+
+from luck_timeline import luck_timeline
+from name_numerology import validate_name_numerology
+from date_profiles import get_date_profile
+from metrics import stage_timer, record_error
+
+
+def normalize_name(name: str) -> str:
+    """Validate and normalize a person's name"""
+    if not name or len(name.strip()) == 0:
+        raise ValueError('Name cannot be empty')
+    return name.strip()
+
+
+def normalize_gender(gender: str) -> str:
+    """Validate and normalize gender to 'male' or 'female'"""
+    if gender.lower() not in ['male', 'female']:
+        raise ValueError('Gender must be either male or female')
+    return gender.lower()
+
+
+def parse_date_of_birth(date_of_birth: str) -> datetime:
+    """Parse a YYYY-MM-DD date of birth, rejecting dates in the future"""
+    date_obj = datetime.strptime(date_of_birth, "%Y-%m-%d")
+    if date_obj > datetime.now():
+        raise ValueError("Date of birth cannot be in the future")
+    return date_obj
+
+
+def make_profile_token(date_of_birth: str, gender: str) -> str:
+    """Token identifying a date profile: YYYYMMDD followed by m or f"""
+    date_obj = parse_date_of_birth(date_of_birth)
+    return f"{date_obj:%Y%m%d}{normalize_gender(gender)[0]}"
+
+
+def parse_profile_token(token: str) -> Tuple[str, str]:
+    """Return the (date_of_birth, gender) a profile token stands for"""
+    token = token.strip().lower()
+    if len(token) != 9 or not token[:8].isdigit() or token[8] not in ("m", "f"):
+        raise ValueError("Invalid profile token")
+    date_of_birth = f"{token[:4]}-{token[4:6]}-{token[6:8]}"
+    parse_date_of_birth(date_of_birth)
+    return date_of_birth, "male" if token[8] == "m" else "female"
+
+
+def resolve_date_profile(date_of_birth: str, gender: str) -> Dict[str, Any]:
+    """Validate a date of birth and return its date profile"""
+    date_obj = parse_date_of_birth(date_of_birth)
+    return get_date_profile(date_obj.day, date_obj.month, date_obj.year, gender)
+
+
+def analyze_name(name: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Name numerology analysis of a name against a date profile"""
+    return validate_name_numerology(
+        full_name=name,
+        driver=profile["driver"],
+        conductor=profile["conductor"],
+        bad_numbers=profile["bad_numbers"],
+        present_numbers=profile["present_numbers"],
+        missing_numbers=profile["missing_numbers"]
+    )
+
+
+def score_names(names: List[str], profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Score candidate names against one date profile, reporting invalid names inline"""
+    results = []
+    for name in names:
+        try:
+            normalized = normalize_name(name)
+        except ValueError as ve:
+            results.append({"name": name, "success": False, "error": str(ve)})
+            continue
+        results.append({"name": normalized, "success": True, "name_analysis": analyze_name(normalized, profile)})
+    return results
+
+
+def calculate_numerology_result(name: str, date_of_birth: str, gender: str) -> Dict[str, Any]:
+    """
+    Calculate all numerology values for an already normalized name and gender.
+    Errors are reported in the result with success set to False.
+    """
+    timer = stage_timer()
+    try:
+        # Parse the date (must not be in the future)
+        date_obj = parse_date_of_birth(date_of_birth)
+        day = date_obj.day
+        month = date_obj.month
+        year = date_obj.year
+        timer.mark("date_parsing")
+
+        # Look up every date-derived value (core numbers, Loshu Grid, lines,
+        # compatibility, lucky/bad/neutral numbers and remedies)
+        profile = get_date_profile(day, month, year, gender)
+        driver = profile["driver"]
+        conductor = profile["conductor"]
+        bad_numbers = profile["bad_numbers"]
+        missing_numbers = profile["missing_numbers"]
+        present_numbers = profile["present_numbers"]
+        timer.mark("date_profile")
+
+        # Luck Factor for the current year + next 5 years
+        luck_factors = luck_timeline(day, month, driver, datetime.now().year, 6)
+        timer.mark("luck_factors")
+
+        # Calculate Name Numerology Analysis
+        name_analysis = analyze_name(name, profile)
+        timer.mark("name_analysis")
+
+        # Return comprehensive numerology data
+        return {
+            "success": True,
+            "name": name,
+            "date_of_birth": date_of_birth,
+            "gender": gender,
+            "driver": driver,
+            "conductor": conductor,
+            "kua": profile["kua"],
+            "loshu_grid": profile["loshu_grid"],
+            "missing_numbers": missing_numbers,
+            "present_numbers": present_numbers,
+            "loshu_lines": profile["loshu_lines"],
+            "driver_compatibility": profile["driver_compatibility"],
+            "conductor_compatibility": profile["conductor_compatibility"],
+            "lucky_numbers": profile["lucky_numbers"],
+            "bad_numbers": bad_numbers,
+            "neutral_numbers": profile["neutral_numbers"],
+            "remedies_part1": profile["remedies_part1"],
+            "remedies_part2": profile["remedies_part2"],
+            "remedies_part3": profile["remedies_part3"],
+            "luck_factors": luck_factors,
+            "name_analysis": name_analysis
+        }
+    except ValueError as ve:
+        record_error(type(ve).__name__)
+        return {
+            "success": False,
+            "error": str(ve)
+        }
+    except Exception as e:
+        record_error(type(e).__name__)
+        return {
+            "success": False,
+            "error": f"An error occurred: {str(e)}"
+        }
+
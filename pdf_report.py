@@ -0,0 +1,665 @@
+"""
+Server-side PDF report - the sections of the browser export, rendered in pure Python
+
+Reports use the standard Helvetica fonts (not embedded, WinAnsi encoding), so
+text outside Windows-1252 is transliterated (राम -> Ram) or dropped, and
+symbols such as ✓ are replaced with plain text. The parts of every report that
+do not depend on the person - PDF header, font and resource objects, font
+metrics and the page layout - are built once in ReportTemplate.
+
+Rendering is CPU bound and runs on a bounded thread pool with a bounded number
+of queued jobs, and finished reports are kept in an LRU cache per (name, date
+of birth, gender, current year).
+
+Usage (bulk export of a batch file into a zip of reports):
+    python pdf_report.py people.csv reports.zip --workers 4
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import re
+import sys
+import threading
+import unicodedata
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from multiprocessing import Pool
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from batch_cli import detect_format, iter_chunks, read_records, score_record
+from date_profiles import get_date_profile_table
+from numerology import calculate_numerology_result, normalize_gender, normalize_name
+from response_cache import LRUCache
+from transliteration import transliterate
+
+# Renderer configuration
+PDF_WORKERS = int(os.environ.get("NUMEROLOGY_PDF_WORKERS", min(4, os.cpu_count() or 1)))
+PDF_QUEUE_SIZE = int(os.environ.get("NUMEROLOGY_PDF_QUEUE_SIZE", 32))
+PDF_CACHE_SIZE = int(os.environ.get("NUMEROLOGY_PDF_CACHE_SIZE", 256))
+
+# Page geometry in millimetres (A4, as the browser export)
+PAGE_WIDTH = 210
+PAGE_HEIGHT = 297
+MARGIN = 20
+CONTENT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+MM = 72 / 25.4
+
+# Colours of the report
+ACCENT = (102, 126, 234)
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+RED = (211, 47, 47)
+GREEN = (75, 175, 80)
+ALERT = (244, 67, 54)
+TEAL = (0, 105, 92)
+STRIPE = (245, 245, 245)
+PRESENT_CELL = {"fill": (255, 243, 205), "text": (180, 83, 9), "border": (251, 191, 36)}
+MISSING_CELL = {"fill": (243, 244, 246), "text": (156, 163, 175), "border": (209, 213, 219)}
+
+# Symbols without a Windows-1252 equivalent
+PDF_TEXT_REPLACEMENTS = {"✓": "OK", "✔": "OK", "✗": "X", "✘": "X", "→": "->", "≤": "<=", "≥": ">="}
+
+# Helvetica / Helvetica-Bold advance widths (1/1000 em) of the printable ASCII characters
+_HELVETICA_WIDTHS = (
+    "278 278 355 556 556 889 667 191 333 333 389 584 278 333 278 278 556 556 556 556 556 556 556 556 "
+    "556 556 278 278 584 584 584 556 1015 667 667 722 722 667 611 778 722 278 500 667 556 833 722 778 "
+    "667 778 722 667 611 722 667 944 667 667 611 278 278 278 469 556 333 556 556 500 556 556 278 556 "
+    "556 222 222 500 222 833 556 556 556 556 333 500 278 556 500 722 500 500 500 334 260 334 584"
+)
+_HELVETICA_BOLD_WIDTHS = (
+    "278 333 474 556 556 889 722 238 333 333 389 584 278 333 278 278 556 556 556 556 556 556 556 556 "
+    "556 556 333 333 584 584 584 611 975 722 722 722 722 667 611 778 722 278 556 722 611 833 722 778 "
+    "667 778 722 667 611 722 667 944 667 667 611 333 278 333 584 556 333 556 611 556 611 556 333 611 "
+    "611 278 278 556 278 889 611 611 611 611 389 556 333 611 556 778 556 556 500 389 280 389 584"
+)
+
+# Characters that can be drawn with the WinAnsi encoding
+_WINANSI = frozenset(bytes(range(32, 256)).decode("cp1252", errors="ignore"))
+_NON_WINANSI_RUN = re.compile("[^\n" + re.escape("".join(sorted(_WINANSI))) + "]+")
+_REPLACEMENTS = str.maketrans(PDF_TEXT_REPLACEMENTS)
+
+
+def pdf_text(text: Any) -> str:
+    """Text drawable with the standard fonts: symbols replaced, other scripts transliterated, the rest dropped"""
+    text = str(text)
+    if text.isascii() and text.isprintable():
+        return text
+    text = text.translate(_REPLACEMENTS)
+    text = _NON_WINANSI_RUN.sub(lambda match: transliterate(match.group(0)), text)
+    return _NON_WINANSI_RUN.sub("", text)
+
+
+def _pdf_string(text: str) -> bytes:
+    encoded = text.encode("cp1252")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _metrics(widths: str) -> Dict[str, int]:
+    table = {chr(32 + index): int(width) for index, width in enumerate(widths.split())}
+    # Other WinAnsi characters measure as their base letter
+    for char in _WINANSI:
+        if char not in table:
+            base = unicodedata.normalize("NFKD", char)[:1]
+            table[char] = table.get(base, 556)
+    return table
+
+
+class ReportTemplate:
+    """Parts of every report that do not depend on the person, built once"""
+
+    # Object numbers: 1 catalog, 2 page tree, 3-5 fonts, 6 shared resources, pages from 7
+    FONTS = {"regular": (b"F1", 3, b"Helvetica"), "bold": (b"F2", 4, b"Helvetica-Bold"),
+             "italic": (b"F3", 5, b"Helvetica-Oblique")}
+    RESOURCES = 6
+    FIRST_PAGE = 7
+
+    def __init__(self):
+        regular = _metrics(_HELVETICA_WIDTHS)
+        self.widths = {"regular": regular, "bold": _metrics(_HELVETICA_BOLD_WIDTHS), "italic": regular}
+        self.font_names = {style: name for style, (name, _, _) in self.FONTS.items()}
+
+        fixed = {1: b"<< /Type /Catalog /Pages 2 0 R >>"}
+        for name, number, base_font in self.FONTS.values():
+            fixed[number] = (b"<< /Type /Font /Subtype /Type1 /BaseFont /" + base_font
+                             + b" /Encoding /WinAnsiEncoding >>")
+        fixed[self.RESOURCES] = (b"<< /Font << " + b" ".join(
+            b"/%s %d 0 R" % (name, number) for name, number, _ in self.FONTS.values()
+        ) + b" >> >>")
+
+        prefix = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self.offsets: Dict[int, int] = {}
+        for number, body in sorted(fixed.items()):
+            self.offsets[number] = len(prefix)
+            prefix += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+        self.prefix = bytes(prefix)
+
+    def text_width(self, text: str, size: float, style: str = "regular") -> float:
+        """Width of text in millimetres"""
+        widths = self.widths[style]
+        return sum(widths.get(char, 556) for char in text) * size / 1000 / MM
+
+    def wrap(self, text: str, size: float, width: float, style: str = "regular") -> List[str]:
+        """Split text into lines no wider than width (mm), breaking at spaces and newlines"""
+        lines = []
+        for paragraph in text.split("\n"):
+            line = ""
+            for word in paragraph.split(" "):
+                candidate = f"{line} {word}" if line else word
+                if line and self.text_width(candidate, size, style) > width:
+                    lines.append(line)
+                    line = word
+                else:
+                    line = candidate
+            lines.append(line)
+        return lines
+
+
+class PdfCanvas:
+    """Pages of drawing operations in millimetres from the top-left corner"""
+
+    def __init__(self, template: ReportTemplate):
+        self.template = template
+        self.pages: List[List[bytes]] = []
+        self.new_page()
+
+    def new_page(self) -> None:
+        self._ops: List[bytes] = []
+        self.pages.append(self._ops)
+        self.y = MARGIN
+
+    def need(self, height: float) -> None:
+        """Start a new page unless height (mm) fits below the current position"""
+        if self.y + height > PAGE_HEIGHT - MARGIN:
+            self.new_page()
+
+    def text(self, x: float, y: float, text: Any, size: float, style: str = "regular",
+             color: Tuple[int, int, int] = BLACK, align: str = "left") -> None:
+        text = pdf_text(text)
+        if align != "left":
+            width = self.template.text_width(text, size, style)
+            x -= width / 2 if align == "center" else width
+        self._ops.append(b"BT %.3f %.3f %.3f rg /%s %g Tf %.2f %.2f Td (%s) Tj ET\n" % (
+            color[0] / 255, color[1] / 255, color[2] / 255, self.template.font_names[style], size,
+            x * MM, (PAGE_HEIGHT - y) * MM, _pdf_string(text)
+        ))
+
+    def rect(self, x: float, y: float, width: float, height: float,
+             fill: Optional[Tuple[int, int, int]] = None, stroke: Optional[Tuple[int, int, int]] = None,
+             line_width: float = 0.3) -> None:
+        ops = b""
+        if fill:
+            ops += b"%.3f %.3f %.3f rg " % tuple(value / 255 for value in fill)
+        if stroke:
+            ops += b"%.3f %.3f %.3f RG %.2f w " % (*(value / 255 for value in stroke), line_width * MM)
+        ops += b"%.2f %.2f %.2f %.2f re %s\n" % (
+            x * MM, (PAGE_HEIGHT - y - height) * MM, width * MM, height * MM,
+            b"B" if fill and stroke else b"f" if fill else b"S"
+        )
+        self._ops.append(ops)
+
+    def paragraph(self, x: float, text: Any, size: float, width: float, style: str = "regular",
+                  color: Tuple[int, int, int] = BLACK, line_height: float = 5) -> None:
+        """Wrapped text starting at the current position, breaking pages between lines"""
+        for line in self.template.wrap(pdf_text(text), size, width, style):
+            self.need(line_height)
+            self.text(x, self.y, line, size, style, color)
+            self.y += line_height
+
+    def table(self, head: Sequence[str], rows: Sequence[Sequence[Any]], widths: Sequence[float],
+              size: float = 9, padding: float = 2.5, styles: Optional[Sequence[Optional[Dict[str, Any]]]] = None) -> None:
+        """Striped table with a header row (repeated after page breaks)"""
+        line_height = size * 0.45
+        header_styles = [{"style": "bold", "color": WHITE}] * len(head)
+        body_styles = [style or {} for style in styles or [None] * len(widths)]
+
+        def draw_row(cells: Sequence[str], fill: Optional[Tuple[int, int, int]], header: bool,
+                     cell_styles: Sequence[Dict[str, Any]]) -> None:
+            wrapped = [
+                self.template.wrap(pdf_text(cell), size, width - 2 * padding, style.get("style", "regular"))
+                for cell, width, style in zip(cells, widths, cell_styles)
+            ]
+            height = max(len(lines) for lines in wrapped) * line_height + 2 * padding
+            if not header:
+                self.need(height)
+                if self.y == MARGIN:
+                    draw_row(head, ACCENT, True, header_styles)
+            x = MARGIN
+            if fill:
+                self.rect(x, self.y, sum(widths), height, fill=fill)
+            for lines, width, style in zip(wrapped, widths, cell_styles):
+                for index, line in enumerate(lines):
+                    y = self.y + padding + (index + 0.8) * line_height
+                    if style.get("align") == "center":
+                        self.text(x + width / 2, y, line, size, style.get("style", "regular"),
+                                  style.get("color", BLACK), align="center")
+                    else:
+                        self.text(x + padding, y, line, size, style.get("style", "regular"), style.get("color", BLACK))
+                x += width
+            self.y += height
+
+        self.need(size * 0.45 + 2 * padding + 10)
+        draw_row(head, ACCENT, True, header_styles)
+        for index, row in enumerate(rows):
+            draw_row([str(cell) for cell in row], STRIPE if index % 2 else None, False, body_styles)
+
+    def to_bytes(self, title: str = "") -> bytes:
+        """The complete PDF file"""
+        template = self.template
+        out = bytearray(template.prefix)
+        offsets = dict(template.offsets)
+        page_numbers = []
+
+        number = template.FIRST_PAGE
+        for ops in self.pages:
+            content = zlib.compress(b"".join(ops), 6)
+            offsets[number] = len(out)
+            out += b"%d 0 obj\n<< /Length %d /Filter /FlateDecode >>\nstream\n" % (number, len(content))
+            out += content + b"\nendstream\nendobj\n"
+            offsets[number + 1] = len(out)
+            out += (b"%d 0 obj\n<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] /Resources %d 0 R "
+                    b"/Contents %d 0 R >>\nendobj\n" % (
+                        number + 1, PAGE_WIDTH * MM, PAGE_HEIGHT * MM, template.RESOURCES, number))
+            page_numbers.append(number + 1)
+            number += 2
+
+        offsets[2] = len(out)
+        out += b"2 0 obj\n<< /Type /Pages /Kids [%s] /Count %d >>\nendobj\n" % (
+            b" ".join(b"%d 0 R" % page for page in page_numbers), len(page_numbers))
+        info = number
+        offsets[info] = len(out)
+        out += b"%d 0 obj\n<< /Title (%s) /Producer (Sunil Mahajan Numerology) >>\nendobj\n" % (
+            info, _pdf_string(pdf_text(title)))
+
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (info + 1)
+        for index in range(1, info + 1):
+            out += b"%010d 00000 n \n" % offsets[index]
+        out += b"trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (info + 1, info, xref)
+        return bytes(out)
+
+
+_template: Optional[ReportTemplate] = None
+_template_lock = threading.Lock()
+
+
+def get_template() -> ReportTemplate:
+    """The shared report template, built on first use (or at startup)"""
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                _template = ReportTemplate()
+    return _template
+
+
+def _heading(canvas: PdfCanvas, text: str, room: float = 30) -> None:
+    canvas.need(room)
+    canvas.text(MARGIN, canvas.y, text, 14, color=ACCENT)
+    canvas.y += 10
+
+
+def _format_date(date_of_birth: str) -> str:
+    try:
+        day = date.fromisoformat(date_of_birth)
+    except ValueError:
+        return date_of_birth
+    return f"{day:%B} {day.day}, {day.year}"
+
+
+def _draw_grid(canvas: PdfCanvas, grid: List[List[Dict[str, Any]]]) -> None:
+    cell = 20
+    left = (PAGE_WIDTH - 3 * cell) / 2
+    canvas.need(3 * cell + 15)
+    for row_index, row in enumerate(grid):
+        for column_index, square in enumerate(row):
+            x = left + column_index * cell
+            y = canvas.y + row_index * cell
+            colors = PRESENT_CELL if square["present"] else MISSING_CELL
+            canvas.rect(x, y, cell, cell, fill=colors["fill"], stroke=colors["border"],
+                        line_width=0.5 if square["present"] else 0.3)
+            canvas.text(x + cell / 2, y + cell / 2 + 2.3, str(square["value"])[:1], 18, "bold",
+                        colors["text"], align="center")
+            if square["present"] and square["count"] > 1:
+                canvas.text(x + cell - 1.5, y + 3.5, f"×{square['count']}", 7, color=colors["text"], align="right")
+    canvas.y += 3 * cell + 15
+
+
+def _draw_compatibility(canvas: PdfCanvas, label: str, compatibility: Dict[str, Any]) -> None:
+    canvas.need(32)
+    canvas.text(MARGIN, canvas.y, label, 12, "bold", ACCENT)
+    canvas.y += 6
+    canvas.text(MARGIN, canvas.y, compatibility.get("planet", ""), 10, "italic")
+    canvas.y += 6
+    for title, key, default in [("Friends:", "friends_raw", ""), ("Non-Friends:", "non_friends_raw", "None"),
+                                ("Neutral:", "neutral_raw", "")]:
+        canvas.text(MARGIN + 5, canvas.y, title, 10, "bold")
+        canvas.text(MARGIN + 35, canvas.y, compatibility.get(key) or default, 10)
+        canvas.y += 6
+    canvas.y += 4
+
+
+def _number_list(numbers: List[int]) -> str:
+    return ", ".join(str(number) for number in numbers) or "None"
+
+
+def render_report(result: Dict[str, Any], template: Optional[ReportTemplate] = None) -> bytes:
+    """Render a successful calculate_numerology result as a PDF"""
+    canvas = PdfCanvas(template or get_template())
+
+    canvas.text(PAGE_WIDTH / 2, canvas.y, "Numerology Report", 20, color=ACCENT, align="center")
+    canvas.y += 15
+    canvas.text(MARGIN, canvas.y, f"Name: {result['name']}", 12)
+    canvas.y += 8
+    canvas.text(MARGIN, canvas.y, f"Date of Birth: {_format_date(result['date_of_birth'])}", 12)
+    canvas.y += 8
+    canvas.text(MARGIN, canvas.y, f"Gender: {result['gender'].capitalize()}", 12)
+    canvas.y += 15
+
+    _heading(canvas, "Your Personalized Loshu Grid", 80)
+    _draw_grid(canvas, result["loshu_grid"])
+
+    _heading(canvas, "Your Numbers", 50)
+    for label, key in [("Driver Number", "driver"), ("Conductor Number", "conductor"), ("Kua Number", "kua")]:
+        canvas.text(MARGIN, canvas.y, f"{label}: {result[key]}", 11)
+        canvas.y += 7
+    canvas.y += 3
+    canvas.text(MARGIN, canvas.y, "Numbers Present in Your Life:", 11)
+    canvas.text(MARGIN + 70, canvas.y, _number_list(result["present_numbers"]), 11)
+    canvas.y += 7
+    if result["missing_numbers"]:
+        canvas.text(MARGIN, canvas.y, "Missing Numbers:", 11)
+        canvas.text(MARGIN + 70, canvas.y, _number_list(result["missing_numbers"]), 11)
+        canvas.y += 7
+    canvas.y += 8
+
+    _heading(canvas, "Number Compatibility", 45)
+    _draw_compatibility(canvas, f"Driver Number {result['driver']}", result["driver_compatibility"])
+    _draw_compatibility(canvas, f"Conductor Number {result['conductor']}", result["conductor_compatibility"])
+    canvas.y += 4
+
+    _heading(canvas, "Number Summary")
+    for label, key in [("Lucky Numbers:", "lucky_numbers"), ("Bad Numbers:", "bad_numbers"),
+                       ("Neutral Numbers:", "neutral_numbers")]:
+        canvas.text(MARGIN, canvas.y, label, 11)
+        canvas.text(MARGIN + 50, canvas.y, _number_list(result[key]), 11)
+        canvas.y += 7
+    canvas.y += 8
+
+    lines = result["loshu_lines"]["all"]
+    if lines:
+        _heading(canvas, "Complete Lines in Your Loshu Grid")
+        canvas.table(
+            ["Type", "Numbers", "Line Name", "Description"],
+            [[line["type"].capitalize(), "-".join(str(number) for number in line["numbers"]), line["name"],
+              line["description"]] for line in lines],
+            [25, 20, 55, 70],
+            styles=[{"style": "bold"}, {"align": "center"}, None, None]
+        )
+        canvas.y += 10
+
+    _heading(canvas, "Remedies for Missing Numbers")
+    canvas.text(MARGIN, canvas.y, "Part 1: Based on your Loshu Grid", 10, "italic")
+    canvas.y += 8
+    if result["remedies_part1"]:
+        for remedy in result["remedies_part1"]:
+            canvas.need(15)
+            canvas.text(MARGIN, canvas.y, f"If {remedy['condition']}".upper(), 10, "bold", RED)
+            canvas.y += 5
+            canvas.paragraph(MARGIN, remedy["remedy"], 10, CONTENT_WIDTH)
+            canvas.y += 3
+    else:
+        canvas.text(MARGIN, canvas.y, "No missing numbers! Your Loshu Grid is complete.", 10, color=TEAL)
+        canvas.y += 8
+    canvas.y += 5
+
+    canvas.need(30)
+    canvas.text(MARGIN, canvas.y, "Part 2: Yantra-Based Remedies", 10, "italic")
+    canvas.y += 8
+    if result["remedies_part2"]:
+        for remedy in result["remedies_part2"]:
+            canvas.need(15)
+            canvas.paragraph(MARGIN, remedy["remedy"].upper(), 10, CONTENT_WIDTH, "bold", RED)
+            canvas.paragraph(MARGIN, f"Condition: {remedy['condition']}", 10, CONTENT_WIDTH)
+            canvas.y += 3
+    else:
+        canvas.text(MARGIN, canvas.y, "No Yantra-based remedies applicable.", 10, color=TEAL)
+        canvas.y += 8
+    canvas.y += 5
+
+    canvas.need(30)
+    canvas.text(MARGIN, canvas.y, "Part 3: Planet-Based Remedies", 10, "italic")
+    canvas.y += 6
+    if result["remedies_part3"]:
+        canvas.table(
+            ["No.", "Planet", "Remedy / Action"],
+            [[item["number"], item["planet"], "\n".join(f"• {remedy}" for remedy in item["remedies"])]
+             for item in result["remedies_part3"]],
+            [20, 35, 115],
+            styles=[{"align": "center", "style": "bold", "color": ACCENT}, {"style": "bold"}, None]
+        )
+    else:
+        canvas.text(MARGIN, canvas.y, "No missing numbers! No planet-based remedies needed.", 10, color=TEAL)
+    canvas.y += 12
+
+    if result["luck_factors"]:
+        _heading(canvas, f"Luck Factor - Next {len(result['luck_factors'])} Years", 60)
+        canvas.table(
+            ["Year", "Date", "PY, D", "Luck Factor"],
+            [[item["year"], item["date"], item["combination"], item["luck_factor"]] for item in result["luck_factors"]],
+            [30, 45, 35, 60], size=10
+        )
+        canvas.y += 12
+
+    analysis = result.get("name_analysis")
+    if analysis:
+        _heading(canvas, "Name Numerology Analysis", 50)
+        canvas.text(MARGIN, canvas.y, f"First Name: {analysis['first_name']} = {analysis['first_name_value']}", 11)
+        canvas.y += 8
+        canvas.text(MARGIN, canvas.y, f"Full Name: {analysis['full_name']} = {analysis['full_name_value']}", 11)
+        canvas.y += 12
+        for title, key, color in [("Rules Followed:", "followed_rules", GREEN),
+                                  ("Rules Contradicted:", "contradicted_rules", ALERT)]:
+            if not analysis[key]:
+                continue
+            canvas.need(20)
+            canvas.text(MARGIN, canvas.y, title, 12, "bold", color)
+            canvas.y += 8
+            for rule in analysis[key]:
+                canvas.paragraph(MARGIN + 5, f"- {rule['description']}", 10, CONTENT_WIDTH - 5)
+                canvas.y += 2
+            canvas.y += 5
+
+    return canvas.to_bytes(f"Numerology Report - {result['name']}")
+
+
+def _file_safe(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "", re.sub(r"\s+", "_", pdf_text(name).strip())) or "report"
+
+
+def report_filename(name: str, day: Optional[date] = None) -> str:
+    """Download name of a report, as used by the browser export"""
+    return f"Numerology_{_file_safe(name)}_{(day or date.today()).isoformat()}.pdf"
+
+
+class RendererBusy(RuntimeError):
+    """Raised when every worker is busy and the render queue is full"""
+
+
+class ReportRenderer:
+    """Bounded thread pool of PDF renders with an LRU cache of finished reports"""
+
+    def __init__(self, workers: int = PDF_WORKERS, queue_size: int = PDF_QUEUE_SIZE, cache_size: int = PDF_CACHE_SIZE):
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.cache = LRUCache(cache_size)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def key(self, name: str, date_of_birth: str, gender: str) -> Tuple[Any, ...]:
+        return name, date_of_birth, gender, datetime.now().year
+
+    def _cached(self, key: Tuple[Any, ...]) -> Optional[bytes]:
+        with self._lock:
+            return self.cache.get(key)
+
+    def _render(self, key: Tuple[Any, ...], name: str, date_of_birth: str, gender: str) -> bytes:
+        result = calculate_numerology_result(name, date_of_birth, gender)
+        if not result["success"]:
+            raise ValueError(result["error"])
+        pdf = render_report(result)
+        with self._lock:
+            self.cache.put(key, pdf)
+        return pdf
+
+    def render(self, name: str, date_of_birth: str, gender: str) -> bytes:
+        """Report of a person (raises ValueError for invalid input)"""
+        name = normalize_name(name)
+        gender = normalize_gender(gender)
+        key = self.key(name, date_of_birth, gender)
+        pdf = self._cached(key)
+        return pdf if pdf is not None else self._render(key, name, date_of_birth, gender)
+
+    async def render_async(self, name: str, date_of_birth: str, gender: str) -> bytes:
+        """render() on the worker pool; raises RendererBusy when the queue is full"""
+        name = normalize_name(name)
+        gender = normalize_gender(gender)
+        key = self.key(name, date_of_birth, gender)
+        pdf = self._cached(key)
+        if pdf is not None:
+            return pdf
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise RendererBusy("The report renderer is busy, please try again shortly")
+        try:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="pdf-report")
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._render, key, name, date_of_birth, gender)
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self.cache.stats()
+        stats.update({"workers": self.workers, "queue_size": self.queue_size, "rejected": self.rejected})
+        return stats
+
+
+_renderer: Optional[ReportRenderer] = None
+
+
+def get_renderer() -> ReportRenderer:
+    """The shared report renderer"""
+    global _renderer
+    if _renderer is None:
+        _renderer = ReportRenderer()
+    return _renderer
+
+
+def render_chunk(chunk: List[Tuple[int, Any]]) -> List[Tuple[int, Optional[str], Optional[bytes], Optional[str]]]:
+    """Render a chunk of (index, record) pairs into (index, file name, PDF, error) tuples"""
+    rendered = []
+    for index, record in chunk:
+        result = score_record(index, record)
+        if not result["success"]:
+            rendered.append((index, None, None, result["error"]))
+            continue
+        file_name = f"{index:06d}_{_file_safe(result['name'])}.pdf"
+        rendered.append((index, file_name, render_report(result), None))
+    return rendered
+
+
+def _init_worker() -> None:
+    get_date_profile_table()
+    get_template()
+
+
+def export_zip(
+    input_path: str,
+    output_path: str,
+    input_format: Optional[str] = None,
+    workers: int = 1,
+    chunk_size: int = 100
+) -> Tuple[int, int]:
+    """
+    Render a report for every record of a CSV/NDJSON batch file into a zip,
+    with a manifest.ndjson of the file (or error) of each record. Returns
+    (records, reports written).
+    """
+    input_format = input_format or detect_format(input_path)
+    get_date_profile_table()
+    get_template()
+
+    count = written = 0
+    with open(input_path, "r", encoding="utf-8", newline="") as source, \
+            zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_STORED) as archive:
+        manifest = io.StringIO()
+
+        def write(rendered: List[Tuple[int, Optional[str], Optional[bytes], Optional[str]]]) -> None:
+            nonlocal count, written
+            for index, file_name, pdf, error in rendered:
+                entry: Dict[str, Any] = {"index": index, "success": error is None}
+                if error is None:
+                    # PDF content streams are already compressed
+                    archive.writestr(file_name, pdf)
+                    entry["file"] = file_name
+                    written += 1
+                else:
+                    entry["error"] = error
+                manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                count += 1
+
+        chunks = iter_chunks(read_records(source, input_format), chunk_size)
+        if workers <= 1:
+            for chunk in chunks:
+                write(render_chunk(chunk))
+        else:
+            with Pool(workers, initializer=_init_worker) as pool:
+                # Bounded window of chunks in flight, written in input order
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.apply_async(render_chunk, (chunk,)))
+                    if len(pending) >= workers * 2:
+                        write(pending.popleft().get())
+                while pending:
+                    write(pending.popleft().get())
+
+        archive.writestr("manifest.ndjson", manifest.getvalue(), compress_type=zipfile.ZIP_DEFLATED)
+    return count, written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render PDF reports for a CSV or NDJSON file of people into a zip")
+    parser.add_argument("input", help="Input file (.csv or .ndjson/.jsonl)")
+    parser.add_argument("output", help="Output zip file")
+    parser.add_argument("--input-format", choices=("csv", "ndjson"), help="Input format (default: from extension)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: CPU count, 1 disables multiprocessing)")
+    parser.add_argument("--chunk-size", type=int, default=100, help="Records per work chunk (default: 100)")
+    args = parser.parse_args(argv)
+
+    try:
+        count, written = export_zip(args.input, args.output, input_format=args.input_format,
+                                    workers=args.workers, chunk_size=max(1, args.chunk_size))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Rendered {written} of {count} records into {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
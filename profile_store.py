@@ -0,0 +1,165 @@
+"""
+On-disk date profile store - the date profile table as a memory-mapped file
+
+The file holds one fixed-width record per (date, gender) slot of the
+DateProfileTable, in slot order, after a fixed-size header. The app maps it
+read-only at import time and reads the records in place, so a cold start
+costs an mmap call instead of enumerating the date space.
+
+Layout (little-endian):
+    header, HEADER_SIZE bytes:
+        magic b"NUMPROF\\0", format version (u16), record size (u16),
+        first and last year (u16 each), record count (u32),
+        SHA-256 of the record functions' source (32 bytes), zero padding
+    records, RECORD_SIZE bytes each:
+        driver, conductor, kua (u8 each), digit counts of 1-9 (9 x u8),
+        present mask (u16), reserved (u16)
+
+The stored fields are computed by the RECORD_FUNCTIONS of calculations.py,
+so the checksum covers their source only; edits elsewhere (e.g. the name
+rules in data.py) keep the store valid. Files with another magic, format
+version, record size or year range, a truncated body, or a source checksum
+that differs from the running code are rejected with StaleStoreError, and the
+table is built in memory instead. DateProfileTable.load also recomputes a few
+probe records and rejects the file if they differ.
+
+Usage:
+    python profile_store.py [path]
+"""
+import argparse
+import hashlib
+import inspect
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from datetime import date
+from typing import List, Optional
+
+import calculations
+
+MAGIC = b"NUMPROF\0"
+FORMAT_VERSION = 2
+
+HEADER = struct.Struct("<8sHHHHI32s")
+HEADER_SIZE = 64
+
+# driver, conductor, kua, digit counts of 1-9, present mask
+RECORD = struct.Struct("<BBB9sH2x")
+RECORD_SIZE = RECORD.size
+
+# Field offsets within a record
+DRIVER_OFFSET = 0
+CONDUCTOR_OFFSET = 1
+KUA_OFFSET = 2
+COUNTS_OFFSET = 3
+MASK_OFFSET = 12
+
+# Store loaded by the app, built with `python profile_store.py` (empty disables it)
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles.bin")
+STORE_PATH = os.environ.get("NUMEROLOGY_PROFILE_STORE", DEFAULT_STORE_PATH)
+
+
+class StaleStoreError(ValueError):
+    """The store file does not match this format, year range or the code deriving its records"""
+
+
+# Functions the stored fields are computed with
+RECORD_FUNCTIONS = (
+    calculations.sum_digits_to_single,
+    calculations.calculate_driver,
+    calculations.calculate_conductor,
+    calculations.calculate_kua,
+    calculations.count_loshu_digits,
+    calculations.digit_count_mask,
+)
+
+
+def source_checksum() -> bytes:
+    """SHA-256 of the source of RECORD_FUNCTIONS"""
+    digest = hashlib.sha256()
+    for function in RECORD_FUNCTIONS:
+        digest.update(inspect.getsource(function).encode())
+    return digest.digest()
+
+
+def record_count(min_year: int, max_year: int) -> int:
+    return (date(max_year, 12, 31).toordinal() - date(min_year, 1, 1).toordinal() + 1) * 2
+
+
+def write_store(path: str, records: bytes, min_year: int, max_year: int) -> None:
+    """Write records (RECORD_SIZE bytes per slot) to path, replacing any existing file atomically"""
+    count = len(records) // RECORD_SIZE
+    if count * RECORD_SIZE != len(records) or count != record_count(min_year, max_year):
+        raise ValueError(f"Expected {record_count(min_year, max_year)} records of {RECORD_SIZE} bytes")
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, RECORD_SIZE, min_year, max_year, count, source_checksum())
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".profiles-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            f.write(records)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def open_store(path: str, min_year: int, max_year: int) -> mmap.mmap:
+    """Map a store file read-only and validate its header (the records start at HEADER_SIZE)"""
+    if sys.byteorder != "little":
+        raise StaleStoreError("The profile store can only be read on little-endian machines")
+
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < HEADER_SIZE:
+            raise StaleStoreError(f"{path} is not a profile store")
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, record_size, first, last, count, checksum = HEADER.unpack_from(mapping)
+    expected = record_count(min_year, max_year)
+    problem = None
+    if magic != MAGIC:
+        problem = "is not a profile store"
+    elif version != FORMAT_VERSION or record_size != RECORD_SIZE:
+        problem = f"has format version {version} (expected {FORMAT_VERSION})"
+    elif (first, last) != (min_year, max_year):
+        problem = f"covers {first}-{last} (expected {min_year}-{max_year})"
+    elif count != expected or size != HEADER_SIZE + count * RECORD_SIZE:
+        problem = "is truncated or has the wrong number of records"
+    elif checksum != source_checksum():
+        problem = "was generated by different record functions in calculations.py"
+    if problem:
+        mapping.close()
+        raise StaleStoreError(f"{path} {problem}; regenerate it with `python profile_store.py`")
+
+    return mapping
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate the memory-mapped date profile store")
+    parser.add_argument("path", nargs="?", default=STORE_PATH or DEFAULT_STORE_PATH,
+                        help="Output file (default: NUMEROLOGY_PROFILE_STORE or profiles.bin)")
+    args = parser.parse_args(argv)
+
+    import time
+    from date_profiles import DateProfileTable
+
+    start = time.perf_counter()
+    table = DateProfileTable().build()
+    try:
+        write_store(args.path, table.records(), table.min_year, table.max_year)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {len(table)} date profiles ({table.min_year}-{table.max_year}) to {args.path} in {elapsed:.2f}s",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
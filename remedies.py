@@ -1,18 +1,15 @@
 """
 Remedies calculation logic for numerology
 """
-from typing import List, Dict, Any, Set
-from data import REMEDIES_PART3
+from typing import List, Dict, Any
+from data import REMEDIES_PART3, YANTRA_RULES
+from rules import YANTRA_RULE_SET
+from calculations import FULL_MASK, MISSING_NUMBERS_BY_MASK, numbers_to_mask
 
 
-def calculate_remedies_part1(
-    missing_numbers: List[int],
-    driver: int,
-    conductor: int
-) -> List[Dict[str, str]]:
-    """Calculate remedies based on missing numbers in Loshu Grid"""
+def _remedies_part1(mask: int, has_eight: bool) -> List[Dict[str, str]]:
     remedies = []
-    missing_set = set(missing_numbers)
+    missing_set = set(MISSING_NUMBERS_BY_MASK[mask])
 
     # If 4 OR 3 is missing
     if 4 in missing_set or 3 in missing_set:
@@ -51,7 +48,7 @@ def calculate_remedies_part1(
     # If 1 is missing
     if 1 in missing_set:
         note = ""
-        if driver == 8 or conductor == 8:
+        if has_eight:
             note = " (Note: Driver or Conductor is 8, so drink less water)"
         else:
             note = " (Drink as much water as possible)"
@@ -70,79 +67,70 @@ def calculate_remedies_part1(
     return remedies
 
 
-def calculate_remedies_part2(
+# Part 1 remedies for every presence mask, without / with 8 as driver or conductor
+REMEDIES_PART1_BY_MASK = [
+    [_remedies_part1(mask, has_eight) for mask in range(FULL_MASK + 1)]
+    for has_eight in (False, True)
+]
+
+
+def remedies_part1_for_mask(mask: int, driver: int, conductor: int) -> List[Dict[str, str]]:
+    """Part 1 remedies for a Loshu presence mask (shared, treat as read-only)"""
+    return REMEDIES_PART1_BY_MASK[driver == 8 or conductor == 8][mask]
+
+
+def calculate_remedies_part1(
     missing_numbers: List[int],
-    present_numbers: List[int],
     driver: int,
     conductor: int
 ) -> List[Dict[str, str]]:
-    """Calculate Yantra-based remedies with specific conditions"""
-    remedies = []
-    missing_set = set(missing_numbers)
-    present_set = set(present_numbers)
+    """Calculate remedies based on missing numbers in Loshu Grid"""
+    mask = FULL_MASK & ~numbers_to_mask(missing_numbers)
+    return remedies_part1_for_mask(mask, driver, conductor)
 
-    # 1. Surya Budha Yantra
-    if 5 in missing_set and 6 in present_set and driver != 8 and conductor != 8:
-        remedies.append({
-            "remedy": "Wear Surya Budha Yantra",
-            "condition": "5 is missing and 6 is present, but driver or conductor should not be 8"
-        })
 
-    # 2. Budha Payra
-    if 5 in missing_set and 6 in missing_set and driver != 3 and conductor != 3:
-        remedies.append({
-            "remedy": "Wear Budha Payra",
-            "condition": "5 and 6 are missing, but driver or conductor should not be 3"
-        })
+def _remedies_part2(bits: int) -> List[Dict[str, str]]:
+    return [
+        {"remedy": yantra["remedy"], "condition": yantra["condition"]}
+        for index, yantra in enumerate(YANTRA_RULES)
+        if bits & (1 << index)
+    ]
 
-    # 3. Surya Payra
-    if 6 in missing_set and 5 in present_set and driver not in [3, 8] and conductor not in [3, 8]:
-        remedies.append({
-            "remedy": "Wear Surya Payra",
-            "condition": "6 is missing and 5 is present, but driver or conductor should not be 8 or 3 (Pyra will not only take care of missing number 6 but also missing other numbers too)"
-        })
 
-    # 4. Pyra Yantra
-    if 6 in missing_set and 5 in present_set and (driver == 8 or conductor == 8) and driver != 3 and conductor != 3:
-        remedies.append({
-            "remedy": "Wear Pyra Yantra",
-            "condition": "6 is missing and 5 is present, driver or conductor is 8, but driver or conductor should not be 3"
-        })
+# Remedy lists for every reachable set of applicable yantras
+REMEDIES_PART2_BY_BITS: Dict[int, List[Dict[str, str]]] = {
+    bits: _remedies_part2(bits)
+    for bits in {
+        grid_bits & number_bits
+        for grid_bits in set(YANTRA_RULE_SET.grid_bits)
+        for number_bits in set(YANTRA_RULE_SET.number_bits.values())
+    }
+}
 
-    # 5. Budha Yantra
-    if ((driver == 3 and conductor == 8) or (driver == 8 and conductor == 3)) and 5 in missing_set:
-        remedies.append({
-            "remedy": "Wear Budha Yantra",
-            "condition": "Driver-Conductor is 3-8 or 8-3, and 5 is missing"
-        })
 
-    # 6. Surya Yantra
-    if ((driver == 3 and conductor == 6) or (driver == 6 and conductor == 3)) and 5 in present_set:
-        remedies.append({
-            "remedy": "Wear Surya Yantra",
-            "condition": "Driver-Conductor is 3-6 or 6-3, and 5 is present"
-        })
+def remedies_part2_for_mask(mask: int, driver: int, conductor: int) -> List[Dict[str, str]]:
+    """Part 2 (Yantra) remedies for a Loshu presence mask (shared, treat as read-only)"""
+    bits = YANTRA_RULE_SET.applicable(mask, driver, conductor)
 
-    # 7. Saraswati Yantra
-    if driver != 6 and conductor != 6:
-        remedies.append({
-            "remedy": "Saraswati Yantra for the education of children",
-            "condition": "Driver or conductor should not be 6"
-        })
+    remedies = REMEDIES_PART2_BY_BITS.get(bits)
+    if remedies is None:
+        remedies = REMEDIES_PART2_BY_BITS[bits] = _remedies_part2(bits)
+    return remedies
 
-    # 8. Gayatri Yantra (always applicable for health)
-    remedies.append({
-        "remedy": "Wear Gayatri Yantra for health issues only",
-        "condition": "For health issues only"
-    })
 
-    return remedies
+def calculate_remedies_part2(
+    missing_numbers: List[int],
+    present_numbers: List[int],
+    driver: int,
+    conductor: int
+) -> List[Dict[str, str]]:
+    """Calculate Yantra-based remedies with specific conditions"""
+    return remedies_part2_for_mask(numbers_to_mask(present_numbers), driver, conductor)
 
 
-def calculate_remedies_part3(missing_numbers: List[int]) -> List[Dict[str, Any]]:
-    """Calculate planet-based remedies for missing numbers"""
+def _remedies_part3(mask: int) -> List[Dict[str, Any]]:
     remedies = []
-    for num in sorted(missing_numbers):
+    for num in MISSING_NUMBERS_BY_MASK[mask]:
         if num in REMEDIES_PART3:
             remedy_data = REMEDIES_PART3[num]
             remedies.append({
@@ -151,3 +139,17 @@ def calculate_remedies_part3(missing_numbers: List[int]) -> List[Dict[str, Any]]
                 "remedies": remedy_data["remedies"]
             })
     return remedies
+
+
+# Part 3 remedies for every presence mask
+REMEDIES_PART3_BY_MASK = [_remedies_part3(mask) for mask in range(FULL_MASK + 1)]
+
+
+def remedies_part3_for_mask(mask: int) -> List[Dict[str, Any]]:
+    """Part 3 (planet) remedies for a Loshu presence mask (shared, treat as read-only)"""
+    return REMEDIES_PART3_BY_MASK[mask]
+
+
+def calculate_remedies_part3(missing_numbers: List[int]) -> List[Dict[str, Any]]:
+    """Calculate planet-based remedies for missing numbers"""
+    return REMEDIES_PART3_BY_MASK[FULL_MASK & ~numbers_to_mask(missing_numbers)]
@@ -0,0 +1,211 @@
+"""
+Response cache for /calculate - bounded LRU of pre-encoded JSON responses
+
+Entries are keyed on the normalized name (see normalize_name_key), date of
+birth, gender and the current year, since the luck factors depend on it.
+The response echoes the submitted name verbatim, so each entry is stored as
+encoded JSON with the name fields left as slots that are filled in on a hit.
+Responses for names longer than MAX_CACHED_NAME_LENGTH are not cached.
+
+From the event loop (get_response_async), concurrent identical misses share
+one calculation (see singleflight.py), which also holds with the cache
+disabled. Misses are calculated inline, as the calculation is CPU-bound and
+holds the GIL; NUMEROLOGY_OFFLOAD=1 calculates them in a worker thread
+instead. NUMEROLOGY_SINGLEFLIGHT=0 turns coalescing off.
+"""
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from fragments import EncodedParts, Slot, encode_parts
+from metrics import stage_timer
+from serialization import dumps
+from name_numerology import MAX_CACHED_NAME_LENGTH, normalize_name_key
+from numerology import calculate_numerology_result
+from singleflight import SingleFlight
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.environ.get(name)
+    return float(value) if value else None
+
+
+# Cache configuration (size 0 disables caching, TTL in seconds)
+CACHE_SIZE = int(os.environ.get("NUMEROLOGY_CACHE_SIZE", 10000))
+CACHE_TTL = _env_float("NUMEROLOGY_CACHE_TTL")
+
+# Coalesce concurrent identical misses, calculating them in a worker thread with OFFLOAD
+SINGLEFLIGHT = os.environ.get("NUMEROLOGY_SINGLEFLIGHT", "1") != "0"
+OFFLOAD = os.environ.get("NUMEROLOGY_OFFLOAD", "") == "1"
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with optional time-to-live and hit/miss counters"""
+
+    def __init__(self, max_size: int = 10000, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at is not None and self._clock() >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if the cache is full"""
+        if self.max_size <= 0:
+            return
+        expires_at = self._clock() + self.ttl if self.ttl else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Encoded response with name slots: bytes parts interleaved with slot names
+ResponseTemplate = EncodedParts
+
+
+def make_template(result: Dict[str, Any]) -> ResponseTemplate:
+    """Encode a successful result, leaving the verbatim name fields as slots"""
+    content = dict(result)
+    content["name"] = Slot("name")
+    name_analysis = content["name_analysis"] = dict(result["name_analysis"])
+    name_analysis["full_name"] = Slot("name")
+    name_analysis["first_name"] = Slot("first_name")
+    return encode_parts(content)
+
+
+def render_template(template: ResponseTemplate, name: str) -> bytes:
+    """Fill the name slots of a cached response"""
+    name_parts = name.strip().split()
+    values = {
+        "name": dumps(name),
+        "first_name": dumps(name_parts[0] if name_parts else "")
+    }
+    return b"".join(values[part] if isinstance(part, str) else part for part in template)
+
+
+class NumerologyResponseCache:
+    """Cache of encoded /calculate responses, invalidated when the year changes"""
+
+    def __init__(self, max_size: int = CACHE_SIZE, ttl: Optional[float] = CACHE_TTL):
+        self.cache = LRUCache(max_size=max_size, ttl=ttl)
+        self.flights = SingleFlight(offload=OFFLOAD)
+        self._year = datetime.now().year
+
+    def key(self, name: str, date_of_birth: str, gender: str) -> Tuple[Any, ...]:
+        return (normalize_name_key(name), date_of_birth, gender, self._year)
+
+    def _lookup(self, name: str, date_of_birth: str, gender: str) -> Tuple[Tuple[Any, ...], Optional[ResponseTemplate]]:
+        current_year = datetime.now().year
+        if current_year != self._year:
+            # Luck factors start at the current year
+            self.cache.clear()
+            self._year = current_year
+
+        key = self.key(name, date_of_birth, gender)
+        return key, self.cache.get(key)
+
+    @staticmethod
+    def _calculate(name: str, date_of_birth: str, gender: str) -> Union[ResponseTemplate, bytes]:
+        """Response template of a successful calculation, or the encoded error response"""
+        result = calculate_numerology_result(name, date_of_birth, gender)
+        if not result.get("success"):
+            # Errors are cheap and may depend on the current date, so they are not cached
+            return dumps(result)
+        return make_template(result)
+
+    def _respond(self, key: Tuple[Any, ...], calculated: Union[ResponseTemplate, bytes], name: str, timer) -> bytes:
+        if isinstance(calculated, bytes):
+            return calculated
+        if len(name) <= MAX_CACHED_NAME_LENGTH:
+            self.cache.put(key, calculated)
+        content = render_template(calculated, name)
+        timer.mark("serialization")
+        return content
+
+    def get_response(self, name: str, date_of_birth: str, gender: str) -> bytes:
+        """Return the encoded /calculate response, from the cache when possible"""
+        timer = stage_timer()
+        key, template = self._lookup(name, date_of_birth, gender)
+        timer.mark("cache_lookup")
+        if template is not None:
+            content = render_template(template, name)
+            timer.mark("serialization")
+            return content
+
+        calculated = self._calculate(name, date_of_birth, gender)
+        timer.mark("calculation")
+        return self._respond(key, calculated, name, timer)
+
+    async def get_response_async(self, name: str, date_of_birth: str, gender: str) -> bytes:
+        """
+        get_response for the event loop: with SINGLEFLIGHT, a miss is shared
+        by concurrent identical requests
+        """
+        if not SINGLEFLIGHT:
+            return self.get_response(name, date_of_birth, gender)
+
+        timer = stage_timer()
+        key, template = self._lookup(name, date_of_birth, gender)
+        timer.mark("cache_lookup")
+        if template is not None:
+            content = render_template(template, name)
+            timer.mark("serialization")
+            return content
+
+        calculated = await self.flights.run(key, self._calculate, name, date_of_birth, gender)
+        timer.mark("calculation")
+        return self._respond(key, calculated, name, timer)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+
+# Shared cache used by the API
+response_cache = NumerologyResponseCache()
@@ -0,0 +1,271 @@
+"""
+Rule engine for the declarative name rules and yantra remedies in data.py
+
+A rule's "when" condition is compiled into bit-mask tests: the grid part
+(present / missing numbers) is evaluated once for every Loshu presence mask
+and the number part (driver / conductor) once for every driver and conductor
+pair, each as a bitset of the rules that hold. The rules that apply to a
+profile are then a single AND of two table lookups:
+
+    applicable = grid_bits[present_mask] & number_bits[driver, conductor]
+
+Name rule outcomes are compiled into sets of accepted name values (bit v for
+value v), cached per (profile, name values), and can be evaluated for arrays
+of profiles at once with evaluate_name_rules_batch (requires NumPy).
+"""
+import os
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from calculations import FULL_MASK, numbers_to_mask
+from data import COMPATIBILITY, NAME_RULES, YANTRA_RULES
+
+# Name values are digital roots, 0 for a name without letters
+ALL_VALUES = (1 << 10) - 1
+
+# Size of the name rule outcome cache
+RULE_CACHE_SIZE = int(os.environ.get("NUMEROLOGY_RULE_CACHE_SIZE", 50000))
+
+GridTest = Callable[[int, int], Optional[str]]
+NumberTest = Callable[[int, int], bool]
+ValueSet = Callable[[int, int, int], int]
+
+
+def value_bits(values: Sequence[int]) -> int:
+    """Set of name values as a bitset (bit v for value v)"""
+    bits = 0
+    for value in values:
+        bits |= 1 << value
+    return bits
+
+
+# Non-friends of each driver as value bitsets
+_NON_FRIEND_BITS = {number: value_bits(data.get("non_friends", [])) for number, data in COMPATIBILITY.items()}
+
+# Value sets that depend on the profile: (driver, conductor, bad value bits) -> value bits
+NAMED_VALUE_SETS: Dict[str, ValueSet] = {
+    "numbers": lambda driver, conductor, bad: (1 << driver) | (1 << conductor),
+    "bad": lambda driver, conductor, bad: bad,
+    "driver_non_friends": lambda driver, conductor, bad: _NON_FRIEND_BITS.get(driver, 0)
+}
+
+
+def _grid_test(when: Dict[str, Any]) -> GridTest:
+    """Test of the grid condition: None when it fails, else the matched present_any group ('' if none)"""
+    present = numbers_to_mask(when.get("present", []))
+    missing = numbers_to_mask(when.get("missing", []))
+    groups = [(name, numbers_to_mask(numbers)) for name, numbers in when.get("present_any", {}).items()]
+
+    def test(present_mask: int, missing_mask: int) -> Optional[str]:
+        if present_mask & present != present or missing_mask & missing != missing:
+            return None
+        for name, bits in groups:
+            if present_mask & bits == bits:
+                return name
+        return None if groups else ""
+    return test
+
+
+def _number_test(when: Dict[str, Any]) -> NumberTest:
+    excluded = set(when.get("numbers_not", []))
+    required = set(when.get("numbers_any", []))
+    pairs = {tuple(pair) for pair in when.get("pairs", [])}
+
+    def test(driver: int, conductor: int) -> bool:
+        if driver in excluded or conductor in excluded:
+            return False
+        if required and driver not in required and conductor not in required:
+            return False
+        return not pairs or (driver, conductor) in pairs
+    return test
+
+
+def _value_set(outcome: Dict[str, Any]) -> ValueSet:
+    """Accepted name values of an outcome (value_in or value_not_in)"""
+    accepted = "value_in" in outcome
+    spec = outcome["value_in"] if accepted else outcome["value_not_in"]
+    if isinstance(spec, str):
+        named = NAMED_VALUE_SETS[spec]
+        if accepted:
+            return named
+        return lambda driver, conductor, bad: ALL_VALUES & ~named(driver, conductor, bad)
+    bits = value_bits(spec) if accepted else ALL_VALUES & ~value_bits(spec)
+    return lambda driver, conductor, bad: bits
+
+
+class RuleSet:
+    """Rules with "when" conditions, compiled to applicability bitsets (bit i for rule i)"""
+
+    def __init__(self, rules: List[Dict[str, Any]]):
+        self.rules = rules
+        self._grid_tests = [_grid_test(rule["when"]) for rule in rules]
+        self._number_tests = [_number_test(rule["when"]) for rule in rules]
+        self.grid_bits = [self._grid_bits(mask, FULL_MASK & ~mask) for mask in range(FULL_MASK + 1)]
+        self.number_bits = {
+            (driver, conductor): self._number_bits(driver, conductor)
+            for driver in range(1, 10)
+            for conductor in range(1, 10)
+        }
+
+    def _grid_bits(self, present_mask: int, missing_mask: int) -> int:
+        bits = 0
+        for index, test in enumerate(self._grid_tests):
+            if test(present_mask, missing_mask) is not None:
+                bits |= 1 << index
+        return bits
+
+    def _number_bits(self, driver: int, conductor: int) -> int:
+        bits = 0
+        for index, test in enumerate(self._number_tests):
+            if test(driver, conductor):
+                bits |= 1 << index
+        return bits
+
+    def applicable(self, present_mask: int, driver: int, conductor: int, missing_mask: Optional[int] = None) -> int:
+        """Bitset of the rules that apply (missing_mask defaults to the numbers not present)"""
+        if missing_mask is None or missing_mask == FULL_MASK & ~present_mask:
+            grid_bits = self.grid_bits[present_mask]
+        else:
+            grid_bits = self._grid_bits(present_mask, missing_mask)
+        number_bits = self.number_bits.get((driver, conductor))
+        if number_bits is None:
+            number_bits = self._number_bits(driver, conductor)
+        return grid_bits & number_bits
+
+    def matched(self, index: int, present_mask: int, missing_mask: int) -> str:
+        """Name of the present_any group that made rule index apply"""
+        return self._grid_tests[index](present_mask, missing_mask) or ""
+
+
+YANTRA_RULE_SET = RuleSet(YANTRA_RULES)
+NAME_RULE_SET = RuleSet(NAME_RULES)
+
+# (first or full name, [(accepted values, followed entry)], contradicted entry) of each name rule
+_NAME_OUTCOMES = [
+    (rule["name"], [(_value_set(outcome), outcome) for outcome in rule["outcomes"]], rule["otherwise"])
+    for rule in NAME_RULES
+]
+
+# Name rules whose descriptions name the matched present_any group
+_MATCHING_RULES = {index for index, rule in enumerate(NAME_RULES) if rule["when"].get("present_any")}
+
+
+# Formatted rule entries, shared between profiles with the same fields
+_ENTRIES: Dict[Tuple[int, int, int, int, int, str], Dict[str, Any]] = {}
+
+
+def _rule_entry(index: int, outcome_index: int, value: int, driver: int, conductor: int, matched: str) -> Dict[str, Any]:
+    """Followed (outcome_index >= 0) or contradicted (-1) entry of name rule index"""
+    key = (index, outcome_index, value, driver, conductor, matched)
+    entry = _ENTRIES.get(key)
+    if entry is None:
+        rule = NAME_RULES[index]
+        outcome = rule["outcomes"][outcome_index] if outcome_index >= 0 else rule["otherwise"]
+        description = outcome["description"].format(value=value, driver=driver, conductor=conductor, matched=matched)
+        entry = {"rule": rule["rule"], "description": description, "status": outcome["status"]}
+        if "severity" in outcome:
+            entry["severity"] = outcome["severity"]
+        _ENTRIES[key] = entry
+    return entry
+
+
+@lru_cache(maxsize=RULE_CACHE_SIZE)
+def evaluate_name_rules(
+    present_mask: int,
+    missing_mask: int,
+    driver: int,
+    conductor: int,
+    bad_bits: int,
+    first_name_value: int,
+    full_name_value: int
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Followed and contradicted name rules of a profile (presence masks, driver,
+    conductor and bad numbers as value bits) and name values. Results are
+    cached and shared, so they must be treated as read-only.
+
+    Raises:
+        ValueError: if a name value is not a digital root (0-9)
+    """
+    if not (0 <= first_name_value <= 9 and 0 <= full_name_value <= 9):
+        raise ValueError(f"Name values must be between 0 and 9, got {first_name_value} and {full_name_value}")
+    followed = []
+    contradicted = []
+    applicable = NAME_RULE_SET.applicable(present_mask, driver, conductor, missing_mask)
+    for index, (name, outcomes, _) in enumerate(_NAME_OUTCOMES):
+        if not applicable >> index & 1:
+            continue
+        value = first_name_value if name == "first" else full_name_value
+        matched = NAME_RULE_SET.matched(index, present_mask, missing_mask) if index in _MATCHING_RULES else ""
+        for outcome_index, (accepted, _) in enumerate(outcomes):
+            if accepted(driver, conductor, bad_bits) >> value & 1:
+                followed.append(_rule_entry(index, outcome_index, value, driver, conductor, matched))
+                break
+        else:
+            contradicted.append(_rule_entry(index, -1, value, driver, conductor, matched))
+    return followed, contradicted
+
+
+def rule_cache_stats() -> Dict[str, Any]:
+    """Hit and miss counts of the name rule cache"""
+    info = evaluate_name_rules.cache_info()
+    return {"size": info.currsize, "max_size": info.maxsize, "hits": info.hits, "misses": info.misses}
+
+
+def _bad_bits(driver: int, conductor: int) -> int:
+    """Bad numbers of a driver and conductor (their non-friends) as value bits"""
+    return _NON_FRIEND_BITS.get(driver, 0) | _NON_FRIEND_BITS.get(conductor, 0)
+
+
+def evaluate_name_rules_batch(
+    present_masks: Any,
+    drivers: Any,
+    conductors: Any,
+    first_name_values: Any,
+    full_name_values: Any
+) -> Dict[str, Any]:
+    """
+    Evaluate the name rules for arrays of profiles, with bad numbers derived
+    from the driver and conductor as in calculate_lucky_bad_neutral_numbers.
+
+    Returns:
+        Dictionary of uint16 arrays "followed" and "contradicted", with bit i
+        set when NAME_RULES[i] is followed / contradicted
+    """
+    # Imported here so that the app does not pay for NumPy at startup
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("NumPy is required for batch rule evaluation: pip install numpy") from None
+
+    masks = np.asarray(present_masks, dtype=np.int64)
+    pairs = np.asarray(drivers, dtype=np.int64) * 10 + np.asarray(conductors, dtype=np.int64)
+    values = {
+        "first": np.asarray(first_name_values, dtype=np.int64),
+        "full": np.asarray(full_name_values, dtype=np.int64)
+    }
+
+    # Lookup tables indexed by presence mask and by driver * 10 + conductor
+    grid_table = np.array(NAME_RULE_SET.grid_bits, dtype=np.int64)
+    number_table = np.zeros(100, dtype=np.int64)
+    accepted_tables = np.zeros((len(NAME_RULES), 100), dtype=np.int64)
+    for (driver, conductor), bits in NAME_RULE_SET.number_bits.items():
+        number_table[driver * 10 + conductor] = bits
+        bad = _bad_bits(driver, conductor)
+        for index, (_, outcomes, _) in enumerate(_NAME_OUTCOMES):
+            for accepted, _ in outcomes:
+                accepted_tables[index, driver * 10 + conductor] |= accepted(driver, conductor, bad)
+
+    for name, array in values.items():
+        if array.size and (array.min() < 0 or array.max() > 9):
+            raise ValueError(f"{name} name values must be between 0 and 9")
+
+    applicable = grid_table[masks] & number_table[pairs]
+    followed = np.zeros(masks.shape, dtype=np.uint16)
+    contradicted = np.zeros(masks.shape, dtype=np.uint16)
+    for index, (name, _, _) in enumerate(_NAME_OUTCOMES):
+        applies = (applicable >> index) & 1
+        passed = (accepted_tables[index][pairs] >> values[name]) & 1
+        followed |= ((applies & passed) << index).astype(np.uint16)
+        contradicted |= ((applies & (1 - passed)) << index).astype(np.uint16)
+    return {"followed": followed, "contradicted": contradicted}
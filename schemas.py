@@ -0,0 +1,142 @@
+"""
+Response models describing the /calculate output
+
+The route returns pre-encoded responses from the response cache, so these
+models are never applied to its output: they only document it in the
+OpenAPI schema. tests/test_schemas.py checks real responses against them.
+"""
+from typing import List, Union
+
+from pydantic import BaseModel
+
+
+class GridCell(BaseModel):
+    """A Loshu grid cell: the number repeated count times when present"""
+    value: Union[str, int]
+    present: bool
+    count: int
+
+
+class Compatibility(BaseModel):
+    """Planet compatibility of a driver or conductor number"""
+    planet: str
+    friends_raw: str
+    friends: List[int]
+    non_friends_raw: str
+    non_friends: List[int]
+    neutral_raw: str
+    neutral: List[int]
+
+
+class LoshuLine(BaseModel):
+    """A complete line or plane of the Loshu grid"""
+    numbers: List[int]
+    name: str
+    description: str
+    type: str
+
+
+class LoshuLines(BaseModel):
+    """Complete Loshu lines by type"""
+    diagonal: List[LoshuLine]
+    vertical: List[LoshuLine]
+    horizontal: List[LoshuLine]
+    all: List[LoshuLine]
+
+
+class MissingNumberRemedy(BaseModel):
+    """Part 1 remedy for missing numbers"""
+    condition: str
+    remedy: str
+
+
+class YantraRemedy(BaseModel):
+    """Part 2 Yantra remedy"""
+    remedy: str
+    condition: str
+
+
+class PlanetRemedy(BaseModel):
+    """Part 3 planet remedy for a missing number"""
+    number: int
+    planet: str
+    remedies: List[str]
+
+
+class LuckFactor(BaseModel):
+    """Luck factor of one year"""
+    year: int
+    date: str
+    personal_year: int
+    driver: int
+    combination: str
+    luck_factor: str
+
+
+class LetterValue(BaseModel):
+    """A letter of a name and its value ('-' for spaces)"""
+    letter: str
+    value: Union[int, str]
+
+
+class NameBreakdown(BaseModel):
+    """Letter by letter calculation of a name's value"""
+    breakdown: List[LetterValue]
+    raw_total: int
+    final_value: int
+
+
+class NameRule(BaseModel):
+    """A name numerology rule that is followed"""
+    rule: str
+    description: str
+    status: str
+
+
+class ContradictedNameRule(NameRule):
+    """A name numerology rule that is contradicted"""
+    severity: str
+
+
+class NameAnalysis(BaseModel):
+    """Name numerology analysis"""
+    first_name: str
+    first_name_value: int
+    first_name_breakdown: NameBreakdown
+    full_name: str
+    full_name_value: int
+    full_name_breakdown: NameBreakdown
+    followed_rules: List[NameRule]
+    contradicted_rules: List[ContradictedNameRule]
+    overall_status: str
+
+
+class NumerologyResponse(BaseModel):
+    """Successful /calculate response"""
+    success: bool
+    name: str
+    date_of_birth: str
+    gender: str
+    driver: int
+    conductor: int
+    kua: int
+    loshu_grid: List[List[GridCell]]
+    missing_numbers: List[int]
+    present_numbers: List[int]
+    loshu_lines: LoshuLines
+    driver_compatibility: Compatibility
+    conductor_compatibility: Compatibility
+    lucky_numbers: List[int]
+    bad_numbers: List[int]
+    neutral_numbers: List[int]
+    remedies_part1: List[MissingNumberRemedy]
+    remedies_part2: List[YantraRemedy]
+    remedies_part3: List[PlanetRemedy]
+    luck_factors: List[LuckFactor]
+    name_analysis: NameAnalysis
+
+
+class ErrorResponse(BaseModel):
+    """Failed calculation"""
+    success: bool
+    error: str
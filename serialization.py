@@ -0,0 +1,67 @@
+"""
+JSON serialization backend - orjson when installed, the standard library otherwise
+
+Both backends produce the same compact UTF-8 output as FastAPI's JSONResponse.
+Set NUMEROLOGY_JSON=json to force the standard library backend.
+"""
+import json
+import os
+from typing import Any, Callable
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Reused rather than built per call as json.dumps does for non-default options
+_stdlib_encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"))
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    return _stdlib_encoder.encode(content).encode("utf-8")
+
+
+def _orjson_dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+BACKENDS = {"json": _stdlib_dumps}
+if orjson is not None:
+    BACKENDS["orjson"] = _orjson_dumps
+
+
+def _default_backend() -> str:
+    requested = os.environ.get("NUMEROLOGY_JSON")
+    if requested:
+        if requested not in BACKENDS:
+            raise ValueError(f"JSON backend '{requested}' is not available (choose from {', '.join(BACKENDS)})")
+        return requested
+    return "orjson" if "orjson" in BACKENDS else "json"
+
+
+backend = _default_backend()
+_dumps: Callable[[Any], bytes] = BACKENDS[backend]
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content to compact UTF-8 JSON with the configured backend"""
+    return _dumps(content)
+
+
+def set_backend(name: str) -> None:
+    """Switch the JSON backend used by dumps and FastJSONResponse"""
+    global backend, _dumps
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend '{name}' is not available (choose from {', '.join(BACKENDS)})")
+    backend = name
+    _dumps = BACKENDS[name]
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the configured serialization backend"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,153 @@
+"""
+Production server - preload the shared tables once, then fork uvicorn workers
+
+Usage:
+    python serve.py --workers 4 --port 8000
+
+The parent process imports the app (mapping the date profile table from the
+profile store) and builds the date index, static assets and report template
+before forking, moves a table built in memory into a shared memory segment
+and freezes the garbage collector, so every worker starts with those
+structures already in memory and shares their pages with the parent instead
+of building (or copying) its own. The parent
+binds the listening socket, supervises the workers (restarting any that
+die) and forwards SIGINT / SIGTERM to them for a graceful shutdown.
+
+Configuration (environment, overridden by the command line options):
+    NUMEROLOGY_WORKERS / WEB_CONCURRENCY   worker processes (default: available cores)
+    NUMEROLOGY_PROFILE_STORE               date profile store file (see profile_store.py)
+    NUMEROLOGY_SHARED_DIR                  directory for the shared table segment when
+                                           there is no store (default: anonymous shared memory)
+    HOST / PORT                            listen address (default 0.0.0.0:8000)
+
+Each worker keeps its own caches and metrics, so /metrics and /cache/stats
+report the worker that answered the request.
+"""
+import argparse
+import gc
+import math
+import os
+import signal
+import sys
+import time
+from typing import Dict, List, Optional
+
+import uvicorn
+
+# Seconds a worker must stay up before a crash restarts it immediately
+MIN_WORKER_UPTIME = 1.0
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on, limited by the cgroup CPU quota if there is one"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def default_workers() -> int:
+    value = os.environ.get("NUMEROLOGY_WORKERS") or os.environ.get("WEB_CONCURRENCY")
+    return int(value) if value else available_cpus()
+
+
+def preload(shared_dir: Optional[str] = None):
+    """Import the app and build its shared structures in this (the parent) process"""
+    import main
+    from date_profiles import get_date_profile_table
+
+    get_date_profile_table().share(shared_dir)
+    main.preload()
+
+    # Keep the preloaded objects out of later collections, which would
+    # otherwise write to their pages in every worker
+    gc.collect()
+    gc.freeze()
+    return main.app
+
+
+class Supervisor:
+    """Fork workers serving a shared socket and keep their number constant until stopped"""
+
+    def __init__(self, config: uvicorn.Config, workers: int):
+        self.config = config
+        self.workers = workers
+        self.socket = config.bind_socket()
+        self.children: Dict[int, float] = {}  # pid -> start time
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                uvicorn.Server(self.config).run(sockets=[self.socket])
+            except BaseException:
+                code = 1
+            finally:
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+
+    def stop(self, signum: int, frame) -> None:
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> int:
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        for _ in range(self.workers):
+            self.spawn()
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started = self.children.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            print(f"Worker {pid} exited with status {code}, restarting", file=sys.stderr)
+            if time.monotonic() - started < MIN_WORKER_UPTIME:
+                time.sleep(MIN_WORKER_UPTIME)
+            if not self.stopping:
+                self.spawn()
+
+        self.socket.close()
+        return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the numerology API with preloaded, shared tables")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"), help="Listen address (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)), help="Listen port (default: 8000)")
+    parser.add_argument("--workers", type=int, default=default_workers(),
+                        help="Worker processes (default: NUMEROLOGY_WORKERS, WEB_CONCURRENCY or available cores)")
+    parser.add_argument("--shared-dir", default=os.environ.get("NUMEROLOGY_SHARED_DIR"),
+                        help="Directory for the shared table segment (default: anonymous shared memory)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    app = preload(args.shared_dir)
+    print(f"Preloaded tables in {time.perf_counter() - start:.2f}s, starting {args.workers} workers", file=sys.stderr)
+
+    config = uvicorn.Config(app, host=args.host, port=args.port)
+    return Supervisor(config, max(1, args.workers)).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
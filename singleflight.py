@@ -0,0 +1,75 @@
+"""
+Single-flight request coalescing - concurrent identical calls share one computation
+
+SingleFlight.run(key, fn, *args) runs fn(*args) for the first caller of a
+key. Callers that arrive with the same key while it is still running await
+that same computation instead of starting their own, so a burst of N
+identical requests costs one calculation.
+
+By default the first caller runs fn inline on the event loop, after yielding
+to the loop once so that requests already scheduled on it can reach the key
+and join. With offload=True fn runs in the loop's default executor instead,
+which keeps the loop free to serve other requests meanwhile.
+
+Waiters are shielded from each other: a cancelled caller (e.g. a client that
+disconnected) does not cancel the computation the others are waiting for.
+Results are shared between callers and must be treated as read-only.
+"""
+import asyncio
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one call of fn"""
+
+    def __init__(self, offload: bool = False):
+        self.offload = offload
+        self._flights: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, fn: Callable[..., T], *args: Any) -> T:
+        """Result of fn(*args), shared with every concurrent call for the same key"""
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(flight)
+
+        self.calls += 1
+        loop = asyncio.get_running_loop()
+        if self.offload:
+            flight = loop.run_in_executor(None, fn, *args)
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._land(key, done))
+            return await asyncio.shield(flight)
+
+        flight = self._flights[key] = loop.create_future()
+        cancelled = False
+        try:
+            # Let requests already scheduled on the loop reach this key and join
+            await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            cancelled = True
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            flight.set_exception(e)
+            flight.exception()  # retrieved here even when nobody joined
+            raise
+        else:
+            flight.set_result(result)
+        finally:
+            self._land(key, flight)
+        if cancelled:
+            raise asyncio.CancelledError()
+        return result
+
+    def _land(self, key: Hashable, flight: "asyncio.Future[Any]") -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Computations started, calls that joined one already in flight, and computations running"""
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._flights)}
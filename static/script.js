@@ -701,7 +701,7 @@ function populateNameNumerology(nameAnalysis) {
 
 /**
  * Export results to PDF
- * Uses jsPDF and jsPDF-AutoTable libraries
+ * The report is rendered by the server (/report/pdf) and downloaded
  */
 async function exportToPDF() {
     if (!currentNumerologyData) {
@@ -709,571 +709,37 @@ async function exportToPDF() {
         return;
     }
 
+    const data = currentNumerologyData;
     try {
-        const { jsPDF } = window.jspdf;
-        const doc = new jsPDF();
-
-        const data = currentNumerologyData;
-        let yPos = 20;
-
-        // Title
-        doc.setFontSize(20);
-        doc.setTextColor(102, 126, 234);
-        doc.text('Numerology Report', 105, yPos, { align: 'center' });
-        yPos += 15;
-
-        // ========== 1. Personal Information ==========
-        doc.setFontSize(12);
-        doc.setTextColor(0, 0, 0);
-        doc.text(`Name: ${data.name}`, 20, yPos);
-        yPos += 8;
-        doc.text(`Date of Birth: ${new Date(data.date_of_birth).toLocaleDateString('en-US', {
-            year: 'numeric', month: 'long', day: 'numeric'
-        })}`, 20, yPos);
-        yPos += 8;
-        doc.text(`Gender: ${data.gender.charAt(0).toUpperCase() + data.gender.slice(1)}`, 20, yPos);
-        yPos += 15;
-
-        // ========== 2. Loshu Grid Section ==========
-        if (yPos > 200) {
-            doc.addPage();
-            yPos = 20;
-        }
-
-        doc.setFontSize(14);
-        doc.setTextColor(102, 126, 234);
-        doc.text('Your Personalized Loshu Grid', 20, yPos);
-        yPos += 12;
-
-        // Draw Loshu Grid as a table with custom rendering for count
-        if (data.loshu_grid) {
-            const gridData = [];
-            data.loshu_grid.forEach(row => {
-                const rowData = row.map(cell => {
-                    // Return base number only, we'll add count in didDrawCell
-                    return cell.value.toString().charAt(0);
-                });
-                gridData.push(rowData);
-            });
-
-            doc.autoTable({
-                startY: yPos,
-                body: gridData,
-                theme: 'grid',
-                styles: {
-                    fontSize: 18,
-                    cellWidth: 20,
-                    cellPadding: 8,
-                    halign: 'center',
-                    valign: 'middle',
-                    fontStyle: 'bold'
-                },
-                columnStyles: {
-                    0: { cellWidth: 20 },
-                    1: { cellWidth: 20 },
-                    2: { cellWidth: 20 }
-                },
-                margin: { left: 75 },
-                didParseCell: function(cellData) {
-                    const rowIndex = cellData.row.index;
-                    const colIndex = cellData.column.index;
-
-                    // Get the original cell data from loshu_grid
-                    const originalCell = data.loshu_grid[rowIndex] && data.loshu_grid[rowIndex][colIndex];
-
-                    // Check if cell is present based on original data
-                    if (originalCell && originalCell.present) {
-                        // Present numbers - golden/amber color
-                        cellData.cell.styles.fillColor = [255, 243, 205];  // Light gold
-                        cellData.cell.styles.textColor = [180, 83, 9];     // Dark amber
-                        cellData.cell.styles.lineColor = [251, 191, 36];   // Gold border
-                        cellData.cell.styles.lineWidth = 0.5;
-                    } else {
-                        // Missing numbers - gray color
-                        cellData.cell.styles.fillColor = [243, 244, 246];  // Light gray
-                        cellData.cell.styles.textColor = [156, 163, 175];  // Medium gray
-                        cellData.cell.styles.lineColor = [209, 213, 219];  // Gray border
-                        cellData.cell.styles.lineWidth = 0.3;
-                    }
-                },
-                didDrawCell: function(cellData) {
-                    // Add tiny multiplication count in top-right corner
-                    const rowIndex = cellData.row.index;
-                    const colIndex = cellData.column.index;
-                    const originalCell = data.loshu_grid[rowIndex] && data.loshu_grid[rowIndex][colIndex];
-
-                    if (originalCell && originalCell.present && originalCell.count > 1) {
-                        // Draw tiny "×N" in top-right corner
-                        doc.setFontSize(7);
-                        doc.setTextColor(180, 83, 9);
-                        doc.text(
-                            `×${originalCell.count}`,
-                            cellData.cell.x + cellData.cell.width - 4,
-                            cellData.cell.y + 4,
-                            { align: 'right' }
-                        );
-                    }
-                }
-            });
-
-            yPos = doc.lastAutoTable.finalY + 15;
-        }
-
-        // ========== 3. Driver, Conductor, Kua Numbers ==========
-        doc.setFontSize(14);
-        doc.setTextColor(102, 126, 234);
-        doc.text('Your Numbers', 20, yPos);
-        yPos += 10;
-
-        doc.setFontSize(11);
-        doc.setTextColor(0, 0, 0);
-        doc.text(`Driver Number: ${data.driver}`, 20, yPos);
-        yPos += 7;
-        doc.text(`Conductor Number: ${data.conductor}`, 20, yPos);
-        yPos += 7;
-        doc.text(`Kua Number: ${data.kua}`, 20, yPos);
-        yPos += 15;
-
-        // ========== 4. Present and Missing Numbers ==========
-        doc.setFontSize(11);
-        doc.setTextColor(75, 175, 80);
-        doc.text('Numbers Present in Your Life:', 20, yPos);
-        doc.setTextColor(0, 0, 0);
-        doc.text(data.present_numbers.join(', '), 90, yPos);
-        yPos += 8;
-
-        if (data.missing_numbers.length > 0) {
-            doc.setTextColor(244, 67, 54);
-            doc.text('Missing Numbers:', 20, yPos);
-            doc.setTextColor(0, 0, 0);
-            doc.text(data.missing_numbers.join(', '), 90, yPos);
-            yPos += 15;
-        }
-
-        // ========== 5. Number Compatibility ==========
-        if (yPos > 200) {
-            doc.addPage();
-            yPos = 20;
-        }
-
-        doc.setFontSize(14);
-        doc.setTextColor(102, 126, 234);
-        doc.text('Number Compatibility', 20, yPos);
-        yPos += 12;
-
-        // Driver Compatibility
-        if (data.driver_compatibility) {
-            doc.setFontSize(12);
-            doc.setTextColor(102, 126, 234);
-            doc.text(`Driver Number ${data.driver}`, 20, yPos);
-            yPos += 6;
-            doc.setFontSize(10);
-            doc.setTextColor(100, 100, 100);
-            doc.setFont(undefined, 'italic');
-            doc.text(data.driver_compatibility.planet || '', 20, yPos);
-            doc.setFont(undefined, 'normal');
-            yPos += 8;
-
-            doc.setFontSize(10);
-            doc.setTextColor(75, 175, 80);
-            doc.text('Friends:', 25, yPos);
-            doc.setTextColor(0, 0, 0);
-            doc.text(data.driver_compatibility.friends_raw || '', 50, yPos);
-            yPos += 6;
-
-            doc.setTextColor(244, 67, 54);
-            doc.text('Non-Friends:', 25, yPos);
-            doc.setTextColor(0, 0, 0);
-            doc.text(data.driver_compatibility.non_friends_raw || 'None', 55, yPos);
-            yPos += 6;
-
-            doc.setTextColor(255, 152, 0);
-            doc.text('Neutral:', 25, yPos);
-            doc.setTextColor(0, 0, 0);
-            doc.text(data.driver_compatibility.neutral_raw || '', 50, yPos);
-            yPos += 12;
-        }
-
-        // Conductor Compatibility
-        if (data.conductor_compatibility) {
-            doc.setFontSize(12);
-            doc.setTextColor(102, 126, 234);
-            doc.text(`Conductor Number ${data.conductor}`, 20, yPos);
-            yPos += 6;
-            doc.setFontSize(10);
-            doc.setTextColor(100, 100, 100);
-            doc.setFont(undefined, 'italic');
-            doc.text(data.conductor_compatibility.planet || '', 20, yPos);
-            doc.setFont(undefined, 'normal');
-            yPos += 8;
-
-            doc.setFontSize(10);
-            doc.setTextColor(75, 175, 80);
-            doc.text('Friends:', 25, yPos);
-            doc.setTextColor(0, 0, 0);
-            doc.text(data.conductor_compatibility.friends_raw || '', 50, yPos);
-            yPos += 6;
-
-            doc.setTextColor(244, 67, 54);
-            doc.text('Non-Friends:', 25, yPos);
-            doc.setTextColor(0, 0, 0);
-            doc.text(data.conductor_compatibility.non_friends_raw || 'None', 55, yPos);
-            yPos += 6;
-
-            doc.setTextColor(255, 152, 0);
-            doc.text('Neutral:', 25, yPos);
-            doc.setTextColor(0, 0, 0);
-            doc.text(data.conductor_compatibility.neutral_raw || '', 50, yPos);
-            yPos += 15;
-        }
-
-        // ========== 6. Number Summary (Lucky, Bad, Neutral) ==========
-        if (yPos > 230) {
-            doc.addPage();
-            yPos = 20;
-        }
-
-        doc.setFontSize(14);
-        doc.setTextColor(102, 126, 234);
-        doc.text('Number Summary', 20, yPos);
-        yPos += 10;
-
-        doc.setFontSize(11);
-        doc.setTextColor(75, 175, 80);
-        doc.text('Lucky Numbers:', 20, yPos);
-        doc.setTextColor(0, 0, 0);
-        doc.text(data.lucky_numbers.join(', ') || 'None', 70, yPos);
-        yPos += 7;
-
-        doc.setTextColor(244, 67, 54);
-        doc.text('Bad Numbers:', 20, yPos);
-        doc.setTextColor(0, 0, 0);
-        doc.text(data.bad_numbers.join(', ') || 'None', 70, yPos);
-        yPos += 7;
-
-        doc.setTextColor(255, 152, 0);
-        doc.text('Neutral Numbers:', 20, yPos);
-        doc.setTextColor(0, 0, 0);
-        doc.text(data.neutral_numbers.join(', ') || 'None', 70, yPos);
-        yPos += 15;
-
-        // ========== 7. Complete Lines in Your Loshu Grid ==========
-        if (data.loshu_lines && data.loshu_lines.all && data.loshu_lines.all.length > 0) {
-            if (yPos > 200) {
-                doc.addPage();
-                yPos = 20;
-            }
-
-            doc.setFontSize(14);
-            doc.setTextColor(102, 126, 234);
-            doc.text('Complete Lines in Your Loshu Grid', 20, yPos);
-            yPos += 10;
-
-            const linesData = [];
-            data.loshu_lines.all.forEach(line => {
-                const typeLabel = line.type.charAt(0).toUpperCase() + line.type.slice(1);
-                const numbersStr = line.numbers.join('-');
-                linesData.push([
-                    typeLabel,
-                    numbersStr,
-                    line.name,
-                    line.description
-                ]);
-            });
-
-            doc.autoTable({
-                startY: yPos,
-                head: [['Type', 'Numbers', 'Line Name', 'Description']],
-                body: linesData,
-                theme: 'striped',
-                styles: {
-                    fontSize: 9,
-                    cellPadding: 4
-                },
-                headStyles: {
-                    fillColor: [102, 126, 234],
-                    textColor: [255, 255, 255],
-                    fontStyle: 'bold'
-                },
-                columnStyles: {
-                    0: { cellWidth: 25, fontStyle: 'bold' },
-                    1: { cellWidth: 20, halign: 'center' },
-                    2: { cellWidth: 55 },
-                    3: { cellWidth: 85 }
-                },
-                didParseCell: function(cellData) {
-                    // Color code by type
-                    if (cellData.section === 'body' && cellData.column.index === 0) {
-                        const type = cellData.cell.raw.toLowerCase();
-                        if (type === 'diagonal') {
-                            cellData.cell.styles.textColor = [146, 64, 14];  // Amber
-                        } else if (type === 'vertical') {
-                            cellData.cell.styles.textColor = [30, 64, 175];  // Blue
-                        } else if (type === 'horizontal') {
-                            cellData.cell.styles.textColor = [6, 95, 70];    // Green
-                        }
-                    }
-                }
-            });
-
-            yPos = doc.lastAutoTable.finalY + 15;
-        }
-
-        // ========== 8. Remedies for Missing Numbers ==========
-        // Remedies Part 1
-        if (yPos > 230) {
-            doc.addPage();
-            yPos = 20;
-        }
-
-        doc.setFontSize(14);
-        doc.setTextColor(102, 126, 234);
-        doc.text('Remedies for Missing Numbers', 20, yPos);
-        yPos += 8;
-        doc.setFontSize(10);
-        doc.setFont(undefined, 'italic');
-        doc.setTextColor(100, 100, 100);
-        doc.text('Part 1: Based on your Loshu Grid', 20, yPos);
-        doc.setFont(undefined, 'normal');
-        yPos += 10;
-
-        if (data.remedies_part1 && data.remedies_part1.length > 0) {
-            doc.setFontSize(10);
-            doc.setTextColor(0, 0, 0);
-
-            data.remedies_part1.forEach(remedy => {
-                if (yPos > 270) {
-                    doc.addPage();
-                    yPos = 20;
-                }
-
-                doc.setFont(undefined, 'bold');
-                doc.setTextColor(211, 47, 47);
-                const conditionText = `If ${remedy.condition}`.toUpperCase();
-                doc.text(conditionText, 20, yPos);
-                yPos += 5;
-                doc.setFont(undefined, 'normal');
-                doc.setTextColor(0, 0, 0);
-                const remedyLines = doc.splitTextToSize(remedy.remedy, 170);
-                doc.text(remedyLines, 20, yPos);
-                yPos += (remedyLines.length * 5) + 8;
-            });
-        } else {
-            doc.setTextColor(0, 105, 92);
-            doc.text('No missing numbers! Your Loshu Grid is complete.', 20, yPos);
-            yPos += 10;
-        }
-
-        // Remedies Part 2
-        if (yPos > 230) {
-            doc.addPage();
-            yPos = 20;
-        }
-
-        doc.setFontSize(10);
-        doc.setFont(undefined, 'italic');
-        doc.setTextColor(100, 100, 100);
-        doc.text('Part 2: Yantra-Based Remedies', 20, yPos);
-        doc.setFont(undefined, 'normal');
-        yPos += 10;
-
-        if (data.remedies_part2 && data.remedies_part2.length > 0) {
-            doc.setFontSize(10);
-            doc.setTextColor(0, 0, 0);
-
-            data.remedies_part2.forEach(remedy => {
-                if (yPos > 270) {
-                    doc.addPage();
-                    yPos = 20;
-                }
-
-                doc.setFont(undefined, 'bold');
-                doc.setTextColor(211, 47, 47);
-                doc.text(remedy.remedy.toUpperCase(), 20, yPos);
-                yPos += 5;
-                doc.setFont(undefined, 'normal');
-                doc.setTextColor(0, 0, 0);
-                const conditionLines = doc.splitTextToSize(`Condition: ${remedy.condition}`, 170);
-                doc.text(conditionLines, 20, yPos);
-                yPos += (conditionLines.length * 5) + 8;
-            });
-        } else {
-            doc.setTextColor(0, 105, 92);
-            doc.text('No Yantra-based remedies applicable.', 20, yPos);
-            yPos += 10;
-        }
-
-        // Remedies Part 3
-        if (yPos > 200) {
-            doc.addPage();
-            yPos = 20;
-        }
-
-        doc.setFontSize(10);
-        doc.setFont(undefined, 'italic');
-        doc.setTextColor(100, 100, 100);
-        doc.text('Part 3: Planet-Based Remedies (Tabular Format)', 20, yPos);
-        doc.setFont(undefined, 'normal');
-        yPos += 10;
-
-        if (data.remedies_part3 && data.remedies_part3.length > 0) {
-            const remediesTableData = data.remedies_part3.map(item => [
-                item.number.toString(),
-                item.planet,
-                item.remedies.join('\n• ')
-            ]);
-
-            doc.autoTable({
-                startY: yPos,
-                head: [['No.', 'Planet', 'Remedy / Action']],
-                body: remediesTableData,
-                theme: 'striped',
-                headStyles: {
-                    fillColor: [102, 126, 234],
-                    fontSize: 10,
-                    fontStyle: 'bold'
-                },
-                columnStyles: {
-                    0: { cellWidth: 20, halign: 'center', fontStyle: 'bold', textColor: [102, 126, 234] },
-                    1: { cellWidth: 35, fontStyle: 'bold' },
-                    2: { cellWidth: 125 }
-                },
-                styles: {
-                    fontSize: 9,
-                    cellPadding: 5
-                },
-                margin: { left: 20, right: 20 }
-            });
-
-            yPos = doc.lastAutoTable.finalY + 15;
-        } else {
-            doc.setTextColor(0, 105, 92);
-            doc.text('No missing numbers! No planet-based remedies needed.', 20, yPos);
-            yPos += 15;
-        }
-
-        // ========== 10. Luck Factor - Next 6 Years ==========
-        if (data.luck_factors && data.luck_factors.length > 0) {
-            if (yPos > 200) {
-                doc.addPage();
-                yPos = 20;
-            }
-
-            doc.setFontSize(14);
-            doc.setTextColor(102, 126, 234);
-            doc.text('Luck Factor - Next 6 Years', 20, yPos);
-            yPos += 10;
-
-            // Create table data
-            const tableData = data.luck_factors.map(item => [
-                item.year,
-                item.date,
-                item.combination,
-                item.luck_factor
-            ]);
-
-            doc.autoTable({
-                startY: yPos,
-                head: [['Year', 'Date', 'PY, D', 'Luck Factor']],
-                body: tableData,
-                theme: 'striped',
-                headStyles: { fillColor: [102, 126, 234] },
-                margin: { left: 20, right: 20 }
-            });
-
-            yPos = doc.lastAutoTable.finalY + 15;
-        }
-
-        // ========== 11. Name Numerology Analysis ==========
-        if (data.name_analysis) {
-            if (yPos > 220) {
-                doc.addPage();
-                yPos = 20;
-            }
-
-            doc.setFontSize(14);
-            doc.setTextColor(102, 126, 234);
-            doc.text('Name Numerology Analysis', 20, yPos);
-            yPos += 12;
-
-            doc.setFontSize(11);
-            doc.setTextColor(0, 0, 0);
-            doc.text('First Name: ' + data.name_analysis.first_name + ' = ' + data.name_analysis.first_name_value, 20, yPos);
-            yPos += 8;
-            doc.text('Full Name: ' + data.name_analysis.full_name + ' = ' + data.name_analysis.full_name_value, 20, yPos);
-            yPos += 12;
-
-            // Followed rules - using direct text rendering for proper formatting
-            if (data.name_analysis.followed_rules && data.name_analysis.followed_rules.length > 0) {
-                if (yPos > 230) {
-                    doc.addPage();
-                    yPos = 20;
-                }
-
-                doc.setFontSize(12);
-                doc.setFont(undefined, 'bold');
-                doc.setTextColor(75, 175, 80);
-                doc.text('Rules Followed:', 20, yPos);
-                doc.setFont(undefined, 'normal');
-                yPos += 10;
-
-                doc.setFontSize(10);
-                doc.setTextColor(0, 0, 0);
-
-                data.name_analysis.followed_rules.forEach(rule => {
-                    if (yPos > 270) {
-                        doc.addPage();
-                        yPos = 20;
-                    }
-
-                    // Split text to handle long descriptions
-                    const ruleText = doc.splitTextToSize('- ' + rule.description, 165);
-                    doc.text(ruleText, 25, yPos);
-                    yPos += (ruleText.length * 5) + 3;
-                });
-
-                yPos += 5;
-            }
+        const response = await fetch('/report/pdf', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                name: data.name,
+                date_of_birth: data.date_of_birth,
+                gender: data.gender
+            })
+        });
 
-            // Contradicted rules - using direct text rendering for proper formatting
-            if (data.name_analysis.contradicted_rules && data.name_analysis.contradicted_rules.length > 0) {
-                if (yPos > 230) {
-                    doc.addPage();
-                    yPos = 20;
-                }
-
-                doc.setFontSize(12);
-                doc.setFont(undefined, 'bold');
-                doc.setTextColor(244, 67, 54);
-                doc.text('Rules Contradicted:', 20, yPos);
-                doc.setFont(undefined, 'normal');
-                yPos += 10;
-
-                doc.setFontSize(10);
-                doc.setTextColor(0, 0, 0);
-
-                data.name_analysis.contradicted_rules.forEach(rule => {
-                    if (yPos > 270) {
-                        doc.addPage();
-                        yPos = 20;
-                    }
-
-                    // Split text to handle long descriptions
-                    const ruleText = doc.splitTextToSize('- ' + rule.description, 165);
-                    doc.text(ruleText, 25, yPos);
-                    yPos += (ruleText.length * 5) + 3;
-                });
-
-                yPos += 5;
-            }
+        if (!response.ok || !response.headers.get('Content-Type').startsWith('application/pdf')) {
+            const error = await response.json().catch(() => ({}));
+            throw new Error(error.error || 'Report could not be generated');
         }
 
         // Save the PDF
-        const fileName = `Numerology_${data.name.replace(/\s+/g, '_')}_${new Date().toISOString().split('T')[0]}.pdf`;
-        doc.save(fileName);
+        const blob = await response.blob();
+        const link = document.createElement('a');
+        link.href = URL.createObjectURL(blob);
+        link.download = `Numerology_${data.name.replace(/\s+/g, '_')}_${new Date().toISOString().split('T')[0]}.pdf`;
+        document.body.appendChild(link);
+        link.click();
+        link.remove();
+        URL.revokeObjectURL(link.href);
 
     } catch (error) {
         console.error('PDF Export Error:', error);
-        alert('Failed to export PDF. Please make sure you have an internet connection.');
+        alert(`Failed to export PDF: ${error.message}`);
     }
 }
@@ -0,0 +1,202 @@
+"""
+In-memory page and static assets with ETags and precompressed variants
+
+index.html and the files in static/ are read once. Each asset gets a strong
+ETag and a content-hashed URL (static/styles.<hash>.css) that can be cached
+forever; index.html is rewritten to reference those URLs and is revalidated
+with its ETag. gzip variants (and brotli, when the brotli package is
+installed) are built at load time. Set NUMEROLOGY_RELOAD_STATIC=1 to reload
+files that changed on disk, for development.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from typing import Dict, Mapping, Optional, Tuple
+
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+INDEX_PATH = "index.html"
+STATIC_DIR = "static"
+RELOAD = os.environ.get("NUMEROLOGY_RELOAD_STATIC", "") == "1"
+
+# Cache-Control for hashed (immutable) asset URLs and for revalidated resources
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Variants smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 256
+
+_STATIC_REFERENCE = re.compile(r'((?:href|src)=")/?static/([^"?#]+)(")')
+
+
+def hashed_name(name: str, digest: str) -> str:
+    """styles.css -> styles.<digest>.css"""
+    root, ext = os.path.splitext(name)
+    return f"{root}.{digest}{ext}"
+
+
+class Asset:
+    """A file held in memory with its ETag and compressed variants"""
+
+    def __init__(self, path: str, content: bytes, content_type: str):
+        self.path = path
+        self.content_type = content_type
+        self.mtime = os.path.getmtime(path)
+        self.digest = hashlib.sha256(content).hexdigest()[:16]
+        self.etag = f'"{self.digest}"'
+        # encoding -> (body, etag); strong ETags differ per representation
+        self.variants: Dict[str, Tuple[bytes, str]] = {"identity": (content, self.etag)}
+        if len(content) >= MIN_COMPRESS_SIZE:
+            compressed = gzip.compress(content, compresslevel=9, mtime=0)
+            if len(compressed) < len(content):
+                self.variants["gzip"] = (compressed, f'"{self.digest}-gzip"')
+            if brotli is not None:
+                compressed = brotli.compress(content, quality=11)
+                if len(compressed) < len(content):
+                    self.variants["br"] = (compressed, f'"{self.digest}-br"')
+        self.etags = frozenset(etag for _, etag in self.variants.values())
+
+    def stale(self) -> bool:
+        try:
+            return os.path.getmtime(self.path) != self.mtime
+        except OSError:
+            return True
+
+    def select(self, accept_encoding: str) -> Tuple[str, bytes, str]:
+        """Choose the (encoding, body, etag) to send for an Accept-Encoding header"""
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self.variants:
+                body, etag = self.variants[encoding]
+                return encoding, body, etag
+        body, etag = self.variants["identity"]
+        return "identity", body, etag
+
+    def not_modified(self, if_none_match: Optional[str]) -> bool:
+        """True when an If-None-Match header matches any representation of the asset"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag in self.etags:
+                return True
+        return False
+
+
+def _accepted_encodings(header: str) -> frozenset:
+    encodings = set()
+    for part in header.split(","):
+        encoding, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q=") and params[2:] in ("0", "0.0", "0.00", "0.000"):
+            continue
+        encodings.add(encoding.strip().lower())
+    return frozenset(encodings)
+
+
+class AssetStore:
+    """index.html and the static directory, loaded into memory"""
+
+    def __init__(self, index_path: str = INDEX_PATH, static_dir: str = STATIC_DIR, reload: bool = RELOAD):
+        self.index_path = index_path
+        self.static_dir = static_dir
+        self.reload = reload
+        self.index: Optional[Asset] = None
+        # URL name (plain and hashed) -> (asset, immutable)
+        self.assets: Dict[str, Tuple[Asset, bool]] = {}
+        self.load()
+
+    def load(self) -> None:
+        assets: Dict[str, Tuple[Asset, bool]] = {}
+        hashed: Dict[str, str] = {}
+        if os.path.isdir(self.static_dir):
+            for root, _, files in os.walk(self.static_dir):
+                for filename in sorted(files):
+                    path = os.path.join(root, filename)
+                    name = os.path.relpath(path, self.static_dir).replace(os.sep, "/")
+                    with open(path, "rb") as f:
+                        asset = Asset(path, f.read(), mimetypes.guess_type(path)[0] or "application/octet-stream")
+                    hashed[name] = hashed_name(name, asset.digest)
+                    assets[name] = (asset, False)
+                    assets[hashed[name]] = (asset, True)
+        self.assets = assets
+        self.hashed_names = hashed
+
+        self.index = None
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                html = f.read()
+            self.index = Asset(self.index_path, self.rewrite_urls(html).encode("utf-8"), "text/html")
+
+    def rewrite_urls(self, html: str) -> str:
+        """Point static/... references at the content-hashed URLs"""
+        def replace(match):
+            name = self.hashed_names.get(match.group(2))
+            if name is None:
+                return match.group(0)
+            return f"{match.group(1)}static/{name}{match.group(3)}"
+        return _STATIC_REFERENCE.sub(replace, html)
+
+    def _check_reload(self) -> None:
+        if self.index is not None and self.index.stale():
+            self.load()
+            return
+        if self.index is None and os.path.exists(self.index_path):
+            self.load()
+            return
+        for asset, immutable in self.assets.values():
+            if not immutable and asset.stale():
+                self.load()
+                return
+
+    def get_index(self) -> Optional[Asset]:
+        if self.reload:
+            self._check_reload()
+        return self.index
+
+    def get_static(self, name: str) -> Optional[Tuple[Asset, bool]]:
+        """Return (asset, immutable) for a plain or hashed static file name"""
+        if self.reload:
+            self._check_reload()
+        return self.assets.get(name)
+
+
+_store: Optional[AssetStore] = None
+_store_lock = threading.Lock()
+
+
+def get_asset_store() -> AssetStore:
+    """The shared asset store, loaded on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = AssetStore()
+    return _store
+
+
+def asset_response(asset: Asset, request_headers: Mapping[str, str], cache_control: str) -> Response:
+    """Response for an asset, negotiating the encoding and answering 304 to a matching If-None-Match"""
+    encoding, body, etag = asset.select(request_headers.get("accept-encoding", ""))
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding"
+    }
+    if asset.not_modified(request_headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=asset.content_type, headers=headers)
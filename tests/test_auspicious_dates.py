@@ -0,0 +1,22 @@
+"""Default date range of /dates/auspicious"""
+import pytest
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient  # noqa: E402
+
+from main import app  # noqa: E402
+
+
+@pytest.mark.parametrize("start_date, end_date", [
+    ("2024-03-01", "2025-03-01"),
+    ("9999-12-01", "9999-12-31"),
+    ("9999-12-31", "9999-12-31"),
+])
+def test_default_range_is_a_year_clamped_to_the_last_date(start_date, end_date):
+    response = TestClient(app).post("/dates/auspicious", json={"token": "19900515m", "start_date": start_date})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is True
+    assert (body["start_date"], body["end_date"]) == (start_date, end_date)
+    assert body["dates"]
+    assert all(start_date <= entry["date"] <= end_date for entry in body["dates"])
@@ -0,0 +1,125 @@
+"""Splitting streamed batch bodies into records"""
+import asyncio
+import json
+
+import pytest
+
+from batch import MAX_RECORD_SIZE, RecordSplitter, _MALFORMED, _OVERSIZED
+
+RECORDS = [
+    {"name": "John Doe", "date_of_birth": "1990-05-15", "gender": "male"},
+    {"name": "Zoë \"Z\" Ångström, \\ 日本", "date_of_birth": "1985-11-02", "gender": "female"},
+    {"name": "[Ram] {x}", "date_of_birth": "2001-01-01", "gender": "male"},
+]
+
+BODIES = {
+    "ndjson": "\n".join(json.dumps(record, ensure_ascii=False) for record in RECORDS) + "\n",
+    "array": " [" + ", ".join(json.dumps(record, ensure_ascii=False) for record in RECORDS) + "]",
+}
+
+
+def split(body: bytes, chunk_size: int):
+    splitter = RecordSplitter()
+    records = []
+    for start in range(0, len(body), chunk_size):
+        records += splitter.feed(body[start:start + chunk_size])
+    return records + splitter.close()
+
+
+@pytest.mark.parametrize("mode", sorted(BODIES))
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1 << 20])
+def test_chunk_boundaries(mode, chunk_size):
+    # Chunks of 1-3 bytes split the multi-byte UTF-8 sequences and the escapes
+    assert split(BODIES[mode].encode(), chunk_size) == RECORDS
+
+
+def test_ndjson_without_trailing_newline():
+    assert split(BODIES["ndjson"].rstrip("\n").encode(), 5) == RECORDS
+
+
+def test_invalid_utf8_is_replaced():
+    records = split(b'{"name": "A\xff"}\n', 1)
+    assert records == [{"name": "A�"}]
+
+
+@pytest.mark.parametrize("mode", sorted(BODIES))
+@pytest.mark.parametrize("chunk_size", [4096, 1 << 20])
+def test_oversized_record_is_skipped(mode, chunk_size):
+    huge = {"name": "A" * (MAX_RECORD_SIZE + 1), "items": [{"a": "},]"}]}
+    body = [RECORDS[0], huge, RECORDS[1]]
+    if mode == "ndjson":
+        text = "\n".join(json.dumps(record, ensure_ascii=False) for record in body)
+    else:
+        text = "[" + ",".join(json.dumps(record, ensure_ascii=False) for record in body) + "]"
+    assert split(text.encode(), chunk_size) == [RECORDS[0], _OVERSIZED, RECORDS[1]]
+
+
+def test_long_line_is_not_buffered():
+    splitter = RecordSplitter()
+    records = []
+    for _ in range(4000):
+        records += splitter.feed(b"x" * 4096)
+    records += splitter.feed(b"\n" + json.dumps(RECORDS[0]).encode() + b"\n")
+    assert records + splitter.close() == [_OVERSIZED, RECORDS[0]]
+
+
+def test_malformed_records():
+    assert split(b'{"name": \n[1, 2]\n', 4) == [_MALFORMED, [1, 2]]
+    assert split(b'[{"name": "x"}, {"name"', 4) == [{"name": "x"}, _MALFORMED]
+
+
+def test_batch_endpoint_reports_oversized_records():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    from main import app
+
+    body = "\n".join([
+        json.dumps(RECORDS[0]),
+        json.dumps({"name": "A" * (MAX_RECORD_SIZE + 1), "date_of_birth": "1990-05-15", "gender": "male"}),
+        json.dumps(RECORDS[1]),
+    ])
+    response = TestClient(app).post("/calculate/batch", content=body.encode())
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["index"] for line in lines] == [0, 1, 2]
+    assert [line["success"] for line in lines] == [True, False, True]
+    assert str(MAX_RECORD_SIZE) in lines[1]["error"]
+
+
+def call_disconnecting(path, body, more_body=False):
+    """Send the body to the app, then report a client disconnect; return the response body parts"""
+    from main import app
+
+    messages = [{"type": "http.request", "body": body, "more_body": more_body}]
+    parts = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(0)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            parts.append(message["body"])
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"test"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 50000), "server": ("test", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+    return parts
+
+
+def test_streamed_timeline_stops_when_the_client_disconnects():
+    body = json.dumps({"token": "19900515m", "stream": True, "start_year": 1990, "end_year": 2089}).encode()
+    lines = b"".join(call_disconnecting("/luck/timeline", body)).splitlines()
+    assert len(lines) < 100
+
+
+def test_batch_stops_when_the_client_disconnects():
+    # The body is cut off after its first chunk
+    first = (json.dumps(RECORDS[0]) + "\n" + json.dumps(RECORDS[1]) + "\n").encode()
+    lines = b"".join(call_disconnecting("/calculate/batch", first, more_body=True)).splitlines()
+    assert [json.loads(line)["index"] for line in lines] == [0, 1]
@@ -0,0 +1,79 @@
+"""Filters, paging and errors of /dates/query"""
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from date_profiles import compute_date_profile
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient  # noqa: E402
+
+from main import app  # noqa: E402
+
+client = TestClient(app)
+
+
+def query(**body):
+    return client.post("/dates/query", json=body)
+
+
+def matches(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def brute_force(year, gender, keep):
+    """Tokens of the dates of a year whose computed profile passes keep"""
+    tokens = []
+    day = date(year, 1, 1)
+    while day.year == year:
+        profile = compute_date_profile(day.day, day.month, day.year, gender)
+        if keep(profile):
+            tokens.append(f"{day:%Y%m%d}{gender[0]}")
+        day += timedelta(days=1)
+    return tokens
+
+
+@pytest.mark.parametrize("filters, keep", [
+    ({"driver": 5}, lambda p: p["driver"] == 5),
+    ({"driver": [1, 9], "conductor": 3}, lambda p: p["driver"] in (1, 9) and p["conductor"] == 3),
+    ({"present": [5], "missing": [6]}, lambda p: 5 in p["present_numbers"] and 6 in p["missing_numbers"]),
+    ({"lines": ["1-5-9"]}, lambda p: [9, 5, 1] in [line["numbers"] for line in p["loshu_lines"]["all"]]),
+])
+def test_filters_match_computed_profiles(filters, keep):
+    response = query(gender="female", start_year=1990, end_year=1990, limit=1000, **filters)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    tokens = [match["token"] for match in matches(response)]
+    assert tokens == brute_force(1990, "female", keep)
+    assert response.headers["x-total-count"] == str(len(tokens))
+
+
+def test_pages_follow_the_cursor():
+    body = {"driver": 5, "start_year": 1990, "end_year": 1991}
+    everything = matches(query(**body, limit=10000))
+    assert len(everything) > 50
+
+    pages, cursor = [], 0
+    while cursor is not None:
+        response = query(**body, limit=50, cursor=cursor)
+        assert response.headers["x-total-count"] == str(len(everything))
+        page = matches(response)
+        assert 1 <= len(page) <= 50
+        pages += page
+        cursor = response.headers.get("x-next-cursor")
+    assert pages == everything
+
+
+@pytest.mark.parametrize("body", [
+    {"driver": []},
+    {"conductor": [3, 10]},
+    {"kua": 0},
+    {"lines": ["1-2-3"]},
+    {"start_date": "1990-02-30"},
+])
+def test_invalid_queries_are_http_errors(body):
+    response = query(**body)
+    assert response.status_code == 400
+    assert response.json()["success"] is False
+    assert response.json()["error"]
@@ -0,0 +1,35 @@
+"""Regression tests for the fragment-splicing response encoder"""
+import json
+
+import pytest
+
+import serialization
+from batch import encode_line
+from fragments import encode_response
+from numerology import calculate_numerology_result
+from response_cache import make_template, render_template
+
+# Names spelling out the placeholders the encoder used to search for in its output
+NUL_NAMES = ["\x003\x00", "\x00name\x00", "A \x00first_name\x00"]
+
+
+@pytest.fixture(params=sorted(serialization.BACKENDS))
+def backend(request):
+    previous = serialization.backend
+    serialization.set_backend(request.param)
+    yield request.param
+    serialization.set_backend(previous)
+
+
+@pytest.mark.parametrize("name", NUL_NAMES)
+def test_encode_response_matches_plain_encoding(backend, name):
+    result = calculate_numerology_result(name, "1990-05-17", "male")
+    assert encode_response(result) == serialization.dumps(result)
+    assert json.loads(encode_line({"index": 0, **result}))["name"] == name
+
+
+@pytest.mark.parametrize("name", NUL_NAMES)
+def test_cached_template_echoes_name(backend, name):
+    result = calculate_numerology_result(name, "1990-05-17", "male")
+    rendered = json.loads(render_template(make_template(result), name))
+    assert rendered == json.loads(serialization.dumps(result))
@@ -0,0 +1,55 @@
+"""Thread safety of metric updates and the /metrics endpoint"""
+import sys
+import threading
+
+import pytest
+
+import metrics
+
+
+def test_concurrent_updates_are_not_lost():
+    counter = metrics.Counter("test_thread_counter", "Test counter", ("worker",))
+    histogram = metrics.Histogram("test_thread_seconds", "Test histogram", ("worker",))
+    threads, per_thread = 8, 2000
+    errors = []
+
+    def record(worker: str):
+        for i in range(per_thread):
+            counter.inc(worker)
+            counter.inc(f"{worker}-{i % 50}")
+            histogram.observe_ns(1000 + i, worker)
+
+    def render():
+        try:
+            for _ in range(200):
+                counter.collect()
+                histogram.collect()
+        except RuntimeError as e:  # dictionary changed size during iteration
+            errors.append(e)
+
+    workers = [threading.Thread(target=record, args=(str(n),)) for n in range(threads)]
+    workers.append(threading.Thread(target=render))
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads often enough to hit the races
+    try:
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert not errors
+    for n in range(threads):
+        assert counter.value(str(n)) == per_thread
+        assert histogram.count(str(n)) == per_thread
+
+
+def test_metrics_endpoint_content_type():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    from main import app
+
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
@@ -0,0 +1,33 @@
+"""Long names are accepted but kept out of the response and name breakdown caches"""
+import pytest
+
+from name_numerology import MAX_CACHED_NAME_LENGTH, get_name_breakdown, name_cache_stats
+
+LONG_NAME = "Ab " * (MAX_CACHED_NAME_LENGTH // 3 + 1) + "Cd"
+
+
+def test_long_name_breakdown_is_not_cached():
+    size = name_cache_stats()["size"]
+    breakdown = get_name_breakdown(LONG_NAME)
+    assert get_name_breakdown(LONG_NAME) == breakdown
+    assert get_name_breakdown(LONG_NAME) is not breakdown
+    assert name_cache_stats()["size"] == size
+
+
+def test_long_name_is_calculated_but_not_cached():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    from main import app, response_cache
+
+    client = TestClient(app)
+    response_cache.cache.clear()
+    request = {"name": LONG_NAME, "date_of_birth": "1990-05-15", "gender": "male"}
+    for _ in range(2):
+        response = client.post("/calculate", json=request)
+        assert response.status_code == 200
+        assert response.json()["success"] is True
+        assert response.json()["name"] == LONG_NAME
+    assert response_cache.stats()["size"] == 0
+
+    assert client.post("/calculate", json=dict(request, name="John Doe")).json()["success"] is True
+    assert response_cache.stats()["size"] == 1
@@ -0,0 +1,52 @@
+"""Regression tests for name correction suggestions and the name rule engine"""
+import pytest
+
+from date_profiles import get_date_profile
+from name_numerology import suggest_name_corrections
+from rules import evaluate_name_rules
+
+# Short names whose two-edit search used to probe impossible variants with negative totals
+SHORT_NAMES = ["Ae", "Oi", "Ua", "Io", "A e"]
+
+
+@pytest.fixture
+def profile():
+    # Profile token 19900105m
+    return get_date_profile(5, 1, 1990, "male")
+
+
+@pytest.mark.parametrize("name", SHORT_NAMES)
+def test_suggest_short_names(profile, name):
+    suggestions = suggest_name_corrections(
+        name, None,
+        driver=profile["driver"],
+        conductor=profile["conductor"],
+        bad_numbers=profile["bad_numbers"],
+        present_numbers=profile["present_numbers"],
+        missing_numbers=profile["missing_numbers"]
+    )
+    assert suggestions
+    for suggestion in suggestions:
+        assert suggestion["name"].strip()
+        assert 0 <= suggestion["first_name_value"] <= 9
+        assert 0 <= suggestion["full_name_value"] <= 9
+
+
+@pytest.mark.parametrize("name", SHORT_NAMES)
+def test_suggest_endpoint_short_names(name):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    from main import app
+
+    response = TestClient(app).post("/name/suggest", json={"name": name, "token": "19900105m"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is True
+    assert body["suggestions"]
+
+
+def test_name_rules_reject_values_outside_digital_roots(profile):
+    with pytest.raises(ValueError):
+        evaluate_name_rules(profile["present_mask"], 0, profile["driver"], profile["conductor"], 0, -2, 5)
+    with pytest.raises(ValueError):
+        evaluate_name_rules(profile["present_mask"], 0, profile["driver"], profile["conductor"], 0, 3, 10)
@@ -0,0 +1,43 @@
+"""Profile store files are loaded only when they match the code deriving their records"""
+import pytest
+
+from date_profiles import PROBE_DATES, DateProfileTable
+from profile_store import HEADER_SIZE, RECORD_SIZE, StaleStoreError, write_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    table = DateProfileTable(1999, 2000).build()
+    path = str(tmp_path / "profiles.bin")
+    write_store(path, table.records(), table.min_year, table.max_year)
+    return path, table
+
+
+def test_load_matches_built_table(store):
+    path, built = store
+    loaded = DateProfileTable(1999, 2000).load(path)
+    assert bytes(loaded.records()) == bytes(built.records())
+    assert loaded.lookup(29, 2, 2000, "female") == built.lookup(29, 2, 2000, "female")
+
+
+def test_load_rejects_records_that_differ_from_the_code(store):
+    path, table = store
+    day, month, year = next(probe for probe in PROBE_DATES if 1999 <= probe[2] <= 2000)
+    offset = HEADER_SIZE + table._slot(day, month, year, "male") * RECORD_SIZE
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        driver = f.read(1)[0]
+        f.seek(offset)
+        f.write(bytes([driver % 9 + 1]))
+
+    with pytest.raises(StaleStoreError):
+        DateProfileTable(1999, 2000).load(path)
+
+
+def test_load_rejects_changed_record_functions(store, monkeypatch):
+    import profile_store
+
+    path, _ = store
+    monkeypatch.setattr(profile_store, "RECORD_FUNCTIONS", profile_store.RECORD_FUNCTIONS[:-1])
+    with pytest.raises(StaleStoreError):
+        DateProfileTable(1999, 2000).load(path)
@@ -0,0 +1,33 @@
+"""Real /calculate responses match the documented response models"""
+import pytest
+
+from schemas import ErrorResponse, NumerologyResponse
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient  # noqa: E402
+
+from main import app  # noqa: E402
+
+PEOPLE = [
+    ("John Doe", "1990-05-15", "male"),
+    ("Zoë Ångström", "1985-11-02", "female"),
+    ("Ram", "2003-01-07", "male"),
+    ("Anna Maria Gonzalez de la Cruz", "1900-01-01", "female"),
+    ("Li Wei", "1999-09-09", "female"),
+]
+
+
+@pytest.mark.parametrize("name, date_of_birth, gender", PEOPLE)
+def test_calculate_response_matches_model(name, date_of_birth, gender):
+    body = TestClient(app).post("/calculate", json={
+        "name": name, "date_of_birth": date_of_birth, "gender": gender
+    }).json()
+    # Dumping the validated model must give the response back: no field missing or extra
+    assert NumerologyResponse.model_validate(body, strict=True).model_dump() == body
+
+
+def test_calculate_error_matches_model():
+    body = TestClient(app).post("/calculate", json={
+        "name": "John Doe", "date_of_birth": "2999-01-01", "gender": "male"
+    }).json()
+    assert ErrorResponse.model_validate(body, strict=True).model_dump() == body
@@ -0,0 +1,73 @@
+"""Coalescing of concurrent identical /calculate misses"""
+import asyncio
+
+import pytest
+
+import response_cache
+from singleflight import SingleFlight
+
+
+@pytest.mark.parametrize("offload", [False, True])
+def test_concurrent_calls_share_one_computation(offload):
+    flights = SingleFlight(offload=offload)
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return value * 2
+
+    async def run():
+        return await asyncio.gather(*[flights.run("key", compute, 21) for _ in range(10)])
+
+    assert asyncio.run(run()) == [42] * 10
+    assert calls == [21]
+    assert flights.stats() == {"calls": 1, "coalesced": 9, "in_flight": 0}
+
+
+def test_cancelled_first_caller_still_serves_the_others():
+    flights = SingleFlight()
+
+    async def run():
+        first = asyncio.ensure_future(flights.run("key", lambda: "result"))
+        others = [asyncio.ensure_future(flights.run("key", lambda: "other")) for _ in range(3)]
+        await asyncio.sleep(0)  # the first caller yielded and the others joined it
+        first.cancel()
+        results = await asyncio.gather(*others)
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return results
+
+    assert asyncio.run(run()) == ["result"] * 3
+
+
+def test_identical_misses_calculate_once_without_cache(monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    import main
+
+    calculations = []
+    calculate = response_cache.calculate_numerology_result
+
+    def counting_calculate(*args):
+        calculations.append(args)
+        return calculate(*args)
+
+    monkeypatch.setattr(response_cache, "calculate_numerology_result", counting_calculate)
+    monkeypatch.setattr(main.response_cache.cache, "max_size", 0)
+    main.response_cache.cache.clear()
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.post("/calculate", json={"name": "Warm Up", "date_of_birth": "1990-05-15", "gender": "male"})
+            names = ["Viral Name", "viral name", "VIRAL NAME"]
+            return await asyncio.gather(*[
+                client.post("/calculate", json={"name": names[i % 3], "date_of_birth": "1991-02-03",
+                                                "gender": "female"})
+                for i in range(12)
+            ])
+
+    responses = asyncio.run(run())
+    assert calculations == [("Warm Up", "1990-05-15", "male"), ("Viral Name", "1991-02-03", "female")]
+    assert [response.json()["name"] for response in responses] == [
+        ["Viral Name", "viral name", "VIRAL NAME"][i % 3] for i in range(12)
+    ]
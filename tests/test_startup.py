@@ -0,0 +1,44 @@
+"""Requests that arrive while the background preload is still running"""
+import asyncio
+import time
+
+import pytest
+
+import main
+
+PRELOAD_SECONDS = 0.5
+
+
+def test_requests_wait_for_background_preload_without_blocking_the_loop(monkeypatch):
+    httpx = pytest.importorskip("httpx")
+
+    def slow_preload():
+        time.sleep(PRELOAD_SECONDS)
+
+    monkeypatch.setattr(main, "STARTUP_MODE", "background")
+    monkeypatch.setattr(main, "preload", slow_preload)
+    monkeypatch.setattr(main, "_preloaded", None)
+
+    async def timed(request):
+        response = await request
+        return response, time.perf_counter()
+
+    async def run():
+        async with main.lifespan(main.app):
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                start = time.perf_counter()
+                calculate = asyncio.ensure_future(timed(client.post(
+                    "/calculate", json={"name": "John Doe", "date_of_birth": "1990-05-15", "gender": "male"})))
+                metrics_response, metrics_done = await timed(client.get("/metrics"))
+                await asyncio.sleep(0.05)
+                assert not calculate.done()
+                calculate_response, calculate_done = await calculate
+        return start, metrics_response, metrics_done, calculate_response, calculate_done
+
+    start, metrics_response, metrics_done, calculate_response, calculate_done = asyncio.run(run())
+    assert metrics_response.status_code == 200
+    assert metrics_done - start < PRELOAD_SECONDS
+    assert calculate_response.status_code == 200
+    assert calculate_response.json()["success"] is True
+    assert calculate_done - start >= PRELOAD_SECONDS * 0.9
@@ -0,0 +1,224 @@
+"""
+Name normalization - transliteration of non-Latin scripts and accent folding
+
+Names are scored on the letters A-Z (ALPHABET_VALUES). Other characters are
+mapped to Latin letters once per code point and the result is kept in a
+str.translate table, so scoring a name stays a single translate call:
+
+1. Transliteration tables (Cyrillic, Greek and Latin letters that do not
+   decompose, such as ß or Ø) are looked up first.
+2. Otherwise the character is NFKD-decomposed and combining marks are
+   dropped (é -> e, ﬁ -> fi, Ά -> Α -> A).
+
+Devanagari is transliterated per word before that, since the inherent 'a'
+of a consonant depends on its neighbours (simplified Hindi schwa deletion:
+राम -> Ram, कमला -> Kamla, प्रकाश -> Prakash).
+
+The enabled scripts are set with NUMEROLOGY_TRANSLITERATION (a comma
+separated list of TRANSLITERATION_TABLES names, default all) or at runtime
+with set_transliteration / register_transliteration.
+"""
+import os
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from data import ALPHABET_VALUES
+
+# Transliteration of single characters, keyed and valued in upper case
+TRANSLITERATION_TABLES: Dict[str, Dict[str, str]] = {
+    "latin": {
+        "ß": "SS", "ẞ": "SS", "Æ": "AE", "Œ": "OE", "Ø": "O", "Ł": "L", "Đ": "D", "Ð": "D",
+        "Þ": "TH", "Ħ": "H", "Ŋ": "NG", "Ƒ": "F"
+    },
+    "cyrillic": {
+        "А": "A", "Б": "B", "В": "V", "Г": "G", "Ґ": "G", "Д": "D", "Е": "E", "Ё": "YO", "Є": "YE",
+        "Ж": "ZH", "З": "Z", "И": "I", "І": "I", "Ї": "YI", "Й": "Y", "К": "K", "Л": "L", "М": "M",
+        "Н": "N", "О": "O", "П": "P", "Р": "R", "С": "S", "Т": "T", "У": "U", "Ў": "U", "Ф": "F",
+        "Х": "KH", "Ц": "TS", "Ч": "CH", "Ш": "SH", "Щ": "SHCH", "Ъ": "", "Ы": "Y", "Ь": "",
+        "Э": "E", "Ю": "YU", "Я": "YA"
+    },
+    "greek": {
+        "Α": "A", "Β": "V", "Γ": "G", "Δ": "D", "Ε": "E", "Ζ": "Z", "Η": "I", "Θ": "TH", "Ι": "I",
+        "Κ": "K", "Λ": "L", "Μ": "M", "Ν": "N", "Ξ": "X", "Ο": "O", "Π": "P", "Ρ": "R", "Σ": "S",
+        "Τ": "T", "Υ": "Y", "Φ": "F", "Χ": "CH", "Ψ": "PS", "Ω": "O"
+    },
+    # Contextual, see transliterate_devanagari
+    "devanagari": {}
+}
+
+# Devanagari consonants (with nukta forms), independent vowels, vowel signs and other signs
+DEVANAGARI_CONSONANTS = {
+    "क": "k", "ख": "kh", "ग": "g", "घ": "gh", "ङ": "n", "च": "ch", "छ": "chh", "ज": "j", "झ": "jh",
+    "ञ": "n", "ट": "t", "ठ": "th", "ड": "d", "ढ": "dh", "ण": "n", "त": "t", "थ": "th", "द": "d",
+    "ध": "dh", "न": "n", "प": "p", "फ": "ph", "ब": "b", "भ": "bh", "म": "m", "य": "y", "र": "r",
+    "ल": "l", "ळ": "l", "व": "v", "श": "sh", "ष": "sh", "स": "s", "ह": "h",
+    "क़": "q", "ख़": "kh", "ग़": "gh", "ज़": "z", "ड़": "r", "ढ़": "rh", "फ़": "f", "य़": "y"
+}
+DEVANAGARI_VOWELS = {
+    "अ": "a", "आ": "a", "इ": "i", "ई": "i", "उ": "u", "ऊ": "u", "ऋ": "ri", "ए": "e", "ऐ": "ai",
+    "ओ": "o", "औ": "au", "ऍ": "e", "ऑ": "o"
+}
+DEVANAGARI_VOWEL_SIGNS = {
+    "ा": "a", "ि": "i", "ी": "i", "ु": "u", "ू": "u", "ृ": "ri", "े": "e", "ै": "ai", "ो": "o",
+    "ौ": "au", "ॅ": "e", "ॉ": "o"
+}
+DEVANAGARI_SIGNS = {"ं": "n", "ँ": "n", "ः": "h"}
+DEVANAGARI_VIRAMA = "्"
+DEVANAGARI_NUKTA = "़"
+
+_DEVANAGARI_RUN = re.compile("[ऀ-ॿ]+")
+
+# Characters kept after folding: the scored letters and spaces
+_SCORED = frozenset(ALPHABET_VALUES) | {" "}
+
+
+def _enabled_from_env() -> List[str]:
+    requested = os.environ.get("NUMEROLOGY_TRANSLITERATION")
+    if not requested:
+        return list(TRANSLITERATION_TABLES)
+    names = [name.strip() for name in requested.split(",") if name.strip()]
+    unknown = [name for name in names if name not in TRANSLITERATION_TABLES]
+    if unknown:
+        raise ValueError(f"Unknown transliteration tables: {', '.join(unknown)}")
+    return names
+
+
+_enabled: List[str] = _enabled_from_env()
+
+
+def _lookup(char: str) -> Optional[str]:
+    """Transliteration of a character from the enabled tables, in the character's case"""
+    upper = char.upper()
+    for name in _enabled:
+        table = TRANSLITERATION_TABLES[name]
+        if char in table:
+            value = table[char]
+            return value.capitalize() if char.isupper() else value.lower()
+        if upper in table:
+            return table[upper].lower()
+    return None
+
+
+def _latin(char: str) -> str:
+    """Latin spelling of a single character (unchanged when there is none)"""
+    value = _lookup(char)
+    if value is not None:
+        return value
+    decomposed = unicodedata.normalize("NFKD", char)
+    if decomposed != char:
+        return "".join(_latin(part) for part in decomposed if not unicodedata.combining(part))
+    return char
+
+
+class _LatinTable(dict):
+    """str.translate table compiling the Latin spelling of each code point on first use"""
+
+    def __missing__(self, code_point: int) -> str:
+        value = self[code_point] = _latin(chr(code_point))
+        return value
+
+
+class _FoldTable(dict):
+    """str.translate table compiling the scored letters (and spaces) of each code point on first use"""
+
+    def __missing__(self, code_point: int) -> Optional[str]:
+        folded = "".join(char for char in _latin(chr(code_point)).upper() if char in _SCORED)
+        value = self[code_point] = folded or None
+        return value
+
+
+_latin_table = _LatinTable()
+_fold_table = _FoldTable()
+
+
+def _devanagari_word(word: str) -> str:
+    """Transliterate a run of Devanagari, dropping inherent vowels as spoken in Hindi"""
+    # Syllables: [consonant cluster, vowel (None for the inherent 'a'), ends with virama, signs]
+    syllables: List[list] = []
+    for char in word:
+        if char in DEVANAGARI_CONSONANTS:
+            if syllables and syllables[-1][2]:
+                syllables[-1][0].append(DEVANAGARI_CONSONANTS[char])
+                syllables[-1][2] = False
+            else:
+                syllables.append([[DEVANAGARI_CONSONANTS[char]], None, False, ""])
+        elif char in DEVANAGARI_VOWEL_SIGNS and syllables:
+            syllables[-1][1] = DEVANAGARI_VOWEL_SIGNS[char]
+        elif char in DEVANAGARI_VOWELS:
+            syllables.append([[], DEVANAGARI_VOWELS[char], False, ""])
+        elif char == DEVANAGARI_VIRAMA and syllables:
+            syllables[-1][2] = True
+        elif char in DEVANAGARI_SIGNS:
+            if not syllables:
+                syllables.append([[], "", False, ""])
+            syllables[-1][3] += DEVANAGARI_SIGNS[char]
+        # Nukta, danda and other marks are dropped
+
+    parts = []
+    spoken = []  # whether each syllable ends up with a vowel
+    for index, (cluster, vowel, virama, signs) in enumerate(syllables):
+        if vowel is None and not virama:
+            if signs:
+                vowel = "a"
+            elif index == len(syllables) - 1:
+                # Final inherent vowel is silent, except in one-syllable words and after clusters
+                vowel = "a" if len(syllables) == 1 or len(cluster) > 1 else ""
+            elif index > 0 and spoken[index - 1] and syllables[index + 1][1] and len(cluster) == 1:
+                # Medial inherent vowel between two spoken vowels is silent (kamala -> kamla)
+                vowel = ""
+            else:
+                vowel = "a"
+        vowel = vowel or ""
+        spoken.append(bool(vowel))
+        parts.append("".join(cluster) + vowel + signs)
+    return "".join(parts).capitalize()
+
+
+def transliterate_devanagari(text: str) -> str:
+    """Replace every Devanagari word in text with its Latin spelling"""
+    return _DEVANAGARI_RUN.sub(lambda match: _devanagari_word(match.group(0)), text)
+
+
+def _contextual(text: str) -> str:
+    if "devanagari" in _enabled and _DEVANAGARI_RUN.search(text):
+        text = transliterate_devanagari(text)
+    return text
+
+
+def transliterate(text: str) -> str:
+    """Latin spelling of text, keeping case, spacing and punctuation (Жанна -> Zhanna, José -> Jose)"""
+    if text.isascii():
+        return text
+    return _contextual(text).translate(_latin_table)
+
+
+def fold_name(text: str) -> str:
+    """The scored letters (upper case) and spaces of a name, after transliteration"""
+    if not text.isascii():
+        text = _contextual(text)
+    return text.translate(_fold_table)
+
+
+def _reset() -> None:
+    _latin_table.clear()
+    _fold_table.clear()
+
+
+def set_transliteration(names: Iterable[str]) -> None:
+    """Enable the given TRANSLITERATION_TABLES (in lookup order)"""
+    global _enabled
+    names = list(names)
+    unknown = [name for name in names if name not in TRANSLITERATION_TABLES]
+    if unknown:
+        raise ValueError(f"Unknown transliteration tables: {', '.join(unknown)}")
+    _enabled = names
+    _reset()
+
+
+def register_transliteration(name: str, table: Mapping[str, str], enable: bool = True) -> None:
+    """Add or replace a transliteration table (upper-case keys and values)"""
+    TRANSLITERATION_TABLES[name] = dict(table)
+    if enable and name not in _enabled:
+        _enabled.insert(0, name)
+    _reset()
@@ -0,0 +1,84 @@
+"""
+Vectorized numerology calculations over NumPy arrays of dates
+
+The digit sum of a number is congruent to the number modulo 9, so repeatedly
+summing digits down to one digit is the digital root 1 + (n - 1) % 9 (and 0
+for 0). This gives the same results as the scalar functions in
+calculations.py using pure array arithmetic. NumPy is optional and only
+required by this module.
+"""
+from datetime import datetime
+from typing import Any, Dict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("NumPy is required for vectorized calculations: pip install numpy")
+
+
+def digital_root(values: Any) -> Any:
+    """Vectorized sum_digits_to_single for non-negative integers"""
+    _require_numpy()
+    values = np.asarray(values, dtype=np.int64)
+    return np.where(values == 0, 0, 1 + (values - 1) % 9)
+
+
+def driver_array(day: Any) -> Any:
+    """Vectorized calculate_driver"""
+    return digital_root(day)
+
+
+def conductor_array(day: Any, month: Any, year: Any) -> Any:
+    """Vectorized calculate_conductor"""
+    _require_numpy()
+    return digital_root(np.asarray(day, dtype=np.int64) + np.asarray(month, dtype=np.int64)
+                        + np.asarray(year, dtype=np.int64))
+
+
+def is_male_array(gender: Any) -> Any:
+    """Convert genders ('male'/'female' strings or booleans for male) to a boolean array"""
+    _require_numpy()
+    gender = np.asarray(gender)
+    if gender.dtype == np.bool_:
+        return gender
+    return np.char.lower(gender.astype(str)) == "male"
+
+
+def kua_array(year: Any, gender: Any) -> Any:
+    """Vectorized calculate_kua"""
+    year_digit = digital_root(year)
+    return np.where(is_male_array(gender), digital_root(11 - year_digit), digital_root(4 + year_digit))
+
+
+def personal_year_array(day: Any, month: Any, target_year: Any) -> Any:
+    """Vectorized calculate_personal_year"""
+    return conductor_array(day, month, target_year)
+
+
+def calculate_core_numbers(day: Any, month: Any, year: Any, gender: Any, target_year: Any = None) -> Dict[str, Any]:
+    """
+    Calculate driver, conductor, kua and personal year arrays for arrays of dates.
+
+    Args:
+        day, month, year: Integer arrays (or scalars) of the birth dates
+        gender: Array of 'male'/'female' strings, or booleans (True for male)
+        target_year: Year(s) for the personal year, defaults to the current year
+
+    Returns:
+        Dictionary of int8 arrays keyed by driver, conductor, kua and personal_year
+    """
+    _require_numpy()
+    if target_year is None:
+        target_year = datetime.now().year
+
+    return {
+        "driver": driver_array(day).astype(np.int8),
+        "conductor": conductor_array(day, month, year).astype(np.int8),
+        "kua": kua_array(year, gender).astype(np.int8),
+        "personal_year": personal_year_array(day, month, target_year).astype(np.int8)
+    }